@@ -0,0 +1,215 @@
+"""
+A module to hold the admission control utilities of symmetric.
+"""
+
+import math
+import time
+import threading
+
+import symmetric.constants
+import symmetric.errors
+
+
+class TokenBucket:
+
+    """
+    Class to encapsulate a token bucket rate limiter.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.__rate = float(rate)
+        self.__capacity = float(burst if burst else max(1, math.ceil(rate)))
+        self.__tokens = self.__capacity
+        self.__timestamp = time.monotonic()
+        self.__lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """Returns the amount of tokens added to the bucket per second."""
+        return self.__rate
+
+    @property
+    def capacity(self):
+        """Returns the maximum amount of tokens of the bucket."""
+        return self.__capacity
+
+    def acquire(self):
+        """
+        Tries to take a token from the bucket. Returns 0 if a token was
+        taken, otherwise returns the amount of seconds left until a token
+        becomes available.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            elapsed = now - self.__timestamp
+            self.__tokens = min(
+                self.__capacity, self.__tokens + elapsed * self.__rate)
+            self.__timestamp = now
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return 0
+            return (1 - self.__tokens) / self.__rate
+
+
+class AdmissionController:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate the admission control of an endpoint. Limits the
+    amount of concurrent executions, the amount of requests waiting for an
+    execution slot (64 by default) and, optionally, the rate of incoming
+    requests.
+    """
+
+    def __init__(self, max_concurrency=None, max_queued=None,
+                 rate_limit=None, rate_limit_burst=None):
+        self.__max_concurrency = max_concurrency
+        self.__max_queued = (
+            symmetric.constants.DEFAULT_MAX_QUEUED
+            if max_queued is None else max_queued
+        )
+        self.__bucket = (
+            TokenBucket(rate_limit, rate_limit_burst) if rate_limit else None)
+        self.__condition = threading.Condition()
+        self.__active = 0
+        self.__queued = 0
+        self.__rate_limited = 0
+        self.__overloaded = 0
+
+    @property
+    def limits_concurrency(self):
+        """
+        Returns a boolean representing whether or not the controller can
+        reject requests because of a lack of execution slots.
+        """
+        return self.__max_concurrency is not None
+
+    @property
+    def limits_rate(self):
+        """
+        Returns a boolean representing whether or not the controller can
+        reject requests because of the rate limit.
+        """
+        return self.__bucket is not None
+
+    def stats(self):
+        """Returns a dictionary with the counters of the controller."""
+        with self.__condition:
+            return {
+                "active": self.__active,
+                "queued": self.__queued,
+                "rate_limited": self.__rate_limited,
+                "overloaded": self.__overloaded
+            }
+
+    def enter(self, deadline=None):
+        """
+        Takes an execution slot, waiting for one to be free if needed.
+        Raises RateLimitExceededError if the rate limit was exceeded,
+        ServerOverloadedError if the waiting queue is full and
+        DeadlineExceededError if the monotonic :deadline passes while
+        waiting for a slot.
+        """
+        if self.__bucket is not None:
+            wait = self.__bucket.acquire()
+            if wait:
+                with self.__condition:
+                    self.__rate_limited += 1
+                error = "The rate limit of the endpoint was exceeded."
+                raise symmetric.errors.RateLimitExceededError(
+                    error, math.ceil(wait))
+        with self.__condition:
+            if self.__is_full():
+                if self.__is_queue_full():
+                    self.__overloaded += 1
+                    error = "The endpoint has no free execution slots."
+                    raise symmetric.errors.ServerOverloadedError(
+                        error, symmetric.constants.DEFAULT_RETRY_AFTER)
+                self.__queued += 1
+                try:
+                    while self.__is_full():
+                        self.__wait(deadline)
+                finally:
+                    self.__queued -= 1
+            self.__active += 1
+
+    def exit(self):
+        """Frees an execution slot."""
+        with self.__condition:
+            self.__active -= 1
+            self.__condition.notify()
+
+    def __enter__(self):
+        self.enter()
+        return self
+
+    def __exit__(self, *args):
+        self.exit()
+
+    def __wait(self, deadline):
+        """
+        Waits for a notification of a freed slot. Must be called while
+        holding the condition of the controller.
+        """
+        if deadline is None:
+            self.__condition.wait()
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self.__condition.wait(remaining):
+            error = "The request deadline passed while waiting for a slot."
+            raise symmetric.errors.DeadlineExceededError(error)
+
+    def __is_full(self):
+        """Checks if every execution slot is taken."""
+        if self.__max_concurrency is None:
+            return False
+        return self.__active >= self.__max_concurrency
+
+    def __is_queue_full(self):
+        """Checks if the waiting queue is full."""
+        return self.__queued >= self.__max_queued
+
+
+def check_limit(name, value, minimum, integer=False, exclusive=False):
+    """
+    Raises AdmissionConfigurationError if the limit :name is set to a
+    :value that is not a finite number (or an integer if :integer is True)
+    greater or equal than :minimum (or greater if :exclusive is True).
+    """
+    if value is None:
+        return
+    valid = (
+        isinstance(value, int) if integer
+        else isinstance(value, (int, float)) and math.isfinite(value)
+    )
+    if isinstance(value, bool) or not valid:
+        kind = "an integer" if integer else "a finite number"
+        error = f"The {name} of the endpoint must be {kind}, got {value!r}."
+        raise symmetric.errors.AdmissionConfigurationError(error)
+    if value < minimum or (exclusive and value == minimum):
+        comparison = "greater than" if exclusive else "at least"
+        error = (f"The {name} of the endpoint must be {comparison} "
+                 f"{minimum}, got {value!r}.")
+        raise symmetric.errors.AdmissionConfigurationError(error)
+
+
+def get_admission_controller(max_concurrency, max_queued, rate_limit,
+                             rate_limit_burst):
+    """
+    Returns an AdmissionController with the given limits, or None if no
+    limit was given. Raises AdmissionConfigurationError if any limit is
+    not valid or if it depends on a limit that was not given.
+    """
+    check_limit("max_concurrency", max_concurrency, 1, integer=True)
+    check_limit("max_queued", max_queued, 0, integer=True)
+    check_limit("rate_limit", rate_limit, 0, exclusive=True)
+    check_limit("rate_limit_burst", rate_limit_burst, 1)
+    if max_queued is not None and max_concurrency is None:
+        error = "The max_queued of the endpoint needs a max_concurrency."
+        raise symmetric.errors.AdmissionConfigurationError(error)
+    if rate_limit_burst is not None and rate_limit is None:
+        error = "The rate_limit_burst of the endpoint needs a rate_limit."
+        raise symmetric.errors.AdmissionConfigurationError(error)
+    if max_concurrency is None and rate_limit is None:
+        return None
+    return AdmissionController(
+        max_concurrency, max_queued, rate_limit, rate_limit_burst)
@@ -0,0 +1,155 @@
+"""
+A module to hold the request batching utilities of symmetric.
+"""
+
+import os
+import time
+import queue
+import inspect
+import threading
+import concurrent.futures
+
+import symmetric.constants
+import symmetric.errors
+import symmetric.logging
+
+
+class Batcher:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate the dynamic batching of the concurrent requests
+    of an endpoint. The batched function recieves a list for each one of
+    its parameters (one element per request) and must return a list with
+    one result per request, in the same order.
+    """
+
+    def __init__(self, function, max_batch_size=None, max_wait_ms=None):
+        self.__function = function
+        self.__max_batch_size = (
+            symmetric.constants.DEFAULT_MAX_BATCH_SIZE
+            if max_batch_size is None else max_batch_size
+        )
+        self.__max_wait = (
+            symmetric.constants.DEFAULT_MAX_BATCH_WAIT_MS
+            if max_wait_ms is None else max_wait_ms
+        ) / 1000
+        params = inspect.getfullargspec(function)
+        defaults = params.defaults if params.defaults else ()
+        self.__defaults = dict(
+            zip(params.args[len(params.args) - len(defaults):], defaults))
+        self.__args = params.args
+        self.__has_kwargs = params.varkw is not None
+        self.__pid = os.getpid()
+        self.__queue = queue.Queue()
+        self.__lock = threading.Lock()
+        self.__worker = None
+        self.__batches = 0
+        self.__requests = 0
+
+    def stats(self):
+        """Returns a dictionary with the counters of the batcher."""
+        with self.__lock:
+            return {
+                "batches": self.__batches,
+                "requests": self.__requests,
+                "pending": self.__queue.qsize()
+            }
+
+    def submit(self, parameters, deadline=None):
+        """
+        Adds :parameters to the next batch and waits for its result.
+        Raises DeadlineExceededError if the monotonic :deadline passes
+        before the batch finishes.
+        """
+        self.__start()
+        future = concurrent.futures.Future()
+        self.__queue.put(
+            (parameters, future, symmetric.logging.get_request_id()))
+        timeout = None if deadline is None else deadline - time.monotonic()
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError as err:
+            future.cancel()
+            error = "The request deadline was exceeded."
+            raise symmetric.errors.DeadlineExceededError(error) from err
+
+    def __start(self):
+        """Starts the worker thread if it has not started yet."""
+        if self.__pid != os.getpid():
+            # The worker of the parent process does not survive a fork
+            self.__reset()
+        if self.__worker is not None:
+            return
+        with self.__lock:
+            if self.__worker is None:
+                self.__worker = threading.Thread(
+                    target=self.__work, daemon=True)
+                self.__worker.start()
+
+    def __reset(self):
+        self.__pid = os.getpid()
+        self.__queue = queue.Queue()
+        self.__lock = threading.Lock()
+        self.__worker = None
+
+    def __work(self):
+        """Collects the requests into batches and executes them forever."""
+        while True:
+            batch = [self.__queue.get()]
+            limit = time.monotonic() + self.__max_wait
+            while len(batch) < self.__max_batch_size:
+                remaining = limit - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self.__queue.get(timeout=remaining))
+                    else:
+                        batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [
+                (parameters, future, request_id)
+                for parameters, future, request_id in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            if batch:
+                self.__execute(batch)
+
+    def __execute(self, batch):
+        """
+        Calls the function with the batched parameters and hands each
+        result to its request. The log lines of the call get the ids of
+        every request of the batch.
+        """
+        with self.__lock:
+            self.__batches += 1
+            self.__requests += len(batch)
+        names = list(self.__args)
+        if self.__has_kwargs:
+            for parameters, _, _ in batch:
+                names.extend(x for x in parameters if x not in names)
+        columns = {
+            name: [
+                parameters.get(name, self.__defaults.get(name))
+                for parameters, _, _ in batch
+            ]
+            for name in names
+        }
+        request_ids = []
+        for _, _, request_id in batch:
+            if request_id not in request_ids:
+                request_ids.append(request_id)
+        symmetric.logging.set_request_id(",".join(request_ids))
+        try:
+            results = list(self.__function(**columns))
+            if len(results) != len(batch):
+                error = (f"The batched function returned {len(results)} "
+                         f"results for {len(batch)} requests.")
+                raise symmetric.errors.BatchSizeMismatchError(error)
+        except Exception as err:
+            for _, future, _ in batch:
+                future.set_exception(err)
+            return
+        finally:
+            symmetric.logging.finish_request()
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,66 @@
+"""
+A module to hold the HTTP caching utilities of symmetric.
+"""
+
+import symmetric.errors
+
+
+class HTTPCachePolicy:
+
+    """
+    Class to encapsulate the HTTP caching policy of an endpoint. Applies
+    the Cache-Control, ETag and Last-Modified headers to the successful
+    responses of GET and HEAD requests and answers the conditional
+    requests (If-None-Match and If-Modified-Since) with a 304 response.
+    The Last-Modified header gets the time returned by :last_modified (a
+    function without arguments), called on every request.
+    """
+
+    def __init__(self, cache_control=None, etag=False, last_modified=None):
+        self.__cache_control = cache_control
+        self.__etag = etag
+        self.__last_modified = last_modified
+
+    @property
+    def cache_control(self):
+        """Returns the Cache-Control header value of the endpoint."""
+        return self.__cache_control
+
+    @property
+    def conditional(self):
+        """
+        Returns a boolean representing whether or not the endpoint answers
+        conditional requests.
+        """
+        return self.__etag or self.__last_modified is not None
+
+    def apply(self, response, request):
+        """Applies the policy to :response, the response to :request."""
+        if request.method not in ("GET", "HEAD"):
+            return response
+        if not 200 <= response.status_code < 300:
+            return response
+        if self.__cache_control is not None:
+            response.headers["Cache-Control"] = self.__cache_control
+        if self.__etag:
+            response.add_etag()
+        if self.__last_modified is not None:
+            response.last_modified = self.__last_modified()
+        if self.conditional:
+            response.make_conditional(request)
+        return response
+
+
+def get_cache_policy(cache_control, etag, last_modified):
+    """
+    Returns an HTTPCachePolicy with the given options, or None if no
+    option was given. Raises CacheConfigurationError if :last_modified is
+    not a function.
+    """
+    if last_modified is not None and not callable(last_modified):
+        error = ("The last_modified option must be a function that returns "
+                 "the time in which the responses last changed.")
+        raise symmetric.errors.CacheConfigurationError(error)
+    if cache_control is None and not etag and last_modified is None:
+        return None
+    return HTTPCachePolicy(cache_control, etag, last_modified)
@@ -7,6 +7,7 @@ import argparse
 
 import symmetric
 import symmetric.cli.utils
+import symmetric.constants
 
 
 def dispatcher():
@@ -21,19 +22,42 @@ def dispatcher():
     try:
         if args.action == "run":
             symmetric.cli.utils.start_server(
-                args.module, args.server, args.port, args.debug
+                args.module, args.server, args.port, args.debug,
+                args.workers, args.drain_timeout, args.manifest
             )
         elif args.action == "docs":
-            if args.markdown:
+            filename = args.filename
+            if not filename:
+                filename = "documentation.md" if args.markdown else (
+                    "openapi.json")
+            cache = symmetric.cli.utils.get_docs_cache(
+                args.cache_dir, args.watch)
+            if args.watch:
+                symmetric.cli.utils.watch_documentation(
+                    args.module, filename, args.markdown, args.static, cache
+                )
+            elif args.markdown:
                 symmetric.cli.utils.document_api_markdown(
-                    args.module,
-                    args.filename if args.filename else "documentation.md"
+                    args.module, filename, args.static, cache
                 )
             else:
                 symmetric.cli.utils.document_openapi(
-                    args.module,
-                    args.filename if args.filename else "openapi.json"
+                    args.module, filename, args.static, cache
                 )
+        elif args.action == "replay":
+            symmetric.cli.utils.replay_recording(
+                args.module, args.recording, args.server, args.port,
+                args.fast, args.concurrency, args.token
+            )
+        elif args.action == "build":
+            symmetric.cli.utils.build_manifest(args.module, args.filename)
+        elif args.action == "client":
+            filename = args.filename
+            if not filename:
+                filename = f"{args.module.replace('.', '_')}_client.py"
+            symmetric.cli.utils.generate_client(
+                args.module, filename, args.static, args.url
+            )
     except AttributeError:
         print("An argument is required for the symmetric command.")
         parser.print_help()
@@ -67,6 +91,15 @@ def generate_parser():
     # Documentation parser
     generate_documentation_subparser(subparsers)
 
+    # Replay parser
+    generate_replay_subparser(subparsers)
+
+    # Client parser
+    generate_client_subparser(subparsers)
+
+    # Build parser
+    generate_build_subparser(subparsers)
+
     return parser
 
 
@@ -109,6 +142,34 @@ def generate_runner_subparser(subparsers):
         help="Do not run in debug mode."
     )
 
+    # Workers
+    runner_parser.add_argument(
+        "-w", "--workers",
+        dest="workers",
+        type=int,
+        default=None,
+        help="Serve with this amount of preforked worker processes "
+             "(only without debug mode)."
+    )
+
+    # Drain timeout
+    runner_parser.add_argument(
+        "-t", "--drain-timeout",
+        dest="drain_timeout",
+        type=float,
+        default=None,
+        help="Seconds that the workers have to finish the requests in "
+             "flight before stopping."
+    )
+
+    # Manifest
+    runner_parser.add_argument(
+        "-m", "--manifest",
+        dest="manifest",
+        default=symmetric.constants.MANIFEST_FILE_NAME,
+        help="Name of the manifest file (used only if it is up to date)."
+    )
+
 
 def generate_documentation_subparser(subparsers):
     """Generates the subparser for the auto-documentation option."""
@@ -140,6 +201,159 @@ def generate_documentation_subparser(subparsers):
         help="Generate simpler, human-readable Markdown documentation."
     )
 
+    # Static
+    documentation_parser.add_argument(
+        "-s", "--static",
+        dest="static",
+        action='store_const',
+        default=False,  # static is set to False by default
+        const=True,     # if the flag is used, sets static to True
+        help="Document the module by parsing its code, without importing it."
+    )
+
+    # Cache directory
+    documentation_parser.add_argument(
+        "-c", "--cache-dir",
+        dest="cache_dir",
+        default="",
+        help=("Directory in where to cache the documentation of each "
+              "endpoint, to only render the endpoints that changed.")
+    )
+
+    # Watch
+    documentation_parser.add_argument(
+        "-w", "--watch",
+        dest="watch",
+        action='store_const',
+        default=False,  # watch is set to False by default
+        const=True,     # if the flag is used, sets watch to True
+        help="Build the documentation again every time the module changes."
+    )
+
+
+def generate_replay_subparser(subparsers):
+    """Generates the subparser for the replay option."""
+    replay_parser = subparsers.add_parser("replay")
+    replay_parser.set_defaults(action="replay")
+
+    # Module name
+    replay_parser.add_argument(
+        "module",
+        metavar="module",
+        help="Name of the module that uses the symmetric object."
+    )
+
+    # Recording
+    replay_parser.add_argument(
+        "recording",
+        metavar="recording",
+        help="Name of the file with the recorded requests."
+    )
+
+    # Host
+    replay_parser.add_argument(
+        "-s", "--server",
+        dest="server",
+        default="127.0.0.1",
+        help="Server hostname of the running API (used with --port)."
+    )
+
+    # Port
+    replay_parser.add_argument(
+        "-p", "--port",
+        dest="port",
+        type=int,
+        default=None,
+        help="Port of a running API. By default, the module runs in-process."
+    )
+
+    # Fast
+    replay_parser.add_argument(
+        "-f", "--fast",
+        dest="fast",
+        action='store_const',
+        default=False,  # fast is set to False by default
+        const=True,     # if the flag is used, sets fast to True
+        help="Send the requests as fast as possible, ignoring their pacing."
+    )
+
+    # Concurrency
+    replay_parser.add_argument(
+        "-c", "--concurrency",
+        dest="concurrency",
+        type=int,
+        default=None,
+        help="Maximum amount of requests sent at the same time."
+    )
+
+    # Token
+    replay_parser.add_argument(
+        "-t", "--token",
+        dest="token",
+        default=None,
+        help="Authentication token sent with the requests."
+    )
+
+
+def generate_client_subparser(subparsers):
+    """Generates the subparser for the client generation option."""
+    client_parser = subparsers.add_parser("client")
+    client_parser.set_defaults(action="client")
+
+    # Module name
+    client_parser.add_argument(
+        "module",
+        metavar="module",
+        help="Name of the module that uses the symmetric object."
+    )
+
+    # Filename
+    client_parser.add_argument(
+        "-f", "--filename",
+        dest="filename",
+        default="",
+        help="Name of the file in where to write the client."
+    )
+
+    # Static
+    client_parser.add_argument(
+        "-s", "--static",
+        dest="static",
+        action='store_const',
+        default=False,  # static is set to False by default
+        const=True,     # if the flag is used, sets static to True
+        help="Find the endpoints by parsing the module, without importing it."
+    )
+
+    # URL
+    client_parser.add_argument(
+        "-u", "--url",
+        dest="url",
+        default=None,
+        help="Default URL of the API used by the client."
+    )
+
+
+def generate_build_subparser(subparsers):
+    """Generates the subparser for the manifest build option."""
+    build_parser = subparsers.add_parser("build")
+    build_parser.set_defaults(action="build")
+
+    # Module name
+    build_parser.add_argument(
+        "module",
+        metavar="module",
+        help="Name of the module that uses the symmetric object."
+    )
+
+    # Filename
+    build_parser.add_argument(
+        "-f", "--filename",
+        dest="filename",
+        default=symmetric.constants.MANIFEST_FILE_NAME,
+        help="Name of the file in where to write the manifest."
+    )
+
 
 if __name__ == "__main__":
     dispatcher()
@@ -5,43 +5,248 @@ A module to hold some CLI utilities.
 import os
 import sys
 import json
+import time
 import traceback
+import subprocess
 import importlib
 
+import symmetric.client
+import symmetric.constants
+import symmetric.core
 import symmetric.errors
+import symmetric.fragments
+import symmetric.manifest
 import symmetric.openapi.utils
+import symmetric.recording
+import symmetric.replay
+import symmetric.server
+import symmetric.static
 
 
-def start_server(module, server, port, debug):
+# pylint: disable=R0913
+def start_server(module, server, port, debug, workers=None,
+                 drain_timeout=None, manifest=None):
     """
     Gets the symmetric object and then runs it with the parameters given
-    to the method.
+    to the method. Without debug mode and with :workers, the module gets
+    served by that amount of preforked workers (each one imports the
+    module), which finish their requests (for up to :drain_timeout seconds)
+    before stopping. The :manifest file gets used if it is up to date with
+    the module.
     """
-    symmetric_object = get_symmetric_object(module, debug)
+    if not debug and workers is not None and hasattr(os, "fork"):
+        sys.exit(symmetric.server.serve(
+            lambda: get_built_symmetric_object(module, debug, manifest),
+            server, port, workers, drain_timeout))
+    symmetric_object = get_built_symmetric_object(module, debug, manifest)
     symmetric_object.run(host=server, port=port, debug=debug)
 
 
-def document_api_markdown(module, filename):
+def build_manifest(module, filename):
     """
-    Gets the symmetric object and then calls the markdown documentation method.
+    Imports the module :module and writes its manifest into :filename, to
+    be used by the workers that serve it.
     """
+    sys.path.insert(0, ".")
+    source_hash = symmetric.manifest.get_source_hash(
+        symmetric.static.find_module_source(module))
     symmetric_object = get_symmetric_object(module, True)
-    docs = symmetric_object.generate_markdown_documentation(module)
-    with open(filename, "w") as docs_file:
+    symmetric.manifest.write_manifest(
+        symmetric_object.get_manifest(source_hash), filename)
+
+
+def get_built_symmetric_object(module_name, debug, manifest=None):
+    """
+    Returns the symmetric object of the module :module_name, using the
+    :manifest file (the default manifest file by default) if it was built
+    from the current source file of the module.
+    """
+    sys.path.insert(0, ".")
+    try:
+        source_hash = symmetric.manifest.get_source_hash(
+            symmetric.static.find_module_source(module_name))
+    except (ImportError, OSError):
+        # The module gets imported from elsewhere (for example, a zip file)
+        source_hash = None
+    built = None if source_hash is None else symmetric.manifest.read_manifest(
+        manifest if manifest else symmetric.constants.MANIFEST_FILE_NAME,
+        source_hash)
+    if built is not None:
+        symmetric.core.symmetric_object.use_manifest(built)
+    return get_symmetric_object(module_name, debug)
+
+
+def document_api_markdown(module, filename, static=False, cache=None):
+    """
+    Gets the symmetric object and then calls the markdown documentation method.
+    If :static is True, the module gets parsed instead of imported. If a
+    fragment :cache is given, only the changed endpoints get rendered.
+    """
+    symmetric_object = get_documented_object(module, static)
+    docs = symmetric_object.generate_markdown_documentation(module, cache)
+    with open(filename, "w", encoding="utf-8") as docs_file:
         docs_file.write(docs)
+    if cache is not None:
+        cache.save()
 
 
-def document_openapi(module, filename):
+def document_openapi(module, filename, static=False, cache=None):
     """
     Gets the symmetric object and then calls the OpenAPI Specification method.
+    If :static is True, the module gets parsed instead of imported. If a
+    fragment :cache is given, only the changed endpoints get rendered.
     """
-    symmetric_object = get_symmetric_object(module, True)
+    symmetric_object = get_documented_object(module, static)
     docs = symmetric.openapi.utils.get_openapi(
         symmetric_object,
-        f"{symmetric.helpers.humanize(module)} API"
+        f"{symmetric.helpers.humanize(module)} API",
+        cache=cache
     )
-    with open(filename, "w") as docs_file:
+    with open(filename, "w", encoding="utf-8") as docs_file:
         json.dump(docs, docs_file, indent=2)
+    if cache is not None:
+        cache.save()
+
+
+def get_docs_cache(directory, watch):
+    """
+    Returns the documentation fragment cache stored inside :directory
+    (creating the directory if it does not exist). Without a directory,
+    only the builds of the watch mode (if :watch is True) share their
+    fragments, in memory. Otherwise, returns None.
+    """
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        return symmetric.fragments.FragmentCache(os.path.join(
+            directory, symmetric.constants.DOCS_CACHE_FILE_NAME))
+    if watch:
+        return symmetric.fragments.FragmentCache()
+    return None
+
+
+def watch_documentation(module, filename, markdown, static, cache):
+    """
+    Builds the documentation every time the source file of :module changes,
+    until the user interrupts it. The static builds run in this process,
+    while the other builds import the module in a new process (a module can't
+    register its endpoints twice in the same process).
+    """
+    sys.path.insert(0, ".")
+    source = symmetric.static.find_module_source(module)
+    print(f"Watching {source} for changes. Press Ctrl+C to stop.")
+    last_change = None
+    try:
+        while True:
+            change = get_file_stamp(source)
+            if change != last_change:
+                last_change = change
+                build_documentation(module, filename, markdown, static, cache)
+            time.sleep(symmetric.constants.DOCS_WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+
+
+def build_documentation(module, filename, markdown, static, cache):
+    """Builds the documentation once, reporting its duration."""
+    start = time.perf_counter()
+    if static:
+        if cache is not None:
+            cache.load()
+        document = document_api_markdown if markdown else document_openapi
+        try:
+            document(module, filename, True, cache)
+        except Exception as err:  # pylint: disable=W0703
+            print(f"Failed to build the documentation: {err}")
+            return
+    else:
+        command = [
+            sys.executable, "-m", "symmetric.cli.core", "docs", module,
+            "--filename", filename
+        ]
+        if markdown:
+            command.append("--markdown")
+        if cache is not None and cache.filename is not None:
+            command.extend(
+                ["--cache-dir", os.path.dirname(cache.filename)])
+        if subprocess.run(command, check=False).returncode != 0:
+            print("Failed to build the documentation.")
+            return
+    elapsed = (time.perf_counter() - start) * 1000
+    message = f"Built {filename} in {elapsed:.1f} ms"
+    if static and cache is not None:
+        message += (f" ({cache.misses} endpoints rendered, "
+                    f"{cache.hits} reused)")
+    print(f"{message}.")
+
+
+def get_file_stamp(filename):
+    """
+    Returns the modification time and size of :filename (or None if it does
+    not exist), to know when the file changes.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# pylint: disable=R0913
+def replay_recording(module, recording, server, port, fast, concurrency,
+                     token):
+    """
+    Replays the requests of the :recording file against the module :module
+    (in-process) or against the API running on :port, and prints the
+    latency comparison of each endpoint.
+    """
+    entries = symmetric.recording.read_recording(recording)
+    if token is None:
+        token = os.getenv(
+            symmetric.constants.API_SERVER_TOKEN_NAME,
+            symmetric.constants.API_DEFAULT_TOKEN
+        )
+    if port is None:
+        symmetric_object = get_symmetric_object(module, False)
+        # The replayed requests must not be recorded again
+        symmetric_object.stop_recording()
+        symmetric_object.startup()
+        client = symmetric.replay.InProcessClient(symmetric_object)
+    else:
+        # The running API gets used, so the module does not need to run
+        sys.path.insert(0, ".")
+        symmetric_object = symmetric.static.get_static_symmetric_object(
+            module)
+        client = symmetric.replay.HTTPClient(server, port)
+    print(f"Replaying {len(entries)} requests...")
+    results = symmetric.replay.replay(
+        entries, client, symmetric_object.client_token_name, token,
+        fast, concurrency)
+    print(symmetric.replay.get_report(results))
+
+
+def generate_client(module, filename, static=False, url=None):
+    """
+    Gets the symmetric object and writes the source code of a python client
+    of its endpoints into :filename. If :static is True, the module gets
+    parsed instead of imported.
+    """
+    symmetric_object = get_documented_object(module, static)
+    source = symmetric.client.get_client_source(symmetric_object, module, url)
+    with open(filename, "w", encoding="utf-8") as client_file:
+        client_file.write(source)
+
+
+def get_documented_object(module_name, static):
+    """
+    Returns the object to be documented for the module :module_name. If
+    :static is True, the source code of the module gets analyzed without
+    importing it (so its code never runs), otherwise the module gets
+    imported to find the symmetric object.
+    """
+    if static:
+        sys.path.insert(0, ".")
+        return symmetric.static.get_static_symmetric_object(module_name)
+    return get_symmetric_object(module_name, True)
 
 
 def get_symmetric_object(module_name, debug):
@@ -0,0 +1,399 @@
+"""
+A module to generate the source code of a typed python client for the
+endpoints of a symmetric object.
+"""
+
+import re
+import ast
+import keyword
+import typing
+import inspect
+import builtins
+
+import symmetric
+import symmetric.helpers
+
+
+# Code shared by every generated client. It only uses the standard library
+CLIENT_RUNTIME = '''
+class APIError(Exception):
+    """
+    Exception raised when the API responds with an error status. Includes
+    the status and the decoded body of the response.
+    """
+
+    def __init__(self, status, body):
+        super().__init__(f"The API responded with status {status}.")
+        self.status = status
+        self.body = body
+
+
+class _Unset:
+    """Class of the value of the optional parameters that were not given."""
+
+    def __repr__(self):
+        return "UNSET"
+
+
+UNSET = _Unset()
+
+
+class ConnectionPool:
+    """
+    Pool of keep-alive connections to the API. At most :size connections
+    get opened at the same time, and they get reused between the calls.
+    """
+
+    def __init__(self, url, size=DEFAULT_POOL_SIZE, timeout=None):
+        parts = urllib.parse.urlsplit(url)
+        self.__connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.__host = parts.hostname
+        self.__port = parts.port
+        self.__prefix = parts.path.rstrip("/")
+        self.__timeout = timeout
+        self.__idle = queue.LifoQueue()
+        self.__slots = threading.BoundedSemaphore(size)
+
+    def request(self, method, path, body=None, headers=None, timeout=None):
+        """
+        Sends a request using an idle connection (or a new one) and returns
+        the status and the body of the response.
+        """
+        timeout = self.__timeout if timeout is None else timeout
+        with self.__slots:
+            try:
+                connection = self.__idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = self.__connect()
+                reused = False
+            if reused and self.__is_dropped(connection):
+                # The API closed the idle connection, so it gets opened
+                # again before sending the request
+                connection.close()
+                reused = False
+            try:
+                try:
+                    response = self.__send(
+                        connection, method, path, body, headers, timeout)
+                except (http.client.RemoteDisconnected, ConnectionError):
+                    # The request could have reached the API, so only the
+                    # idempotent requests can be sent again
+                    if not reused or method not in IDEMPOTENT_METHODS:
+                        raise
+                    # The API closed the idle connection, use a new one
+                    connection.close()
+                    connection = self.__connect()
+                    response = self.__send(
+                        connection, method, path, body, headers, timeout)
+            except BaseException:
+                connection.close()
+                raise
+            self.__idle.put(connection)
+            return response
+
+    def close(self):
+        """Closes every idle connection."""
+        while True:
+            try:
+                self.__idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __connect(self):
+        """Returns a new (still closed) connection to the API."""
+        return self.__connection_class(self.__host, self.__port)
+
+    @staticmethod
+    def __is_dropped(connection):
+        """Checks if the API closed the idle :connection."""
+        if connection.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([connection.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        # An idle connection only gets readable when the API closes it
+        return bool(readable)
+
+    def __send(self, connection, method, path, body, headers, timeout):
+        """Sends a request using :connection and reads its response."""
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        connection.request(
+            method, self.__prefix + path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        if response.will_close:
+            # The connection gets opened again by its next request
+            connection.close()
+        return response.status, data
+
+
+class BaseClient:
+    """
+    Synchronous client of the API. Every call reuses the connections of a
+    pool of keep-alive connections, so it should be closed when it is no
+    longer needed (or used as a context manager).
+    """
+
+    def __init__(self, url=DEFAULT_URL, token=None, timeout=None,
+                 pool_size=DEFAULT_POOL_SIZE):
+        self.__pool = ConnectionPool(url, pool_size, timeout)
+        self.__token = token
+        self.__pool_size = pool_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the connections to the API."""
+        self.__pool.close()
+
+    def call(self, method, route, parameters, auth=False, timeout=None):
+        """
+        Calls the endpoint of :route with :parameters (skipping the ones
+        that were not given) and returns the decoded body of the response.
+        Raises APIError if the API responds with an error status.
+        """
+        parameters = {
+            key: value for key, value in parameters.items()
+            if value is not UNSET
+        }
+        headers = {"Accept": "application/json"}
+        if auth and self.__token is not None:
+            headers[TOKEN_NAME] = self.__token
+        if method == "GET":
+            query = urllib.parse.urlencode(parameters, doseq=True)
+            path = f"{route}?{query}" if query else route
+            body = None
+        else:
+            path = route
+            body = json.dumps(parameters).encode()
+            headers["Content-Type"] = "application/json"
+        status, data = self.__pool.request(
+            method, path, body, headers, timeout)
+        result = json.loads(data) if data else None
+        if status >= 400:
+            raise APIError(status, result)
+        return result
+
+    def map(self, function, calls, max_workers=None):
+        """
+        Calls the method :function with the keyword arguments of each
+        dictionary of :calls concurrently and returns the list with their
+        results (in the same order).
+        """
+        workers = self.__pool_size if max_workers is None else max_workers
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            return list(executor.map(lambda x: function(**x), calls))
+
+
+class AsyncBaseClient:
+    """
+    Asynchronous client of the API. The calls get sent by a synchronous
+    :client from a pool of threads, so they can be awaited concurrently.
+    """
+
+    def __init__(self, client, pool_size=DEFAULT_POOL_SIZE):
+        self.__client = client
+        self.__executor = concurrent.futures.ThreadPoolExecutor(pool_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the connections to the API."""
+        self.__executor.shutdown(wait=False)
+        self.__client.close()
+
+    async def call(self, method, route, parameters, auth=False,
+                   timeout=None):
+        """
+        Calls the endpoint of :route with :parameters and returns the
+        decoded body of the response.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(
+            self.__client.call, method, route, parameters, auth, timeout))
+
+    async def map(self, function, calls):
+        """
+        Awaits the method :function with the keyword arguments of each
+        dictionary of :calls concurrently and returns the list with their
+        results (in the same order).
+        """
+        return list(await asyncio.gather(*(function(**x) for x in calls)))
+'''
+
+# Names used by the generated clients
+RESERVED_NAMES = {"call", "map", "close"}
+
+
+def get_client_source(symmetric_object, module_name, url=None):
+    """
+    Given a symmetric object (or a static symmetric object) of the module
+    :module_name, returns the source code of a python module with a
+    synchronous and an asynchronous client of its endpoints.
+    """
+    title = symmetric.helpers.humanize(module_name)
+    class_name = "".join(title.split()) + "Client"
+    names = get_method_names(symmetric_object.endpoints)
+    source = (f'"""\nClient of the {title} API, generated by symmetric '
+              f'{symmetric.__version__}.\n"""\n\n')
+    source += "\n".join(f"import {x}" for x in (
+        "json", "queue", "select", "typing", "asyncio", "functools",
+        "threading", "http.client", "urllib.parse", "concurrent.futures"))
+    source += "\n\n\n"
+    source += f"DEFAULT_URL = {url or 'http://127.0.0.1:5000'!r}\n"
+    source += "DEFAULT_POOL_SIZE = 10\n"
+    source += ("IDEMPOTENT_METHODS = frozenset(\n"
+               "    [\"GET\", \"HEAD\", \"PUT\", \"DELETE\", "
+               "\"OPTIONS\", \"TRACE\"])\n")
+    source += f"TOKEN_NAME = {symmetric_object.client_token_name!r}\n\n"
+    source += CLIENT_RUNTIME
+    source += f"\n\nclass {class_name}(BaseClient):\n"
+    source += f'    """Synchronous client of the {title} API."""\n'
+    for endpoint, name in zip(symmetric_object.endpoints, names):
+        source += "\n" + get_method_source(endpoint, name, False)
+    source += f"\n\nclass Async{class_name}(AsyncBaseClient):\n"
+    source += f'    """Asynchronous client of the {title} API."""\n\n'
+    source += ("    def __init__(self, url=DEFAULT_URL, token=None, "
+               "timeout=None,\n"
+               "                 pool_size=DEFAULT_POOL_SIZE):\n"
+               f"        super().__init__({class_name}(\n"
+               "            url, token, timeout, pool_size), pool_size)\n")
+    for endpoint, name in zip(symmetric_object.endpoints, names):
+        source += "\n" + get_method_source(endpoint, name, True)
+    return source
+
+
+def get_method_names(endpoints):
+    """
+    Returns the name of the client method of each endpoint (the name of its
+    function, or a name based on its route if it is not available).
+    """
+    names = []
+    for endpoint in endpoints:
+        name = endpoint.function.__name__
+        if not is_available(name, names):
+            name = re.sub(r"\W", "_", endpoint.route.strip("/")) or "root"
+            if not is_available(name, names):
+                name = f"call_{name}"
+        candidate, index = name, 2
+        while not is_available(candidate, names):
+            candidate, index = f"{name}_{index}", index + 1
+        names.append(candidate)
+    return names
+
+
+def is_available(name, names):
+    """Checks if :name can be used as a new client method name."""
+    if not name.isidentifier() or keyword.iskeyword(name):
+        return False
+    if name.startswith("_") or name in RESERVED_NAMES:
+        return False
+    return name not in names
+
+
+def get_method_source(endpoint, name, asynchronous):  # pylint: disable=R0914
+    """
+    Returns the source code of the client method :name that calls
+    :endpoint (awaiting the call if :asynchronous is True).
+    """
+    params = inspect.getfullargspec(endpoint.function)
+    args = params.args
+    defaults = dict(zip(reversed(params.args),
+                        reversed(params.defaults or ())))
+    timeout_name = "timeout" if "timeout" not in args else "timeout_"
+
+    signature = ["self"]
+    for arg in args:
+        annotation = get_annotation_source(params.annotations.get(arg))
+        if arg in defaults:
+            default = get_default_source(defaults[arg])
+            signature.append(f"{arg}: {annotation} = {default}")
+        else:
+            signature.append(f"{arg}: {annotation}")
+    signature.append(f"*, {timeout_name}: typing.Optional[float] = None")
+    if params.varkw is not None:
+        signature.append(f"**{params.varkw}: typing.Any")
+    returns = get_annotation_source(params.annotations.get("return"))
+
+    parameters = ", ".join(f'"{x}": {x}' for x in args)
+    if params.varkw is not None:
+        parameters = ", ".join(filter(None, [parameters, f"**{params.varkw}"]))
+    call = (f'self.call(\n            "{endpoint.methods[0]}", '
+            f'"{endpoint.route}", {{{parameters}}},\n'
+            f"            {endpoint.has_token}, {timeout_name})")
+
+    docstring = endpoint.docstring.replace("\\", "\\\\").replace(
+        '"""', '\\"\\"\\"')
+    docstring = "\n".join(
+        f"        {x}" if x else "" for x in docstring.splitlines())
+    method = "async def" if asynchronous else "def"
+    awaited = "await " if asynchronous else ""
+    lines = [f"    {method} {name}("]
+    lines.extend(f"            {x}," for x in signature)
+    lines[-1] = lines[-1][:-1]
+    lines.append(f"    ) -> {returns}:")
+    lines.append(f'        """\n{docstring}\n        """')
+    lines.append(f"        return {awaited}{call}")
+    return "\n".join(lines) + "\n"
+
+
+def get_annotation_source(annotation):
+    """
+    Returns the source code of the type :annotation, which can only use
+    builtin types and the typing module (typing.Any is used otherwise).
+    """
+    if annotation is None or annotation is object:
+        return "typing.Any"
+    if annotation is type(None):  # pylint: disable=C0123
+        return "None"
+    if isinstance(annotation, type) and getattr(
+            builtins, annotation.__name__, None) is annotation:
+        return annotation.__name__
+    source = repr(annotation)
+    if source.startswith("typing."):
+        # Generic types like typing.List[int]
+        names = re.findall(r"[\w.]+", source)
+        if all(is_portable_name(x) for x in names):
+            return source.replace("NoneType", "None")
+    return "typing.Any"
+
+
+def is_portable_name(name):
+    """
+    Checks if the type :name (used inside an annotation) can be written in
+    the generated client without importing the module of the API.
+    """
+    if name.startswith("typing."):
+        return hasattr(typing, name[len("typing."):])
+    if name == "NoneType":
+        return True
+    return isinstance(getattr(builtins, name, None), type)
+
+
+def get_default_source(default):
+    """
+    Returns the source code of the :default value of a parameter, or
+    UNSET if it can't be written as a literal (so it does not get sent).
+    """
+    source = repr(default)
+    try:
+        if ast.literal_eval(source) == default:
+            return source
+    except (ValueError, SyntaxError):
+        pass
+    return "UNSET"
@@ -3,12 +3,26 @@ A module for every constant of symmetric.
 """
 
 
+# Allowed HTTP methods
+ALLOWED_METHODS = [
+    "GET",
+    "PUT",
+    "POST",
+    "DELETE",
+    "OPTIONS",
+    "HEAD",
+    "PATCH",
+    "TRACE"
+]
+
 # Logs
 LOG_FILE_NAME = "symmetric.log"
 
 # Docs
 OPENAPI_ROUTE = "/openapi.json"
 DOCUMENTATION_ROUTE = "/docs"
+DOCS_CACHE_FILE_NAME = ".symmetric-docs-cache.json"
+DOCS_WATCH_INTERVAL = 0.05
 
 # API token authentication
 API_CLIENT_TOKEN_NAME = "symmetric_api_key"
@@ -30,3 +44,97 @@ ROUTE_PATTERN = (r"^\/$|^(?!.*[\/\-]{2,}.*)(?!.*[\-_]{2,}.*)(?!.*_{2,}.*)\/"
 #                     with previous rules, namely, the lookaheads)
 # (?<!\-)(?<!_)(?<!\/)$  => The final character can't be a hyphen, an
 #                           underscore nor a slash
+
+# Admission control
+DEFAULT_RETRY_AFTER = 1  # seconds
+DEFAULT_MAX_QUEUED = 64
+
+# Deadlines
+DEADLINE_HEADER_NAME = "X-Symmetric-Timeout"  # seconds
+DEFAULT_MAX_ABANDONED_THREADS = 8
+DEFAULT_WORKER_IDLE_TIMEOUT = 60  # seconds
+
+# Batching
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_BATCH_WAIT_MS = 5
+
+# Built-in routes
+STATS_ROUTE = "/symmetric/stats"
+JOBS_ROUTE = "/symmetric/jobs"
+HEALTH_ROUTE = "/symmetric/health"
+READY_ROUTE = "/symmetric/ready"
+
+# Background jobs
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_JOB_MAX_QUEUED = 64
+DEFAULT_JOB_RESULT_TTL = 3600  # seconds
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_ERROR = "The job failed."
+
+# Request tracing
+REQUEST_ID_HEADER_NAME = "X-Request-ID"
+MAX_REQUEST_ID_LENGTH = 128
+NO_REQUEST_ID = "-"
+
+# Lifecycle
+LIFECYCLE_PENDING = "pending"
+LIFECYCLE_STARTING = "starting"
+LIFECYCLE_READY = "ready"
+LIFECYCLE_FAILED = "failed"
+LIFECYCLE_STOPPED = "stopped"
+
+# Serialization
+ARRAY_FORMAT_LIST = "list"
+ARRAY_FORMAT_BUFFER = "buffer"
+FRAME_FORMAT_RECORDS = "records"
+FRAME_FORMAT_COLUMNS = "columns"
+
+# Recording
+DEFAULT_RECORDING_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_RECORDING_BACKUP_COUNT = 3
+RECORDING_EXCLUDED_HEADERS = [
+    "Authorization",
+    "Proxy-Authorization",
+    "Cookie",
+    "Content-Length",
+    "Host",
+    "X-Request-ID"
+]
+DEFAULT_REPLAY_CONCURRENCY = 8
+
+# Body limits
+BODY_READ_CHUNK_SIZE = 64 * 1024
+
+# Persistent cache
+PERSISTENT_CACHE_FILE_NAME = ".symmetric-cache.sqlite3"
+DEFAULT_PERSISTENT_CACHE_SIZE = 256 * 1024 * 1024
+PERSISTENT_CACHE_ACCESS_RESOLUTION = 60
+PERSISTENT_CACHE_BUSY_TIMEOUT = 30
+
+# Profiling
+PROFILE_ROUTE = "/symmetric/profile"
+DEFAULT_PROFILER_INTERVAL_MS = 10
+PROFILE_FILE_NAME = "symmetric-profile-{pid}.txt"
+
+# RPC channel
+RPC_ROUTE = "/symmetric/rpc"
+DEFAULT_RPC_CONCURRENCY = 8
+RPC_MAX_PENDING = 64
+
+# Server
+DEFAULT_WORKERS = 1
+DEFAULT_DRAIN_TIMEOUT = 30
+WORKER_BOOT_TIMEOUT = 120
+SERVER_POLL_INTERVAL = 0.1
+
+# Resources
+DEFAULT_RESOURCE_MIN_SIZE = 0
+DEFAULT_RESOURCE_MAX_SIZE = 10
+DEFAULT_RESOURCE_TIMEOUT = 30  # seconds
+
+# Manifest
+MANIFEST_FILE_NAME = ".symmetric-manifest.json"
@@ -2,14 +2,36 @@
 The main module of symmetric.
 """
 
+# pylint: disable=C0302
+
+import os
+import gc
 import sys
 import json
+import functools
+import importlib
+import importlib.util
 import bisect
 import flask
+import werkzeug.datastructures
 
 import symmetric.logging
 import symmetric.constants
+import symmetric.jobs
+import symmetric.timing
+import symmetric.lifecycle
+import symmetric.limits
+import symmetric.manifest
+import symmetric.dispatch
+import symmetric.profiling
+import symmetric.recording
+import symmetric.resources
+import symmetric.rpc
+import symmetric.routing
+import symmetric.serialization
+import symmetric.server
 import symmetric.endpoints
+import symmetric.options
 import symmetric.helpers
 import symmetric.errors
 import symmetric.openapi.utils
@@ -30,28 +52,30 @@ class _SymmetricSingleton(type):
         return cls.symmetric_instance  # Return symmetric object
 
 
-class _Symmetric(metaclass=_SymmetricSingleton):
+class _Symmetric(metaclass=_SymmetricSingleton):  # pylint: disable=R0902,R0904
 
     """
     Main class to encapsulate every important feature of the symmetric package.
     """
 
-    # Define allowed HTTP methods
-    __allowed_methods = [
-        "GET",
-        "PUT",
-        "POST",
-        "DELETE",
-        "OPTIONS",
-        "HEAD",
-        "PATCH",
-        "TRACE"
-    ]
-
     def __init__(self):
-        self.__app = flask.Flask(__name__)  # Create flask app object
+        # Create flask app object (matching its static routes in O(1))
+        self.__app = symmetric.routing.App(__name__)
+        self.__app.json_encoder = symmetric.serialization.JSONEncoder
         self.__endpoints = []
+        self.__routes = {}
+        self.__dispatched_routes = {}
+        self.__fast_dispatch = False
+        self.__rpc_concurrency = None
         self.__openapi_schema = None
+        self.__documentation = None
+        self.__manifest = None
+        self.__manifest_checked = False
+        self.__preloaded = False
+        self.__jobs = symmetric.jobs.JobStore(self.__execute)
+        self.__slow_request_threshold = None
+        self.__recorder = None
+        self.__lifecycle = symmetric.lifecycle.Lifecycle()
         self.__server_token_name = symmetric.constants.API_SERVER_TOKEN_NAME
         self.__client_token_name = symmetric.constants.API_CLIENT_TOKEN_NAME
         self.setup()
@@ -67,6 +91,8 @@ class _Symmetric(metaclass=_SymmetricSingleton):
         Returns the openapi schema. If it does not exist, it creates it
         and returns it.
         """
+        if not self.__openapi_schema and self.__get_manifest() is not None:
+            self.__openapi_schema = json.loads(self.__manifest["openapi"])
         if not self.__openapi_schema:
             self.__openapi_schema = symmetric.openapi.utils.get_openapi(
                 self,
@@ -76,6 +102,22 @@ class _Symmetric(metaclass=_SymmetricSingleton):
             )
         return self.__openapi_schema
 
+    @property
+    def documentation(self):
+        """
+        Returns the interactive documentation HTML. If it does not exist, it
+        renders it and returns it. Needs a flask application context.
+        """
+        if not self.__documentation and self.__get_manifest() is not None:
+            self.__documentation = self.__manifest["documentation"]
+        if not self.__documentation:
+            self.__documentation = symmetric.openapi.docs.get_redoc_html(
+                symmetric.helpers.humanize(
+                    symmetric.helpers.get_module_name(self)
+                ) + " API"
+            )
+        return self.__documentation
+
     @property
     def client_token_name(self):
         """Return the client token name."""
@@ -87,25 +129,199 @@ class _Symmetric(metaclass=_SymmetricSingleton):
         # pylint: disable=W0612
         @self.__app.route(symmetric.constants.OPENAPI_ROUTE)
         def openapi_schema():
+            if self.__get_manifest() is not None:
+                # The schema is already encoded
+                return self.__app.response_class(
+                    self.__manifest["openapi"], mimetype="application/json")
             return self.openapi
 
+        # Set up the endpoint for the runtime counters of every endpoint
+        # (which always requires the authentication token)
+        # pylint: disable=W0612
+        @self.__app.route(symmetric.constants.STATS_ROUTE)
+        def stats():
+            if not self.__is_authenticated(flask.request.headers):
+                return flask.jsonify({}), 401
+            return flask.jsonify({
+                endpoint.route: endpoint.stats()
+                for endpoint in self.__endpoints
+            })
+
+        # Set up the endpoints for the background jobs
+        # pylint: disable=W0612
+        @self.__app.route(symmetric.constants.JOBS_ROUTE)
+        def jobs():
+            # The jobs of the endpoints that require an authentication
+            # token only get listed to the requests that include it
+            authenticated = self.__is_authenticated(flask.request.headers)
+            return flask.jsonify([
+                job.describe(include_result=False)
+                for job in self.__jobs.jobs()
+                if authenticated or not job.endpoint.has_token
+            ])
+
+        # pylint: disable=W0612
+        @self.__app.route(
+            f"{symmetric.constants.JOBS_ROUTE}/<job_id>",
+            methods=["GET", "DELETE"]
+        )
+        def job_status(job_id):
+            try:
+                job = self.__jobs.get(job_id)
+                symmetric.helpers.authenticate(
+                    flask.request.headers, job.endpoint.has_token,
+                    self.__client_token_name, self.__server_token_name)
+                if flask.request.method == "DELETE" and not job.cancel():
+                    return flask.jsonify(job.describe()), 409
+                return flask.jsonify(job.describe())
+            except symmetric.errors.JobNotFoundError as err:
+                self.__app.logger.warning(
+                    "[[symmetric]] exception caught: %s", err
+                )
+                return flask.jsonify({}), 404
+            except symmetric.errors.AuthenticationRequiredError as err:
+                self.__app.logger.error(
+                    "[[symmetric]] exception caught: %s", err
+                )
+                return flask.jsonify({}), 401
+
+        # Set up the endpoint for the sampled stacks of every endpoint
+        # (which always requires the authentication token)
+        # pylint: disable=W0612
+        @self.__app.route(symmetric.constants.PROFILE_ROUTE)
+        def profile():
+            if not self.__is_authenticated(flask.request.headers):
+                return flask.jsonify({}), 401
+            profiler = symmetric.profiling.profiler
+            if not profiler.enabled:
+                return flask.jsonify({}), 404
+            stats = profiler.stats()
+            return flask.Response(
+                profiler.collapsed(flask.request.args.get("route")),
+                mimetype="text/plain",
+                headers={
+                    "X-Profile-Samples": str(stats["samples"]),
+                    "X-Profile-Overhead": f"{stats['overhead']:.4f}"
+                }
+            )
+
+        # Set up the liveness and readiness endpoints
+        # pylint: disable=W0612
+        @self.__app.route(symmetric.constants.HEALTH_ROUTE)
+        def health():
+            if self.__lifecycle.state == symmetric.constants.LIFECYCLE_FAILED:
+                return flask.jsonify({"status": self.__lifecycle.state}), 503
+            return flask.jsonify({"status": "alive"})
+
+        # pylint: disable=W0612
+        @self.__app.route(symmetric.constants.READY_ROUTE)
+        def ready():
+            status_code = 200 if self.__lifecycle.ready else 503
+            return flask.jsonify({
+                "status": self.__lifecycle.state
+            }), status_code
+
         # Set up the endpoint for the interactive documentation
         # pylint: disable=W0612
         @self.__app.route(symmetric.constants.DOCUMENTATION_ROUTE)
         def docs():
-            return symmetric.openapi.docs.get_redoc_html(
-                symmetric.helpers.humanize(
-                    symmetric.helpers.get_module_name(self)
-                ) + " API"
-            )
+            return self.documentation
 
     def __call__(self, *args, **kwargs):
         """
         Enable WSGI servers to start with CLI utilities
-        (like gunicorn module:symmetric).
+        (like gunicorn module:symmetric). The first call starts the startup
+        of the API in the background.
         """
+        if self.__lifecycle.pending:
+            self.__lifecycle.start_in_background()
+        if self.__fast_dispatch and self.__recorder is None:
+            return self.__dispatch(*args, **kwargs)
         return self.__app.__call__(*args, **kwargs)
 
+    def on_startup(self, function):
+        """
+        Decorator. Registers :function to be executed (without arguments)
+        when the API starts, before warming up the endpoints. Returns the
+        original function unchanged.
+        """
+        self.__lifecycle.add_startup_hook(function)
+        return function
+
+    def on_shutdown(self, function):
+        """
+        Decorator. Registers :function to be executed (without arguments)
+        when the API shuts down. Returns the original function unchanged.
+        """
+        self.__lifecycle.add_shutdown_hook(function)
+        return function
+
+    def startup(self):
+        """
+        Runs the startup hooks and warms up the endpoints (only once).
+        Returns whether or not the API is ready to take traffic.
+        """
+        return self.__lifecycle.start()
+
+    def shutdown(self):
+        """
+        Runs the shutdown hooks (only once). They also run when the process
+        exits normally.
+        """
+        self.__lifecycle.shutdown()
+        return True
+
+    def preload(self, module_name=None):
+        """
+        Prepares the symmetric object to be shared by forked workers. Meant
+        to be called in the master process of a preforking WSGI server, right
+        before forking. Imports :module_name (if given), builds the OpenAPI
+        schema and the documentation, and then moves every object tracked by
+        the garbage collector to a permanent generation, so the collections
+        of the workers don't write to (and copy) the pages shared with the
+        master process. The forked workers start their startup in the
+        background right away, instead of waiting for their first request.
+        """
+        if module_name is not None:
+            sys.path.insert(0, ".")
+            importlib.import_module(module_name)
+        with self.__app.app_context():
+            # pylint: disable=W0104
+            self.openapi
+            self.documentation
+        if not self.__preloaded and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self.__lifecycle.after_fork)
+        self.__preloaded = True
+        gc.collect()
+        if hasattr(gc, "freeze"):
+            gc.freeze()
+        else:
+            self.__app.logger.warning(
+                "[[symmetric]] gc.freeze requires python 3.7 or greater, "
+                "the objects of the master process won't get frozen."
+            )
+        return True
+
+    def get_manifest(self, source_hash):
+        """
+        Returns the manifest of the API (its endpoints, its encoded OpenAPI
+        schema and its rendered documentation), built from the source file
+        of the module with :source_hash.
+        """
+        with self.__app.app_context():
+            return symmetric.manifest.get_manifest(
+                self.__endpoints, self.openapi, self.documentation,
+                source_hash)
+
+    def use_manifest(self, manifest):
+        """
+        Uses :manifest to skip the work that the module would repeat on
+        every boot. Must be called before importing the module. If any
+        endpoint does not match the manifest, it gets discarded.
+        """
+        self.__manifest = manifest
+        return True
+
     def set_client_token_name(self, client_token_name):
         """Changes the default client token name to :client_token_name."""
         if not isinstance(client_token_name, str):  # Manage wrong type
@@ -134,130 +350,717 @@ class _Symmetric(metaclass=_SymmetricSingleton):
         self.__server_token_name = server_token_name
         return True
 
+    def set_slow_request_threshold(self, milliseconds):
+        """
+        Makes every request that takes more than :milliseconds log the
+        duration of each one of its phases. Use None to disable it.
+        """
+        self.__slow_request_threshold = milliseconds
+        return True
+
+    def set_job_options(self, max_workers=None, max_queued=None,
+                        result_ttl=None):
+        """
+        Changes the amount of background job workers, the maximum amount of
+        queued background jobs and the amount of seconds that the results of
+        the finished jobs are kept.
+        """
+        self.__jobs.configure(max_workers, max_queued, result_ttl)
+        return True
+
+    def record_requests(self, filename, sample_rate=1.0, max_bytes=None,
+                        backup_count=None):
+        """
+        Starts recording a sample of the requests (a fraction equal to
+        :sample_rate) into :filename, to be replayed later. The file gets
+        rotated after :max_bytes, keeping :backup_count old files.
+        """
+        if self.__recorder is not None:
+            self.__recorder.close()
+        self.__recorder = symmetric.recording.Recorder(
+            filename, sample_rate, max_bytes, backup_count)
+        return True
+
+    def stop_recording(self):
+        """Stops recording the requests (if they were being recorded)."""
+        if self.__recorder is not None:
+            self.__recorder.close()
+            self.__recorder = None
+        return True
+
+    def enable_profiler(self, interval_ms=None, dump_signal=None):
+        """
+        Enables the sampling profiler, which takes a sample of the stacks of
+        the threads serving requests every :interval_ms milliseconds. The
+        collapsed stacks of every endpoint can be queried at the profile
+        route, or written into a file when the process receives the
+        :dump_signal signal (if given).
+        """
+        symmetric.profiling.profiler.enable(interval_ms)
+        if dump_signal is not None:
+            symmetric.profiling.profiler.dump_on_signal(dump_signal)
+        return True
+
+    def set_body_limits(self, max_size=None, max_depth=None,
+                        max_elements=None):
+        """
+        Changes the default limits of the request bodies: their size (in
+        bytes), their nesting depth and their amount of elements. The
+        endpoints can override them using the router.
+        """
+        symmetric.limits.default_limits.configure(
+            max_size, max_depth, max_elements)
+        # The limits get documented, so the manifest gets checked again
+        self.__manifest_checked = False
+        return True
+
+    def set_fast_dispatch(self, enabled=True):
+        """
+        Enables (or disables) the lean WSGI dispatcher, which serves the
+        requests to the endpoints without going through flask. Endpoints
+        that run in the background or use HTTP caching, requests that bind
+        the query string, the built-in routes and every other request still
+        get served by flask.
+        """
+        self.__fast_dispatch = enabled
+        return True
+
+    def enable_rpc(self, route=None, concurrency=None):
+        """
+        Enables the RPC channel, a WebSocket route (the RPC route by default)
+        where the clients authenticate once and then send pipelined calls to
+        the endpoints, running up to :concurrency calls of each connection at
+        the same time. Needs the simple_websocket package.
+        """
+        if importlib.util.find_spec("simple_websocket") is None:
+            error = ("The RPC channel needs the simple_websocket package "
+                     "(pip install simple-websocket).")
+            raise symmetric.errors.RPCConfigurationError(error)
+        self.__rpc_concurrency = concurrency
+        self.__app.add_url_rule(
+            route if route is not None else symmetric.constants.RPC_ROUTE,
+            "symmetric_rpc", self.__serve_rpc)
+        return True
+
+    def connect_rpc(self, token=None):
+        """
+        Returns an in-process connection to the RPC channel (authenticated
+        with :token, if given), which does not need a socket.
+        """
+        headers = {}
+        if token is not None:
+            headers[self.__client_token_name] = token
+        return symmetric.rpc.LocalConnection(
+            lambda send: self.__create_rpc_session(send, headers))
+
+    def call(self, route, body=None, headers=None):
+        """
+        Calls the endpoint of :route in-process, without HTTP nor JSON. The
+        :body dictionary gets authenticated with :headers, filtered and
+        validated just like the body of a request, and the result of the
+        function gets returned as is (the background endpoints return the
+        description of their job, and the endpoints with a persistent cache
+        return the deserialized result stored in the cache). Raises
+        EndpointNotFoundError if the route does not exist, and the exception
+        that would have become the error response otherwise.
+        """
+        endpoint = self.__routes.get(route)
+        if endpoint is None:
+            error = f"Endpoint '{route}' does not exist."
+            raise symmetric.errors.EndpointNotFoundError(error)
+        # The header names are case-insensitive
+        headers = werkzeug.datastructures.Headers(headers)
+        timer = symmetric.timing.PhaseTimer()
+        symmetric.logging.start_request(headers)
+        symmetric.profiling.profiler.enter(endpoint.route)
+        try:
+            self.__log_request("CALL", endpoint.route, endpoint.function, body)
+            return self.__call_endpoint(endpoint, body, headers, timer)
+        finally:
+            self.__log_timing(endpoint, timer)
+            symmetric.profiling.profiler.exit()
+            symmetric.logging.finish_request()
+
+    def add_resource(self, factory, min_size=None, max_size=None,
+                     health_check=None, close=None, timeout=None):
+        """
+        Configures the pool of the resources created by :factory (shared by
+        every endpoint that uses it), with :min_size resources created on
+        startup and up to :max_size resources. The idle resources get
+        checked with :health_check before being checked out, and the broken
+        ones get closed with :close. Calls that wait more than :timeout
+        seconds for a resource get a 503 response. Must be called before
+        the routers that use the factory.
+        """
+        symmetric.resources.pools.register(
+            factory, min_size, max_size, health_check, close, timeout)
+        return True
+
+    def set_serialization_options(self, array_format=None, frame_format=None):
+        """
+        Changes the format of the NumPy arrays returned by the endpoints
+        ("list" or "buffer", a base64 encoded buffer with its dtype and shape)
+        and of the pandas data frames ("records" or "columns").
+        """
+        symmetric.serialization.serializers.configure(
+            array_format, frame_format)
+        return True
+
+    def register_serializer(self, type_obj, function):
+        """
+        Registers :function as the serializer of the objects of type
+        :type_obj returned by the endpoints. The serializer must return a
+        JSON serializable object.
+        """
+        symmetric.serialization.serializers.register(type_obj, function)
+        return True
+
     def router(self, route, methods=["post"], response_code=200,
-               auth_token=False):
+               auth_token=False, **options):
         """
         Decorator modifier. Recieves a route string, a list of HTTP methods, a
         response code and a boolean indicating whether or not to authenticate.
+        The rest of the keyword :options configure the features of the
+        endpoint (its admission limits, timeout, validation, batching,
+        warm-up, HTTP caching, body limits, persistent cache, background
+        refresh and resources), as described in the decorator docs. They get
+        grouped by feature using the symmetric.options module.
         The route gets format-checked. Returns the original function unchanged.
         """
+        options = symmetric.options.get_options(options)
         try:
-            symmetric.helpers.parse_route(route)
+            if not self.__is_in_manifest(route):
+                symmetric.helpers.parse_route(route)
         except symmetric.errors.IncorrectRouteFormatError as err:
             self.__app.logger.error(
-                f"[[symmetric]] IncorrectRouteFormatError: {err}"
+                "[[symmetric]] IncorrectRouteFormatError: %s", err
             )
             sys.exit(1)
 
-        methods = [
-            symmetric.helpers.verb(x) for x in methods
-            if symmetric.helpers.verb(x) in _Symmetric.__allowed_methods
-        ]
+        methods = symmetric.helpers.get_methods(methods)
 
         def decorator(function):
             """
             Function decorator. Recieves the main function and wraps it as a
             flask endpoint. Returns the original unwrapped function.
             """
+
             # Decorate the wrapper
             @self.__app.route(
                 route, methods=methods, endpoint=function.__name__
             )
             def wrapper(*args, **kwargs):
                 """
-                Function wrapper. The main function gets logged, the JSON body
-                gets extracted from the request and gets unpacked as **kwargs
-                to pass to the main function. Some precautions are also taken
-                (namely a try/except combo). Returns the function's output
-                jsonified with a response code.
+                Function wrapper. The request gets tagged with a request id
+                and handled by the main function, timing each phase. Returns
+                the function's output jsonified with a response code, a
+                Server-Timing header and the request id header.
                 """
+                timer = symmetric.timing.PhaseTimer()
+                request_id = symmetric.logging.start_request(
+                    flask.request.headers)
+                symmetric.profiling.profiler.enter(endpoint.route)
                 try:
-                    self.__log_request(flask.request, route, function)
-
-                    # Get the body
-                    body = flask.request.get_json()
-                    request_headers = flask.request.headers
-                    if not body:
-                        body = {}
-
-                    # Check for token authentication
-                    symmetric.helpers.authenticate(
-                        request_headers, auth_token, self.__client_token_name,
-                        self.__server_token_name)
-
-                    # Filter method parameters
-                    parameters = symmetric.helpers.filter_params(
-                        function, body, auth_token, self.__client_token_name)
-                    return flask.jsonify(function(**parameters)), response_code
-                except symmetric.errors.AuthenticationRequiredError as err:
-                    # Error authenticating
-                    self.__app.logger.error(
-                        f"[[symmetric]] exception caught: {err}"
-                    )
-                    return flask.jsonify({}), 401
-                except Exception as err:
-                    self.__app.logger.error(
-                        f"[[symmetric]] exception caught: {err}"
-                    )
-                    return flask.jsonify({}), 500
+                    response = flask.make_response(
+                        self.__respond(endpoint, timer))
+                    if endpoint.cache_policy is not None:
+                        endpoint.cache_policy.apply(response, flask.request)
+                    response.headers["Server-Timing"] = timer.header()
+                    response.headers[
+                        symmetric.constants.REQUEST_ID_HEADER_NAME
+                    ] = request_id
+                    self.__log_timing(endpoint, timer)
+                    if self.__recorder is not None:
+                        self.__recorder.record(
+                            endpoint, flask.request,
+                            flask.g.get("symmetric_body"), response,
+                            timer.total(), self.__client_token_name)
+                    return response
+                finally:
+                    symmetric.profiling.profiler.exit()
+                    symmetric.logging.finish_request()
 
             # Save Endpoint
+            endpoint = symmetric.endpoints.create_endpoint(
+                route,
+                methods,
+                response_code,
+                function,  # Save unchanged function
+                wrapper,   # Save flask decorated function
+                auth_token,
+                options
+            )
             try:
-                self.__save_endpoint(
-                    symmetric.endpoints.Endpoint(
-                        route,
-                        methods,
-                        response_code,
-                        function,  # Save unchanged function
-                        wrapper,   # Save flask decorated function
-                        auth_token
-                    )
-                )
+                self.__save_endpoint(endpoint)
             except symmetric.errors.DuplicatedRouteError as err:
                 self.__app.logger.error(
-                    f"[[symmetric]] DuplicatedRouteError: {err}"
+                    "[[symmetric]] DuplicatedRouteError: %s", err
                 )
                 sys.exit(1)
 
+            # Save the warm-up calls
+            if options.warmup is not None:
+                bodies = options.warmup
+                if not isinstance(bodies, list):
+                    bodies = [bodies]
+                for body in bodies:
+                    self.__lifecycle.add_warmup(
+                        functools.partial(self.__warm_up, endpoint, body))
+
+            # Compute the first result of the refreshed endpoints
+            if endpoint.refresher is not None:
+                self.__lifecycle.add_warmup(endpoint.refresher.start)
+                self.__lifecycle.add_shutdown_hook(endpoint.refresher.stop)
+
+            # Fill the resource pools on startup
+            for pool in endpoint.resources.values():
+                self.__lifecycle.add_warmup(pool.fill)
+                self.__lifecycle.add_shutdown_hook(pool.close)
+
             return function  # Return unchanged function
         return decorator
 
     def run(self, *args, **kwargs):
-        """Executes the main run function of the Flask object."""
+        """
+        Runs the startup of the API and executes the main run function of
+        the Flask object.
+        """
+        # With the debug reloader, only the reloaded process serves requests
+        if not kwargs.get("debug") or os.getenv("WERKZEUG_RUN_MAIN"):
+            self.startup()
+        # The RPC channel needs the socket of the connection
+        kwargs.setdefault(
+            "request_handler", symmetric.server.SocketRequestHandler)
         self.__app.run(*args, **kwargs)
 
-    def generate_markdown_documentation(self, module_name):
+    def generate_markdown_documentation(self, module_name, cache=None):
         """
         Gets the documentation of every endpoint and assembles it into a
-        markdown formatted string.
-        """
-        docs = f"# {symmetric.helpers.humanize(module_name)} "
-        docs += "API Documentation\n\n"
-        docs += ("Endpoints that require an authentication token should "
-                 f"send it in a key named `{self.__client_token_name}` "
-                 "inside the request headers.\n\n")
-        raw_docs = [
-            x.generate_markdown_documentation() for x in self.__endpoints]
-        docs += "\n".join(raw_docs)
-        return docs
+        markdown formatted string, reusing the fragments of :cache (if
+        given) for the endpoints that did not change.
+        """
+        return symmetric.helpers.get_markdown_documentation(
+            self, module_name, cache)
 
     def __save_endpoint(self, endpoint):
         """Saves an endpoint object and sorts the endpoints list."""
-        if endpoint in self.__endpoints:
+        if endpoint.route in self.__routes:
             message = f"Endpoint '{endpoint.route}' was defined twice."
             raise symmetric.errors.DuplicatedRouteError(message)
+        self.__manifest_checked = False
         bisect.insort(self.__endpoints, endpoint)
+        self.__routes[endpoint.route] = endpoint
+        if not endpoint.background and endpoint.cache_policy is None:
+            # The rest of the endpoints need the flask request and response
+            self.__dispatched_routes[endpoint.route] = endpoint
+
+    def __is_in_manifest(self, route):
+        """
+        Returns whether or not :route was already validated when building
+        the manifest.
+        """
+        if self.__manifest is None:
+            return False
+        return route in self.__manifest["endpoints"]
+
+    def __get_manifest(self):
+        """
+        Returns the manifest (or None if it is not used), discarding it if
+        any of its endpoints was not defined or does not match the defined
+        endpoint. The endpoints only get checked again after they change.
+        """
+        if self.__manifest is not None and not self.__manifest_checked:
+            self.__manifest_checked = True
+            described = self.__manifest["endpoints"]
+            if len(described) != len(self.__routes):
+                self.__discard_manifest("some endpoints are missing")
+                return None
+            for endpoint in self.__endpoints:
+                description = symmetric.manifest.describe_endpoint(endpoint)
+                if described.get(endpoint.route) != description:
+                    self.__discard_manifest(
+                        f"'{endpoint.route}' endpoint changed")
+                    return None
+        return self.__manifest
+
+    def __discard_manifest(self, reason):
+        """Stops using the manifest because of :reason."""
+        self.__app.logger.warning(
+            "[[symmetric]] the manifest is stale (%s), run the build "
+            "command again to use it.", reason
+        )
+        self.__manifest = None
+
+    def __respond(self, endpoint, timer):
+        """
+        Handles the current flask request to :endpoint. The JSON body gets
+        extracted from the request and gets unpacked as **kwargs to pass to
+        the main function. Some precautions are also taken (namely a
+        try/except combo). The phases of the request get timed using
+        :timer. Returns the function's output jsonified with a response code.
+        """
+        try:
+            with timer.phase("parse"):
+                # Get the body (or the query string)
+                from_query = endpoint.binds_query and bool(flask.request.args)
+                if from_query and flask.request.method == "GET":
+                    body = symmetric.helpers.get_query_params(
+                        flask.request.args)
+                else:
+                    from_query = False
+                    # The limits get checked before parsing the body
+                    body = endpoint.body_limits.resolve(
+                        symmetric.limits.default_limits
+                    ).read_json(flask.request)
+                # The streamed bodies can only be read once, so the parsed
+                # body gets kept to record it
+                flask.g.symmetric_body = body
+                self.__log_request(flask.request.method, endpoint.route,
+                                   endpoint.function, body)
+                request_headers = flask.request.headers
+                if not body:
+                    body = {}
+
+                # Get the request deadline
+                deadline = endpoint.supervisor.get_deadline(request_headers)
+
+            parameters = self.__get_parameters(
+                endpoint, body, request_headers, from_query, timer)
+
+            # Enqueue the background job
+            if endpoint.background:
+                with timer.phase("enqueue"):
+                    job = self.__jobs.submit(endpoint, parameters)
+                return flask.jsonify(job.describe()), 202, {
+                    "Location": job.location
+                }
+
+            if endpoint.persistent_cache is not None:
+                body = self.__call_cached(
+                    endpoint, parameters, deadline, timer, flask.json.dumps)
+                return self.__app.response_class(
+                    body, mimetype="application/json"), endpoint.response_code
+
+            with timer.phase("call"):
+                result = self.__execute(endpoint, parameters, deadline)
+            with timer.phase("serialize"):
+                return (flask.jsonify(result), endpoint.response_code,
+                        self.__get_headers(endpoint))
+        except Exception as err:
+            body, status_code, headers = self.__get_error_response(err)
+            return flask.jsonify(body), status_code, headers
+
+    def __dispatch(self, environ, start_response):
+        """
+        Lean WSGI application. Serves the requests to the dispatched routes
+        without pushing a flask request context, matching the URL map or
+        creating response objects. Every other request (and the requests
+        that need flask features) falls back to the flask app.
+        """
+        endpoint = self.__dispatched_routes.get(environ.get("PATH_INFO"))
+        if not symmetric.dispatch.can_dispatch(endpoint, environ):
+            return self.__app(environ, start_response)
+        timer = symmetric.timing.PhaseTimer()
+        request_headers = symmetric.dispatch.get_headers(environ)
+        request_id = symmetric.logging.start_request(request_headers)
+        symmetric.profiling.profiler.enter(endpoint.route)
+        try:
+            body, status_code, headers = self.__respond_directly(
+                endpoint, environ, request_headers, timer)
+            response_headers = [
+                symmetric.dispatch.CONTENT_TYPE_HEADER,
+                ("Content-Length", str(len(body))),
+                *headers.items(),
+                ("Server-Timing", timer.header()),
+                (symmetric.constants.REQUEST_ID_HEADER_NAME, request_id)
+            ]
+            self.__log_timing(endpoint, timer)
+            start_response(
+                symmetric.dispatch.get_status_line(status_code),
+                response_headers)
+            return [body]
+        finally:
+            symmetric.profiling.profiler.exit()
+            symmetric.logging.finish_request()
+
+    def __respond_directly(self, endpoint, environ, request_headers, timer):
+        """
+        Handles the request described by the WSGI :environ to :endpoint just
+        like __respond handles the flask request, timing each phase using
+        :timer. Returns the encoded body, the status code and the headers of
+        the response.
+        """
+        try:
+            with timer.phase("parse"):
+                # The limits get checked before parsing the body
+                body = symmetric.dispatch.read_json(
+                    environ, endpoint.body_limits.resolve(
+                        symmetric.limits.default_limits))
+                self.__log_request(environ["REQUEST_METHOD"], endpoint.route,
+                                   endpoint.function, body)
+                if not body:
+                    body = {}
+
+                # Get the request deadline
+                deadline = endpoint.supervisor.get_deadline(request_headers)
+
+            parameters = self.__get_parameters(
+                endpoint, body, request_headers, False, timer)
+
+            if endpoint.persistent_cache is not None:
+                body = self.__call_cached(
+                    endpoint, parameters, deadline, timer, functools.partial(
+                        symmetric.dispatch.dumps, self.__app))
+                return body.encode(), endpoint.response_code, {}
+
+            with timer.phase("call"):
+                result = self.__execute(endpoint, parameters, deadline)
+            with timer.phase("serialize"):
+                body = symmetric.dispatch.jsonify(self.__app, result)
+                return body, endpoint.response_code, self.__get_headers(
+                    endpoint)
+        except Exception as err:
+            body, status_code, headers = self.__get_error_response(err)
+            return symmetric.dispatch.jsonify(
+                self.__app, body), status_code, headers
+
+    def __serve_rpc(self):
+        """
+        Serves a connection to the RPC channel. The authentication token can
+        be sent in the headers of the WebSocket handshake.
+        """
+        simple_websocket = importlib.import_module("simple_websocket")
+        headers = {}
+        if self.__client_token_name in flask.request.headers:
+            headers[self.__client_token_name] = flask.request.headers[
+                self.__client_token_name]
+        connection = simple_websocket.Server(flask.request.environ)
+        session = self.__create_rpc_session(connection.send, headers)
+        try:
+            while True:
+                session.receive(connection.receive())
+        except simple_websocket.ConnectionClosed:
+            pass
+        finally:
+            session.close()
+        return symmetric.rpc.ClosedConnectionResponse(connection.mode)
+
+    def __create_rpc_session(self, send, headers):
+        """Returns an RPC session that sends its replies using :send."""
+        return symmetric.rpc.Session(
+            self.__call_rpc, self.__authenticate_rpc, send,
+            functools.partial(symmetric.dispatch.dumps, self.__app),
+            headers, self.__rpc_concurrency)
+
+    def __authenticate_rpc(self, token):
+        """
+        Returns the headers that authenticate the calls of an RPC session
+        with :token, or None if the token is incorrect.
+        """
+        headers = {self.__client_token_name: token}
+        try:
+            symmetric.helpers.authenticate(
+                headers, True, self.__client_token_name,
+                self.__server_token_name)
+        except symmetric.errors.AuthenticationRequiredError as err:
+            self.__app.logger.error("[[symmetric]] exception caught: %s", err)
+            return None
+        return headers
+
+    def __call_rpc(self, route, body, headers):
+        """
+        Handles a call to the endpoint of :route received through the RPC
+        channel, just like __respond handles a request. Returns the status
+        and the result of the call.
+        """
+        endpoint = self.__routes.get(route)
+        if endpoint is None:
+            return 404, {}
+        timer = symmetric.timing.PhaseTimer()
+        symmetric.logging.start_request({})
+        symmetric.profiling.profiler.enter(endpoint.route)
+        try:
+            self.__log_request("RPC", endpoint.route, endpoint.function, body)
+            result = self.__call_endpoint(endpoint, body, headers, timer)
+            if endpoint.background:
+                return 202, result
+            return endpoint.response_code, result
+        except Exception as err:
+            result, status_code, _ = self.__get_error_response(err)
+            return status_code, result
+        finally:
+            self.__log_timing(endpoint, timer)
+            symmetric.profiling.profiler.exit()
+            symmetric.logging.finish_request()
+
+    def __call_endpoint(self, endpoint, body, headers, timer):
+        """
+        Calls :endpoint with :body and :headers without going through HTTP,
+        timing each phase using :timer. Returns the result of the function
+        (or the description of the job, for the background endpoints, and
+        the deserialized result, for the endpoints with a persistent cache).
+        """
+        # The token gets filtered out of the parameters
+        body = dict(body) if body else {}
+        deadline = endpoint.supervisor.get_deadline(headers)
+        parameters = self.__get_parameters(
+            endpoint, body, headers, False, timer)
+        if endpoint.background:
+            with timer.phase("enqueue"):
+                return self.__jobs.submit(endpoint, parameters).describe()
+        if endpoint.persistent_cache is not None:
+            return json.loads(self.__call_cached(
+                endpoint, parameters, deadline, timer, functools.partial(
+                    symmetric.dispatch.dumps, self.__app)))
+        with timer.phase("call"):
+            return self.__execute(endpoint, parameters, deadline)
+
+    def __get_parameters(self, endpoint, body, headers, from_query, timer):
+        """
+        Authenticates the request with :headers and returns the parameters
+        of the function of :endpoint, filtered (and validated) from :body.
+        """
+        # Check for token authentication
+        with timer.phase("auth"):
+            symmetric.helpers.authenticate(
+                headers, endpoint.has_token,
+                self.__client_token_name, self.__server_token_name)
+
+        with timer.phase("params"):
+            # Filter method parameters
+            parameters = symmetric.helpers.filter_params(
+                endpoint.function, body, endpoint.has_token,
+                self.__client_token_name)
+
+            # Validate method parameters
+            if endpoint.validator is not None:
+                # Query string parameters always get coerced
+                parameters = endpoint.validator(
+                    parameters, True if from_query else None)
+        return parameters
+
+    def __is_authenticated(self, headers):
+        """Checks if :headers include the correct authentication token."""
+        try:
+            symmetric.helpers.authenticate(
+                headers, True,
+                self.__client_token_name, self.__server_token_name)
+        except symmetric.errors.AuthenticationRequiredError:
+            return False
+        return True
+
+    def __get_error_response(self, err):
+        """
+        Logs the exception :err caught while handling a request and returns
+        the body, the status code and the headers of the error response.
+        """
+        if isinstance(err, (symmetric.errors.RateLimitExceededError,
+                            symmetric.errors.ServerOverloadedError)):
+            # Too many requests or no execution slots available
+            self.__app.logger.warning(
+                "[[symmetric]] exception caught: %s", err
+            )
+            status_code = 429 if isinstance(
+                err, symmetric.errors.RateLimitExceededError) else 503
+            return {}, status_code, {"Retry-After": str(err.retry_after)}
+        self.__app.logger.error(
+            "[[symmetric]] exception caught: %s", err
+        )
+        if isinstance(err, symmetric.errors.AuthenticationRequiredError):
+            # Error authenticating
+            return {}, 401, {}
+        if isinstance(err, symmetric.errors.PayloadTooLargeError):
+            # The body is too big
+            return {}, 413, {}
+        if isinstance(err, symmetric.errors.InvalidDeadlineError):
+            # The timeout of the client is not valid
+            return {}, 400, {}
+        if isinstance(err, symmetric.errors.ValidationError):
+            # Invalid parameters
+            return {"errors": err.errors}, 422, {}
+        if isinstance(err, symmetric.errors.DeadlineExceededError):
+            # The request took too long
+            return {}, 504, {}
+        return {}, 500, {}
+
+    @staticmethod
+    def __get_headers(endpoint):
+        """Returns the headers of a successful response of :endpoint."""
+        if endpoint.refresher is not None:
+            return endpoint.refresher.headers()
+        return {}
+
+    def __warm_up(self, endpoint, body):
+        """Calls the function of :endpoint with the warm-up :body."""
+        self.__app.logger.info("Warming up '%s' endpoint.", endpoint.route)
+        parameters = symmetric.helpers.filter_params(
+            endpoint.function, dict(body), endpoint.has_token,
+            self.__client_token_name)
+        if endpoint.validator is not None:
+            parameters = endpoint.validator(parameters)
+        self.__execute(endpoint, parameters, None)
+
+    def __call_cached(self, endpoint, parameters, deadline, timer, dumps):
+        """
+        Returns the result stored in the persistent cache of :endpoint for
+        :parameters, calling the function (and storing its result, serialized
+        using :dumps) only if it is not stored yet.
+        """
+        cache = endpoint.persistent_cache
+        with timer.phase("cache"):
+            key = cache.get_key(parameters)
+            body = cache.get(key)
+        if body is None:
+            with timer.phase("call"):
+                result = self.__execute(endpoint, parameters, deadline)
+            with timer.phase("serialize"):
+                body = dumps(result)
+                cache.set(key, body)
+        return body
+
+    def __execute(self, endpoint, parameters, deadline):
+        """
+        Waits for an execution slot of :endpoint and calls its function with
+        :parameters (batched with other requests if the endpoint batches its
+        requests) before the monotonic :deadline passes. The endpoints that
+        refresh their result in the background return it from memory.
+        """
+        if endpoint.refresher is not None:
+            # The result is served from memory
+            return endpoint.refresher.get()
+        if endpoint.admission is not None:
+            endpoint.admission.enter(deadline)
+        try:
+            if endpoint.batcher is not None:
+                return endpoint.batcher.submit(parameters, deadline)
+            return endpoint.supervisor.run(
+                endpoint.function, parameters, deadline)
+        finally:
+            if endpoint.admission is not None:
+                endpoint.admission.exit()
+
+    def __log_timing(self, endpoint, timer):
+        """
+        Logs the duration of each phase of the request if the request was
+        slower than the slow request threshold.
+        """
+        threshold = self.__slow_request_threshold
+        if threshold is None or timer.total() < threshold:
+            return
+        self.__app.logger.warning(
+            "Slow request to '%s' endpoint (%.3f ms): %s.",
+            endpoint.route, timer.total(), timer.describe()
+        )
 
-    def __log_request(self, request, route, function):
+    def __log_request(self, method, route, function, body):
         """
-        Recieves a request object, a route string and a function and
-        logs the request event. It also logs the json body of the request.
+        Recieves a request method, a route string, a function and the body
+        of the request and logs the request event. It also logs the body.
         """
         self.__app.logger.info(
-            f"{request.method} request to '{route}' endpoint "
-            f"('{function.__name__}' function)."
+            "%s request to '%s' endpoint ('%s' function).",
+            method, route, function.__name__
         )
-        body = request.get_json()
         if body:
             self.__log_body(body)
 
@@ -0,0 +1,240 @@
+"""
+A module to hold the deadline supervision utilities of symmetric.
+"""
+
+import os
+import math
+import time
+import queue
+import threading
+
+import symmetric.constants
+import symmetric.errors
+import symmetric.logging
+import symmetric.profiling
+
+
+def get_client_timeout(header):
+    """
+    Returns the timeout (in seconds) sent by the client in the deadline
+    :header. Raises InvalidDeadlineError if it is not a finite and positive
+    number.
+    """
+    try:
+        timeout = float(header)
+    except ValueError:
+        timeout = None
+    if timeout is None or not math.isfinite(timeout) or timeout <= 0:
+        error = (f"The {symmetric.constants.DEADLINE_HEADER_NAME} header "
+                 "must be a positive number of seconds.")
+        raise symmetric.errors.InvalidDeadlineError(error)
+    return timeout
+
+
+class Supervisor:
+
+    """
+    Class to encapsulate the supervised execution of an endpoint function.
+    The functions run in the threads shared by every supervisor, and the
+    ones that exceed their deadline get abandoned (python threads can't be
+    killed), so the amount of abandoned threads that are still running is
+    bounded.
+    """
+
+    def __init__(self, timeout=None, max_abandoned=None):
+        self.__timeout = timeout
+        self.__max_abandoned = (
+            symmetric.constants.DEFAULT_MAX_ABANDONED_THREADS
+            if max_abandoned is None else max_abandoned
+        )
+        self.__lock = threading.Lock()
+        self.__abandoned = 0
+        self.__timeouts = 0
+
+    @property
+    def timeout(self):
+        """Returns the default timeout (in seconds) of the endpoint."""
+        return self.__timeout
+
+    def stats(self):
+        """Returns a dictionary with the counters of the supervisor."""
+        with self.__lock:
+            return {
+                "timeouts": self.__timeouts,
+                "abandoned": self.__abandoned
+            }
+
+    def get_deadline(self, headers):
+        """
+        Given the request headers, returns the monotonic time in which the
+        request expires, or None if the request has no deadline. The client
+        can only shorten the timeout of the endpoint. Raises
+        InvalidDeadlineError if the timeout of the client is not a positive
+        number of seconds.
+        """
+        timeout = self.__timeout
+        header = headers.get(symmetric.constants.DEADLINE_HEADER_NAME)
+        if header is not None:
+            client_timeout = get_client_timeout(header)
+            if timeout is None or client_timeout < timeout:
+                timeout = client_timeout
+        if timeout is None:
+            return None
+        return time.monotonic() + timeout
+
+    def run(self, function, parameters, deadline=None):
+        """
+        Executes :function with :parameters. If a :deadline is given, the
+        function runs in a shared thread and DeadlineExceededError gets
+        raised if the deadline passes before the function returns.
+        """
+        if deadline is None:
+            return function(**parameters)
+        remaining = deadline - time.monotonic()
+        with self.__lock:
+            if remaining <= 0:
+                self.__expire()
+            if self.__abandoned >= self.__max_abandoned:
+                error = ("Too many timed out executions of the endpoint "
+                         "are still running.")
+                raise symmetric.errors.ServerOverloadedError(
+                    error, symmetric.constants.DEFAULT_RETRY_AFTER)
+
+        execution = _Execution(
+            function, parameters, self.__lock, self.__release)
+        execution.start()
+        if not execution.wait(remaining):
+            with self.__lock:
+                if execution.abandon():
+                    self.__abandoned += 1
+                    self.__expire()
+        return execution.get()
+
+    def __expire(self):
+        """
+        Counts a timeout and raises DeadlineExceededError. Must be called
+        while holding the lock of the supervisor.
+        """
+        self.__timeouts += 1
+        error = "The request deadline was exceeded."
+        raise symmetric.errors.DeadlineExceededError(error)
+
+    def __release(self):
+        """
+        Uncounts an abandoned execution that just finished. Gets called
+        while holding the lock of the supervisor.
+        """
+        self.__abandoned -= 1
+
+
+class _Execution:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate a function call running in a separate thread.
+    """
+
+    def __init__(self, function, parameters, lock, on_abandoned_finish):
+        self.__function = function
+        self.__parameters = parameters
+        self.__lock = lock
+        self.__on_abandoned_finish = on_abandoned_finish
+        self.__request_id = symmetric.logging.get_request_id()
+        self.__route = symmetric.profiling.profiler.get_route()
+        self.__done = threading.Event()
+        self.__abandoned = False
+        self.__result = None
+        self.__error = None
+
+    def start(self):
+        """Starts the execution in one of the shared threads."""
+        workers.submit(self.__target)
+
+    def wait(self, timeout):
+        """Waits for the execution to finish. Returns whether it finished."""
+        return self.__done.wait(timeout)
+
+    def abandon(self):
+        """
+        Marks the execution as abandoned. Returns False if the execution
+        finished before it could be abandoned. Must be called while holding
+        the lock of the supervisor.
+        """
+        if self.__done.is_set():
+            return False
+        self.__abandoned = True
+        return True
+
+    def get(self):
+        """Returns the result of the execution or raises its exception."""
+        if self.__error is not None:
+            raise self.__error
+        return self.__result
+
+    def __target(self):
+        symmetric.logging.set_request_id(self.__request_id)
+        if self.__route is not None:
+            symmetric.profiling.profiler.enter(self.__route)
+        try:
+            self.__result = self.__function(**self.__parameters)
+        except Exception as err:
+            self.__error = err
+        finally:
+            symmetric.profiling.profiler.exit()
+            with self.__lock:
+                self.__done.set()
+                if self.__abandoned:
+                    self.__on_abandoned_finish()
+
+
+class _Workers:  # pylint: disable=R0903
+
+    """
+    Class to encapsulate the daemon threads that run the supervised
+    executions, so a call with a deadline reuses an idle thread instead of
+    starting a new one. A new thread only gets started when every thread
+    is busy (or abandoned), and the threads that stay idle for
+    :idle_timeout seconds exit.
+    """
+
+    def __init__(self, idle_timeout):
+        self.__idle_timeout = idle_timeout
+        self.__reset()
+
+    def submit(self, task):
+        """Runs the callable :task in an idle thread or in a new one."""
+        if self.__pid != os.getpid():
+            # The threads of the parent process do not survive a fork
+            self.__reset()
+        with self.__lock:
+            self.__tasks.put(task)
+            if self.__idle > 0:
+                self.__idle -= 1
+                return
+        thread = threading.Thread(
+            target=self.__work, args=(self.__tasks,), daemon=True)
+        thread.start()
+
+    def __reset(self):
+        self.__pid = os.getpid()
+        self.__lock = threading.Lock()
+        self.__tasks = queue.Queue()
+        self.__idle = 0
+
+    def __work(self, tasks):
+        while True:
+            try:
+                task = tasks.get(timeout=self.__idle_timeout)
+            except queue.Empty:
+                with self.__lock:
+                    # The task of a submit could have been enqueued just
+                    # after the wait timed out
+                    if tasks.empty():
+                        self.__idle -= 1
+                        return
+                continue
+            task()
+            with self.__lock:
+                self.__idle += 1
+
+
+workers = _Workers(symmetric.constants.DEFAULT_WORKER_IDLE_TIMEOUT)
@@ -0,0 +1,104 @@
+"""
+A module to hold the utilities of the lean WSGI dispatcher of symmetric,
+which serves the requests without Flask's request and response objects.
+"""
+
+import io
+import json
+
+import werkzeug.datastructures
+import werkzeug.http
+
+
+# Header sent with every response of the dispatcher
+CONTENT_TYPE_HEADER = ("Content-Type", "application/json")
+
+# Status lines, written just like werkzeug writes them
+STATUS_LINES = {
+    code: f"{code} {phrase.upper()}"
+    for code, phrase in werkzeug.http.HTTP_STATUS_CODES.items()
+}
+
+
+def can_dispatch(endpoint, environ):
+    """
+    Checks if the request described by :environ to :endpoint can be served
+    by the dispatcher. The rest of the requests must be served by Flask.
+    """
+    if endpoint is None:
+        return False
+    method = environ.get("REQUEST_METHOD")
+    if method not in endpoint.methods:
+        # Flask answers with the allowed methods
+        return False
+    # Query strings get bound by Flask
+    return not (endpoint.binds_query and method == "GET" and bool(
+        environ.get("QUERY_STRING")))
+
+
+def get_status_line(status_code):
+    """Returns the status line of the response with :status_code."""
+    return STATUS_LINES.get(status_code, f"{status_code} UNKNOWN")
+
+
+def get_headers(environ):
+    """Returns the (lazy) headers of the request described by :environ."""
+    return werkzeug.datastructures.EnvironHeaders(environ)
+
+
+def is_json(environ):
+    """Checks if the body of the request described by :environ is JSON."""
+    mimetype = environ.get("CONTENT_TYPE", "").split(";")[0].strip().lower()
+    if mimetype == "application/json":
+        return True
+    return mimetype.startswith("application/") and mimetype.endswith("+json")
+
+
+def get_content_length(environ):
+    """
+    Returns the Content-Length of the request described by :environ, or
+    None if it was not sent (or is not a number).
+    """
+    length = environ.get("CONTENT_LENGTH")
+    if not length:
+        return None
+    try:
+        return max(0, int(length))
+    except ValueError:
+        return None
+
+
+def read_json(environ, limits):
+    """
+    Returns the JSON body of the request described by :environ (or None if
+    it is not a JSON request), checking the body :limits before parsing it.
+    """
+    length = get_content_length(environ)
+    stream = environ["wsgi.input"]
+    if length is None and not environ.get("wsgi.input_terminated"):
+        # Without a Content-Length, the stream could never end
+        stream = io.BytesIO()
+    return limits.read_stream(stream, length, is_json(environ))
+
+
+def dumps(app, data, **kwargs):
+    """
+    Serializes :data into a JSON string using the encoder and the JSON
+    settings of :app, just like flask.json.dumps inside the app context.
+    """
+    kwargs.setdefault("cls", app.json_encoder)
+    kwargs.setdefault("sort_keys", app.config["JSON_SORT_KEYS"])
+    kwargs.setdefault("ensure_ascii", app.config["JSON_AS_ASCII"])
+    return json.dumps(data, **kwargs)
+
+
+def jsonify(app, data):
+    """
+    Returns the body of the JSON response with :data (encoded), just like
+    the body of the response of flask.jsonify.
+    """
+    if app.config["JSONIFY_PRETTYPRINT_REGULAR"] or app.debug:
+        body = dumps(app, data, indent=2, separators=(", ", ": "))
+    else:
+        body = dumps(app, data, indent=None, separators=(",", ":"))
+    return f"{body}\n".encode()
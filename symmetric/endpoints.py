@@ -4,21 +4,43 @@ This module contains the endpoints classes.
 
 import inspect
 
+import symmetric.admission
+import symmetric.batching
+import symmetric.caching
+import symmetric.deadlines
+import symmetric.limits
+import symmetric.options
+import symmetric.persistence
+import symmetric.refresh
+import symmetric.resources
+import symmetric.validation
 
-class Endpoint:
+
+class Endpoint:  # pylint: disable=R0902
 
     """
     Class to encapsulate an endpoint.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=R0914
             self,
             route,
             methods,
             response_code,
             function,
             flask_function,
-            has_token
+            has_token,
+            admission=None,
+            supervisor=None,
+            background=False,
+            validator=None,
+            batcher=None,
+            cache_policy=None,
+            body_limits=None,
+            persistent_cache=None,
+            refresher=None,
+            resources=None,
+            options=None
     ):
         self.__route = route
         self.__methods = methods
@@ -26,6 +48,20 @@ class Endpoint:
         self.__function = function
         self.__flask_function = flask_function
         self.__has_token = has_token
+        self.__admission = admission
+        self.__supervisor = supervisor
+        self.__background = background
+        self.__validator = validator
+        self.__batcher = batcher
+        self.__cache_policy = cache_policy
+        self.__body_limits = (
+            body_limits if body_limits is not None
+            else symmetric.limits.BodyLimits()
+        )
+        self.__persistent_cache = persistent_cache
+        self.__refresher = refresher
+        self.__resources = resources if resources is not None else {}
+        self.__options = options if options is not None else {}
 
     def __lt__(self, other):
         return self.route < other.route
@@ -61,12 +97,121 @@ class Endpoint:
         """
         return self.__has_token
 
+    @property
+    def admission(self):
+        """
+        Returns the admission controller of the endpoint (or None if the
+        endpoint does not limit its incoming requests).
+        """
+        return self.__admission
+
+    @property
+    def supervisor(self):
+        """Returns the deadline supervisor of the endpoint."""
+        return self.__supervisor
+
+    @property
+    def background(self):
+        """
+        Returns a boolean representing whether or not the endpoint runs its
+        function as a background job.
+        """
+        return self.__background
+
+    @property
+    def validator(self):
+        """
+        Returns the parameters validator of the endpoint (or None if the
+        endpoint does not validate its parameters).
+        """
+        return self.__validator
+
+    @property
+    def batcher(self):
+        """
+        Returns the request batcher of the endpoint (or None if the endpoint
+        does not batch its requests).
+        """
+        return self.__batcher
+
+    @property
+    def cache_policy(self):
+        """
+        Returns the HTTP caching policy of the endpoint (or None if the
+        endpoint does not set caching headers).
+        """
+        return self.__cache_policy
+
+    @property
+    def body_limits(self):
+        """
+        Returns the body limits of the endpoint (the limits that are not set
+        fall back to the default body limits).
+        """
+        return self.__body_limits
+
+    @property
+    def persistent_cache(self):
+        """
+        Returns the persistent result cache of the endpoint (or None if the
+        endpoint does not cache its results).
+        """
+        return self.__persistent_cache
+
+    @property
+    def refresher(self):
+        """
+        Returns the background refresher of the endpoint (or None if the
+        endpoint calls its function on every request).
+        """
+        return self.__refresher
+
+    @property
+    def resources(self):
+        """
+        Returns a dictionary with the resource pool of each parameter
+        injected into the function of the endpoint.
+        """
+        return self.__resources
+
+    @property
+    def options(self):
+        """Returns a dictionary with the options given to the router."""
+        return self.__options
+
+    @property
+    def binds_query(self):
+        """
+        Returns a boolean representing whether or not the endpoint reads
+        its parameters from the query string of GET requests.
+        """
+        return "GET" in self.__methods
+
     @property
     def docstring(self):
         """Returns the docstring of the function."""
         docstring = inspect.getdoc(self.__function)
         return docstring if docstring else "No description provided."
 
+    def stats(self):
+        """Returns a dictionary with the runtime counters of the endpoint."""
+        stats = {}
+        if self.__admission is not None:
+            stats["admission"] = self.__admission.stats()
+        if self.__supervisor is not None:
+            stats["deadlines"] = self.__supervisor.stats()
+        if self.__batcher is not None:
+            stats["batching"] = self.__batcher.stats()
+        if self.__persistent_cache is not None:
+            stats["persistent_cache"] = self.__persistent_cache.stats()
+        if self.__refresher is not None:
+            stats["refresh"] = self.__refresher.stats()
+        if self.__resources:
+            stats["resources"] = {
+                name: pool.stats() for name, pool in self.__resources.items()
+            }
+        return stats
+
     # MARKDOWN DOCUMENTATION METHODS
 
     def generate_markdown_documentation(self):
@@ -77,10 +222,16 @@ class Endpoint:
         docstring += f"### Metadata\n\n"
         docstring += f"`HTTP` methods accepted: "
         docstring += f"{', '.join([f'`{x}`' for x in self.__methods])}\n\n"
+        if self.binds_query:
+            docstring += ("`GET` requests send the parameters in the "
+                          "query string.\n\n")
         if self.__has_token:
             docstring += "Requires an authentication token.\n\n"
         else:
             docstring += "Does not require an authentication token.\n\n"
+        if self.__background:
+            docstring += ("Runs as a background job. The response includes "
+                          "the location of the job status.\n\n")
         docstring += f"### Parameters\n\n{self.__get_markdown_parameters()}\n"
         return docstring
 
@@ -111,3 +262,70 @@ class Endpoint:
         docstring += "}\n```"
 
         return docstring
+
+
+def create_endpoint(route, methods, response_code, function, flask_function,
+                    has_token, options=None):
+    """
+    Creates an Endpoint object, building its admission controller, deadline
+    supervisor, parameters validator, request batcher, HTTP caching policy,
+    body limits, persistent result cache, background refresher and resource
+    pools from the EndpointOptions object :options (the options of the
+    router). The function of the endpoint gets the resources injected, so
+    the rest of the endpoint never sees them.
+    """
+    if options is None:
+        options = symmetric.options.get_options({})
+    pools = symmetric.resources.get_pools(function, options.resources or {})
+    if pools:
+        function = symmetric.resources.inject(function, pools)
+
+    # Describe the options given to the router
+    description = symmetric.options.get_values(options)
+    del description["warmup"]  # Only used on startup
+    description["last_modified"] = options.caching.last_modified is not None
+    description["resources"] = sorted(pools) if pools else None
+
+    admission = options.admission
+    deadline = options.deadline
+    batching = options.batching
+    caching = options.caching
+    body_limits = options.body_limits
+    persistence = options.persistence
+    return Endpoint(
+        route,
+        methods,
+        response_code,
+        function,
+        flask_function,
+        has_token,
+        admission=symmetric.admission.get_admission_controller(
+            admission.max_concurrency, admission.max_queued,
+            admission.rate_limit, admission.rate_limit_burst),
+        supervisor=symmetric.deadlines.Supervisor(
+            deadline.timeout, deadline.max_abandoned),
+        background=options.background,
+        validator=(
+            symmetric.validation.compile_validator(
+                function, options.validation.coerce)
+            if options.validation.validate else None
+        ),
+        batcher=(
+            symmetric.batching.Batcher(
+                function, batching.max_batch_size, batching.max_wait_ms)
+            if batching.batch else None
+        ),
+        cache_policy=symmetric.caching.get_cache_policy(
+            caching.cache_control, caching.etag, caching.last_modified),
+        body_limits=symmetric.limits.BodyLimits(
+            body_limits.max_body_size, body_limits.max_body_depth,
+            body_limits.max_body_elements),
+        persistent_cache=symmetric.persistence.get_persistent_cache(
+            function, persistence.persistent_cache,
+            persistence.persistent_cache_size),
+        refresher=symmetric.refresh.get_refresher(
+            function, options.refresh.refresh_every,
+            options.refresh.stale_ttl, options.background, batching.batch),
+        resources=pools,
+        options=description
+    )
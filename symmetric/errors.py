@@ -34,3 +34,122 @@ class InvalidTokenNameError(Exception):
     """
     Exception for when a token name is not a string or is an empty string.
     """
+
+
+class RateLimitExceededError(Exception):
+    """
+    Exception for when a request exceeds the rate limit of an endpoint.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ServerOverloadedError(Exception):
+    """
+    Exception for when an endpoint can't accept more requests because every
+    execution slot is taken and its waiting queue is full.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(Exception):
+    """
+    Exception for when a request does not finish before its deadline.
+    """
+
+
+class InvalidDeadlineError(Exception):
+    """
+    Exception for when the client sends a timeout that is not a positive
+    number of seconds.
+    """
+
+
+class JobNotFoundError(Exception):
+    """
+    Exception for when a background job does not exist (or its result was
+    already evicted).
+    """
+
+
+class JobConfigurationError(Exception):
+    """
+    Exception for when the background jobs get configured incorrectly.
+    """
+
+
+class ValidationError(Exception):
+    """
+    Exception for when the parameters of a request are missing or do not
+    match the annotated types of the function.
+    """
+
+    def __init__(self, message, errors):
+        super().__init__(message)
+        self.errors = errors
+
+
+class BatchSizeMismatchError(Exception):
+    """
+    Exception for when a batched function does not return exactly one
+    result per batched request.
+    """
+
+
+class SerializationConfigurationError(Exception):
+    """
+    Exception for when the response serialization gets configured
+    incorrectly.
+    """
+
+
+class CacheConfigurationError(Exception):
+    """
+    Exception for when the HTTP caching of an endpoint gets configured
+    incorrectly.
+    """
+
+
+class PayloadTooLargeError(Exception):
+    """
+    Exception for when the body of a request is bigger than its size limit.
+    """
+
+
+class RPCConfigurationError(Exception):
+    """
+    Exception for when the RPC channel gets enabled without its optional
+    dependencies.
+    """
+
+
+class RefreshConfigurationError(Exception):
+    """
+    Exception for when the background refresh of an endpoint gets
+    configured incorrectly.
+    """
+
+
+class EndpointNotFoundError(Exception):
+    """
+    Exception for when an endpoint gets called in-process with a route
+    that does not exist.
+    """
+
+
+class ResourceConfigurationError(Exception):
+    """
+    Exception for when the resources of an endpoint get configured
+    incorrectly.
+    """
+
+
+class AdmissionConfigurationError(Exception):
+    """
+    Exception for when the admission limits of an endpoint are not valid.
+    """
@@ -0,0 +1,129 @@
+"""
+A module to hold the incremental documentation utilities of symmetric.
+"""
+
+import os
+import json
+import inspect
+import hashlib
+
+import symmetric
+import symmetric.limits
+
+
+def get_endpoint_key(endpoint):
+    """
+    Returns a hash of everything that defines the documentation of
+    :endpoint: its route, methods, router options (and the body limits
+    that apply), the signature and docstring of its function and the
+    version of symmetric.
+    """
+    params = inspect.getfullargspec(endpoint.function)
+    description = {
+        "version": symmetric.__version__,
+        "route": endpoint.route,
+        "methods": endpoint.methods,
+        "response_code": endpoint.response_code,
+        "has_token": endpoint.has_token,
+        "options": endpoint.options,
+        "body_limits": endpoint.body_limits.resolve(
+            symmetric.limits.default_limits).describe(),
+        "args": params.args,
+        "varkw": params.varkw is not None,
+        "defaults": repr(params.defaults),
+        "annotations": {
+            name: repr(annotation)
+            for name, annotation in params.annotations.items()
+        },
+        "docstring": endpoint.docstring
+    }
+    serialized = json.dumps(description, sort_keys=True, default=repr)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class FragmentCache:
+
+    """
+    Class to encapsulate an on-disk cache of the documentation fragment of
+    each endpoint, keyed by the hash of the endpoint. Only the endpoints
+    that changed since the last build get rendered again. Without a
+    :filename, the fragments only get kept in memory.
+    """
+
+    def __init__(self, filename=None):
+        self.__filename = filename
+        self.__fragments = {}
+        self.__used = {}
+        self.__hits = 0
+        self.__misses = 0
+        self.load()
+
+    @property
+    def filename(self):
+        """Returns the name of the cache file (or None)."""
+        return self.__filename
+
+    @property
+    def hits(self):
+        """Returns the amount of fragments reused since the last load."""
+        return self.__hits
+
+    @property
+    def misses(self):
+        """Returns the amount of fragments rendered since the last load."""
+        return self.__misses
+
+    def load(self):
+        """Reads the fragments from the cache file (if it exists)."""
+        self.__hits = 0
+        self.__misses = 0
+        self.__used = {}
+        if self.__filename is None:
+            return
+        try:
+            with open(self.__filename, encoding="utf-8") as cache_file:
+                fragments = json.load(cache_file)
+            if fragments.get("version") != symmetric.__version__:
+                fragments = {}
+        except (OSError, ValueError, AttributeError):
+            # A missing or corrupted cache just means rendering everything
+            fragments = {}
+        self.__fragments = {
+            name: value for name, value in fragments.items()
+            if isinstance(value, dict)
+        }
+
+    def get(self, kind, render, endpoint):
+        """
+        Returns the :kind fragment of :endpoint, calling :render with the
+        endpoint only if the cached fragment is missing or stale.
+        """
+        key = get_endpoint_key(endpoint)
+        fragments = self.__fragments.setdefault(kind, {})
+        if key in fragments:
+            self.__hits += 1
+            fragment = fragments[key]
+        else:
+            self.__misses += 1
+            fragment = render(endpoint)
+        self.__used.setdefault(kind, {})[key] = fragment
+        return fragment
+
+    def save(self):
+        """
+        Writes the fragments used since the last load to the cache file,
+        dropping the fragments of the endpoints that no longer exist.
+        """
+        fragments = {**self.__fragments, **self.__used}
+        self.__fragments = fragments
+        self.__used = {}
+        if self.__filename is None:
+            return
+        temporary = f"{self.__filename}.tmp"
+        with open(temporary, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {"version": symmetric.__version__, **fragments},
+                cache_file,
+                default=repr
+            )
+        os.replace(temporary, self.__filename)
@@ -18,6 +18,17 @@ def verb(dirty):
     return dirty.strip().upper()
 
 
+def get_methods(methods):
+    """
+    Given a list of 'dirty' HTTP methods, returns the list of the clean
+    methods that are allowed.
+    """
+    return [
+        verb(x) for x in methods
+        if verb(x) in symmetric.constants.ALLOWED_METHODS
+    ]
+
+
 def get_module_name(symmetric_object):
     """
     Given a symmetric object, returns the name of the module where the
@@ -55,6 +66,27 @@ def humanize(module_name):
     return module_name
 
 
+def get_markdown_documentation(symmetric_object, module_name, cache=None):
+    """
+    Given a symmetric object, gets the documentation of every endpoint and
+    assembles it into a markdown formatted string. If a fragment :cache is
+    given, only the endpoints that changed since the last build get
+    documented again.
+    """
+    docs = f"# {humanize(module_name)} "
+    docs += "API Documentation\n\n"
+    docs += ("Endpoints that require an authentication token should "
+             f"send it in a key named `{symmetric_object.client_token_name}` "
+             "inside the request headers.\n\n")
+    raw_docs = [
+        x.generate_markdown_documentation() if cache is None else cache.get(
+            "markdown", lambda y: y.generate_markdown_documentation(), x)
+        for x in symmetric_object.endpoints
+    ]
+    docs += "\n".join(raw_docs)
+    return docs
+
+
 def parse_route(route):
     """
     If :route does not match the expected route pattern,
@@ -103,3 +135,15 @@ def filter_params(function, data, has_token, token_key):
         return {}
     # Filter every param whose key is not in the params dictionary
     return {k: v for k, v in data.items() if k in params.args}
+
+
+def get_query_params(args):
+    """
+    Given the query string arguments of a request (a multi-valued
+    dictionary), returns a dictionary with the value of each argument (or
+    a list of values, for the repeated arguments).
+    """
+    return {
+        key: values[0] if len(values) == 1 else values
+        for key, values in args.lists()
+    }
@@ -0,0 +1,207 @@
+"""
+A module to hold the background jobs utilities of symmetric.
+"""
+
+import time
+import uuid
+import logging
+import threading
+import concurrent.futures
+
+import symmetric.constants
+import symmetric.errors
+import symmetric.logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class Job:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate a background execution of an endpoint function,
+    called using :execute (with the endpoint, the parameters and the
+    deadline of the execution).
+    """
+
+    def __init__(self, endpoint, execute):
+        self.__id = uuid.uuid4().hex
+        self.__endpoint = endpoint
+        self.__execute = execute
+        self.__status = symmetric.constants.JOB_QUEUED
+        self.__finished_at = None
+        self.__result = None
+        self.__future = None
+        self.__request_id = symmetric.logging.get_request_id()
+
+    @property
+    def id(self):
+        """Returns the id of the job."""
+        return self.__id
+
+    @property
+    def endpoint(self):
+        """Returns the endpoint of the job."""
+        return self.__endpoint
+
+    @property
+    def status(self):
+        """Returns the status of the job."""
+        return self.__status
+
+    @property
+    def finished_at(self):
+        """Returns the time in which the job finished (or None)."""
+        return self.__finished_at
+
+    @property
+    def location(self):
+        """Returns the route in which the status of the job can be queried."""
+        return f"{symmetric.constants.JOBS_ROUTE}/{self.__id}"
+
+    def attach(self, future):
+        """Attaches the future of the execution to the job."""
+        self.__future = future
+
+    def run(self, parameters):
+        """
+        Executes the function of the endpoint with :parameters, saving
+        its result. Does nothing if the job was cancelled.
+        """
+        if self.__status != symmetric.constants.JOB_QUEUED:
+            return
+        self.__status = symmetric.constants.JOB_RUNNING
+        symmetric.logging.set_request_id(self.__request_id)
+        try:
+            self.__result = self.__execute(
+                self.__endpoint,
+                parameters,
+                self.__endpoint.supervisor.get_deadline({})
+            )
+            self.__status = symmetric.constants.JOB_FINISHED
+        except Exception as err:
+            # The details of the error only get logged
+            logger.error(
+                "[[symmetric]] exception caught in job '%s': %s",
+                self.__id, err
+            )
+            self.__result = symmetric.constants.JOB_ERROR
+            self.__status = symmetric.constants.JOB_FAILED
+        finally:
+            self.__finished_at = time.time()
+            symmetric.logging.finish_request()
+
+    def cancel(self):
+        """
+        Cancels the job if it has not started yet. Returns a boolean
+        representing whether or not the job got cancelled.
+        """
+        if self.__future is None or not self.__future.cancel():
+            return False
+        self.__status = symmetric.constants.JOB_CANCELLED
+        self.__finished_at = time.time()
+        return True
+
+    def describe(self, include_result=True):
+        """
+        Returns a JSON serializable description of the job. The result of
+        the job gets included only if :include_result is True.
+        """
+        description = {
+            "id": self.__id,
+            "route": self.__endpoint.route,
+            "status": self.__status,
+            "location": self.location
+        }
+        if not include_result:
+            return description
+        if self.__status == symmetric.constants.JOB_FINISHED:
+            description["result"] = self.__result
+        elif self.__status == symmetric.constants.JOB_FAILED:
+            description["error"] = self.__result
+        return description
+
+
+class JobStore:
+
+    """
+    Class to encapsulate the worker pool that runs the background jobs
+    (using :execute) and the store that keeps their results.
+    """
+
+    def __init__(self, execute):
+        self.__execute = execute
+        self.__max_workers = symmetric.constants.DEFAULT_JOB_WORKERS
+        self.__max_queued = symmetric.constants.DEFAULT_JOB_MAX_QUEUED
+        self.__result_ttl = symmetric.constants.DEFAULT_JOB_RESULT_TTL
+        self.__executor = None
+        self.__jobs = {}
+        self.__lock = threading.Lock()
+
+    def configure(self, max_workers=None, max_queued=None, result_ttl=None):
+        """
+        Changes the amount of workers, the maximum amount of queued jobs
+        and the amount of seconds that the finished jobs are kept.
+        """
+        with self.__lock:
+            if max_workers is not None:
+                if self.__executor is not None:
+                    error = "The job workers can't change after starting."
+                    raise symmetric.errors.JobConfigurationError(error)
+                self.__max_workers = max_workers
+            if max_queued is not None:
+                self.__max_queued = max_queued
+            if result_ttl is not None:
+                self.__result_ttl = result_ttl
+
+    def submit(self, endpoint, parameters):
+        """
+        Enqueues the execution of the function of :endpoint with
+        :parameters. Returns the created job. Raises ServerOverloadedError
+        if the queue is full.
+        """
+        with self.__lock:
+            self.__evict()
+            if self.__pending() >= self.__max_queued:
+                error = "The background jobs queue is full."
+                raise symmetric.errors.ServerOverloadedError(
+                    error, symmetric.constants.DEFAULT_RETRY_AFTER)
+            if self.__executor is None:
+                self.__executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.__max_workers,
+                    thread_name_prefix="symmetric-job"
+                )
+            job = Job(endpoint, self.__execute)
+            self.__jobs[job.id] = job
+            job.attach(self.__executor.submit(job.run, parameters))
+            return job
+
+    def get(self, job_id):
+        """Returns the job with id :job_id or raises JobNotFoundError."""
+        with self.__lock:
+            self.__evict()
+            if job_id not in self.__jobs:
+                error = f"The job '{job_id}' does not exist."
+                raise symmetric.errors.JobNotFoundError(error)
+            return self.__jobs[job_id]
+
+    def jobs(self):
+        """Returns a list with every job in the store."""
+        with self.__lock:
+            self.__evict()
+            return list(self.__jobs.values())
+
+    def __pending(self):
+        """Returns the amount of jobs that have not finished."""
+        return sum(
+            1 for job in self.__jobs.values() if job.finished_at is None)
+
+    def __evict(self):
+        """Removes the finished jobs older than the result TTL."""
+        limit = time.time() - self.__result_ttl
+        expired = [
+            job.id for job in self.__jobs.values()
+            if job.finished_at is not None and job.finished_at < limit
+        ]
+        for job_id in expired:
+            del self.__jobs[job_id]
@@ -0,0 +1,127 @@
+"""
+A module to hold the lifecycle utilities of symmetric.
+"""
+
+import atexit
+import logging
+import threading
+
+import symmetric.constants
+
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+
+    """
+    Class to encapsulate the startup and shutdown of the API. The startup
+    runs every startup hook and then warms up the endpoints, and the API
+    only reports itself as ready after the startup finishes.
+    """
+
+    def __init__(self):
+        self.__startup_hooks = []
+        self.__shutdown_hooks = []
+        self.__warmups = []
+        self.__state = symmetric.constants.LIFECYCLE_PENDING
+        self.__lock = threading.Lock()
+        self.__finished = threading.Event()
+
+    @property
+    def state(self):
+        """Returns the state of the lifecycle."""
+        return self.__state
+
+    @property
+    def ready(self):
+        """Returns whether or not the startup finished successfully."""
+        return self.__state == symmetric.constants.LIFECYCLE_READY
+
+    @property
+    def pending(self):
+        """Returns whether or not the startup has not been started yet."""
+        return self.__state == symmetric.constants.LIFECYCLE_PENDING
+
+    def add_startup_hook(self, function):
+        """Adds :function to the functions executed on startup."""
+        self.__startup_hooks.append(function)
+
+    def add_shutdown_hook(self, function):
+        """Adds :function to the functions executed on shutdown."""
+        self.__shutdown_hooks.append(function)
+
+    def add_warmup(self, warmup):
+        """
+        Adds :warmup (a function without arguments) to the functions
+        executed on startup, after the startup hooks.
+        """
+        self.__warmups.append(warmup)
+
+    def start(self):
+        """
+        Runs the startup hooks and the warm-ups, unless the startup has
+        already been started (waiting for it to finish if it is still
+        running). Returns whether or not the API is ready.
+        """
+        if self.__begin():
+            return self.__run()
+        if self.__state == symmetric.constants.LIFECYCLE_STARTING:
+            self.__finished.wait()
+        return self.ready
+
+    def start_in_background(self):
+        """Starts the startup in a daemon thread if it is still pending."""
+        if self.__begin():
+            threading.Thread(target=self.__run, daemon=True).start()
+
+    def after_fork(self):
+        """
+        Starts the startup of a forked worker in the background. A startup
+        that was running in the parent process gets started again, as its
+        thread does not survive the fork.
+        """
+        if self.__state == symmetric.constants.LIFECYCLE_STARTING:
+            self.__lock = threading.Lock()
+            self.__finished = threading.Event()
+            self.__state = symmetric.constants.LIFECYCLE_PENDING
+        self.start_in_background()
+
+    def __begin(self):
+        """
+        Marks the startup as started. Returns False if it had already been
+        started.
+        """
+        with self.__lock:
+            if not self.pending:
+                return False
+            self.__state = symmetric.constants.LIFECYCLE_STARTING
+            return True
+
+    def __run(self):
+        """Runs the startup hooks and the warm-ups."""
+        atexit.register(self.shutdown)
+        try:
+            for hook in self.__startup_hooks:
+                hook()
+            for warmup in self.__warmups:
+                warmup()
+        except Exception as err:
+            logger.error("[[symmetric]] startup failed: %s", err)
+            self.__state = symmetric.constants.LIFECYCLE_FAILED
+        else:
+            self.__state = symmetric.constants.LIFECYCLE_READY
+        self.__finished.set()
+        return self.ready
+
+    def shutdown(self):
+        """Runs the shutdown hooks (only once)."""
+        with self.__lock:
+            if self.__state == symmetric.constants.LIFECYCLE_STOPPED:
+                return
+            self.__state = symmetric.constants.LIFECYCLE_STOPPED
+        for hook in self.__shutdown_hooks:
+            try:
+                hook()
+            except Exception as err:
+                logger.error("[[symmetric]] shutdown hook failed: %s", err)
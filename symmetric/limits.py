@@ -0,0 +1,180 @@
+"""
+A module to hold the request body limits utilities of symmetric.
+"""
+
+import re
+import json
+
+import symmetric.constants
+import symmetric.errors
+
+
+# Regular expressions that run over the raw body (in C)
+STRING_PATTERN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+NON_EMPTY_CONTAINER_PATTERN = re.compile(rb"[\[{]\s*[^\s\]}]")
+BRACKET_PATTERN = re.compile(rb"[\[\]{}]")
+
+
+class BodyLimits:
+
+    """
+    Class to encapsulate the limits of the request bodies: their size (in
+    bytes), their nesting depth and their amount of elements (the items of
+    every array and the members of every object). The limits get checked
+    before parsing the body, so an oversized or pathological body gets
+    rejected without using memory and CPU to parse it.
+    """
+
+    def __init__(self, max_size=None, max_depth=None, max_elements=None):
+        self.__max_size = max_size
+        self.__max_depth = max_depth
+        self.__max_elements = max_elements
+
+    @property
+    def max_size(self):
+        """Returns the maximum size of the body (in bytes)."""
+        return self.__max_size
+
+    @property
+    def max_depth(self):
+        """Returns the maximum nesting depth of the body."""
+        return self.__max_depth
+
+    @property
+    def max_elements(self):
+        """Returns the maximum amount of elements of the body."""
+        return self.__max_elements
+
+    @property
+    def limits_structure(self):
+        """
+        Returns whether or not the depth or the amount of elements of the
+        body are limited.
+        """
+        return self.__max_depth is not None or self.__max_elements is not None
+
+    def configure(self, max_size=None, max_depth=None, max_elements=None):
+        """Changes the limits (the ones not given stay unchanged)."""
+        if max_size is not None:
+            self.__max_size = max_size
+        if max_depth is not None:
+            self.__max_depth = max_depth
+        if max_elements is not None:
+            self.__max_elements = max_elements
+
+    def resolve(self, defaults):
+        """
+        Returns the limits that apply, using the limits of :defaults for
+        the ones that are not set.
+        """
+        return BodyLimits(
+            defaults.max_size if self.__max_size is None else self.__max_size,
+            (defaults.max_depth if self.__max_depth is None
+             else self.__max_depth),
+            (defaults.max_elements if self.__max_elements is None
+             else self.__max_elements)
+        )
+
+    def describe(self):
+        """Returns a dictionary with the limits that are set."""
+        limits = {
+            "maxSize": self.__max_size,
+            "maxDepth": self.__max_depth,
+            "maxElements": self.__max_elements
+        }
+        return {
+            key: value for key, value in limits.items() if value is not None
+        }
+
+    def read_json(self, request):
+        """
+        Returns the JSON body of :request (or None if it is not a JSON
+        request), checking the limits before parsing it. Raises
+        PayloadTooLargeError if the body is too big and ValidationError if
+        it is too deep or has too many elements.
+        """
+        length = request.content_length
+        self.__check_length(length)
+        if self.__max_size is not None and length is None:
+            # Without a Content-Length, the limit applies while streaming
+            data = self.__read_stream(request.stream)
+            self.__check_structure(data)
+            return json.loads(data) if request.is_json and data else None
+        if self.limits_structure:
+            self.__check_structure(request.get_data(cache=True))
+        return request.get_json()
+
+    def read_stream(self, stream, length, is_json=True):
+        """
+        Returns the JSON body read from the raw :stream of a request (or
+        None if it is not a JSON request or the body is empty), checking the
+        limits before parsing it. :length is the Content-Length of the
+        request, or None to read the stream until its end.
+        """
+        self.__check_length(length)
+        if length is None:
+            data = self.__read_stream(stream)
+        else:
+            data = stream.read(length)
+        self.__check_structure(data)
+        return json.loads(data) if is_json and data else None
+
+    def __check_length(self, length):
+        """Raises PayloadTooLargeError if :length is bigger than max_size."""
+        if self.__max_size is not None and length is not None and (
+                length > self.__max_size):
+            raise symmetric.errors.PayloadTooLargeError(
+                f"The request body is bigger than {self.__max_size} bytes.")
+
+    def __read_stream(self, stream):
+        """Reads :stream, raising PayloadTooLargeError after max_size."""
+        chunks = []
+        size = 0
+        while True:
+            chunk = stream.read(symmetric.constants.BODY_READ_CHUNK_SIZE)
+            if not chunk:
+                return b"".join(chunks)
+            size += len(chunk)
+            if self.__max_size is not None and size > self.__max_size:
+                raise symmetric.errors.PayloadTooLargeError(
+                    "The request body is bigger than "
+                    f"{self.__max_size} bytes.")
+            chunks.append(chunk)
+
+    def __check_structure(self, data):
+        """
+        Raises ValidationError if the raw JSON :data is nested too deep or
+        has too many elements.
+        """
+        if not self.limits_structure:
+            return
+        # The brackets and commas inside strings don't count
+        data = STRING_PATTERN.sub(b'""', data)
+        if self.__max_elements is not None:
+            elements = data.count(b",") + len(
+                NON_EMPTY_CONTAINER_PATTERN.findall(data))
+            if elements > self.__max_elements:
+                raise_structure_error(
+                    "The request body has more than "
+                    f"{self.__max_elements} elements.")
+        if self.__max_depth is not None:
+            depth = 0
+            for bracket in BRACKET_PATTERN.finditer(data):
+                if bracket.group() in (b"[", b"{"):
+                    depth += 1
+                    if depth > self.__max_depth:
+                        raise_structure_error(
+                            "The request body is nested deeper than "
+                            f"{self.__max_depth} levels.")
+                else:
+                    depth -= 1
+
+
+def raise_structure_error(message):
+    """Raises a ValidationError about the whole body with :message."""
+    raise symmetric.errors.ValidationError(
+        message, [{"field": "", "message": message}])
+
+
+# Limits that apply to every endpoint without its own limits
+default_limits = BodyLimits()
@@ -3,28 +3,86 @@ A module to set up the logging configuration of symmetric.
 """
 
 import os
+import re
+import uuid
+import logging
 import logging.config
+import threading
 
 import symmetric.constants
 
 
+# Request ID of the request being handled by each thread
+_request_context = threading.local()
+
+
+def get_request_id():
+    """Returns the id of the request being handled by the current thread."""
+    return getattr(
+        _request_context, "request_id", symmetric.constants.NO_REQUEST_ID)
+
+
+def set_request_id(request_id):
+    """Sets the id of the request being handled by the current thread."""
+    _request_context.request_id = request_id
+
+
+def start_request(headers):
+    """
+    Given the request headers, propagates the request id sent by the client
+    (if it is valid) or generates a new one. The id gets attached to every
+    log line of the current thread until finish_request gets called.
+    Returns the request id.
+    """
+    request_id = headers.get(symmetric.constants.REQUEST_ID_HEADER_NAME)
+    if request_id is None or not re.fullmatch(
+            r"[\w\-.:]{1,%d}" % symmetric.constants.MAX_REQUEST_ID_LENGTH,
+            request_id):
+        request_id = uuid.uuid4().hex
+    set_request_id(request_id)
+    return request_id
+
+
+def finish_request():
+    """Detaches the request id from the log lines of the current thread."""
+    set_request_id(symmetric.constants.NO_REQUEST_ID)
+
+
+class RequestIdFilter(logging.Filter):  # pylint: disable=R0903
+
+    """
+    Logging filter to add the id of the current request to every record.
+    """
+
+    def filter(self, record):
+        record.request_id = get_request_id()
+        return True
+
+
 # Logging configuration
 logging.config.dictConfig({
     "version": 1,
+    "filters": {
+        "request_id": {
+            "()": RequestIdFilter
+        }
+    },
     "formatters": {
         "console": {
-            "format": "[%(asctime)s] [%(levelname)s] %(module)s: %(message)s"
+            "format": ("[%(asctime)s] [%(levelname)s] [%(request_id)s] "
+                       "%(module)s: %(message)s")
         },
         "file": {
-            "format": ("[%(asctime)s] [%(levelname)s] %(pathname)s - "
-                       "line %(lineno)d: \n%(message)s\n")
+            "format": ("[%(asctime)s] [%(levelname)s] [%(request_id)s] "
+                       "%(pathname)s - line %(lineno)d: \n%(message)s\n")
         }
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stderr",
-            "formatter": "console"
+            "formatter": "console",
+            "filters": ["request_id"]
         },
         "file": {
             "class": "logging.FileHandler",
@@ -32,7 +90,8 @@ logging.config.dictConfig({
                 "LOG_FILE",
                 default=symmetric.constants.LOG_FILE_NAME
             ),
-            "formatter": "file"
+            "formatter": "file",
+            "filters": ["request_id"]
         }
     },
     "root": {
@@ -0,0 +1,91 @@
+"""
+A module to hold the manifest utilities of symmetric, used to skip the work
+that every worker would repeat when it boots.
+"""
+
+import json
+import hashlib
+import logging
+
+import symmetric
+import symmetric.fragments
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_source_hash(filename):
+    """
+    Returns a hash of the source file :filename of the module and of the
+    version of symmetric, so a manifest gets discarded when any of them
+    changes.
+    """
+    with open(filename, "rb") as source_file:
+        source = source_file.read()
+    return hashlib.sha256(
+        symmetric.__version__.encode() + b"\n" + source).hexdigest()
+
+
+def describe_endpoint(endpoint):
+    """
+    Returns a dictionary with everything the manifest records about
+    :endpoint, to check that the imported endpoint still matches it. The
+    key covers everything that gets documented about the endpoint (its
+    route, methods, options, signature and docstring), so the manifest
+    never serves a stale schema, even if the endpoint is defined outside
+    of the source file of the module.
+    """
+    return {
+        "methods": list(endpoint.methods),
+        "response_code": endpoint.response_code,
+        "has_token": endpoint.has_token,
+        "binds_query": endpoint.binds_query,
+        "key": symmetric.fragments.get_endpoint_key(endpoint)
+    }
+
+
+def get_manifest(endpoints, openapi, documentation, source_hash):
+    """
+    Returns the manifest of the API with :endpoints, its :openapi schema
+    (pre-encoded) and its rendered :documentation, built from the source
+    file with :source_hash.
+    """
+    return {
+        "source_hash": source_hash,
+        "endpoints": {
+            endpoint.route: describe_endpoint(endpoint)
+            for endpoint in endpoints
+        },
+        "openapi": json.dumps(openapi),
+        "documentation": documentation
+    }
+
+
+def write_manifest(manifest, filename):
+    """Writes the :manifest into :filename."""
+    with open(filename, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+
+def read_manifest(filename, source_hash):
+    """
+    Returns the manifest stored in :filename, or None if it does not exist,
+    if it can't be read or if it was not built from the source file with
+    :source_hash (so the API boots without it).
+    """
+    try:
+        with open(filename, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        logger.warning("[[symmetric]] the manifest can't be read: %s", err)
+        return None
+    if not isinstance(manifest, dict):
+        logger.warning("[[symmetric]] the manifest can't be read.")
+        return None
+    if manifest.get("source_hash") != source_hash:
+        logger.warning("[[symmetric]] the manifest is stale, run the "
+                       "build command again to use it.")
+        return None
+    return manifest
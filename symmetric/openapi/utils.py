@@ -5,6 +5,8 @@ Module to hold the openapi documentation creation utilities.
 import inspect
 import functools
 
+import symmetric.constants
+import symmetric.limits
 import symmetric.openapi.constants
 import symmetric.openapi.helpers
 
@@ -17,6 +19,11 @@ def get_openapi_endpoint(endpoint):
     for http_method in map(lambda x: x.lower(), endpoint.methods):
         path_doc[http_method] = {
             "description": endpoint.docstring,
+            "parameters": [
+                {
+                    "$ref": "#/components/parameters/DeadlineHeader"
+                }
+            ],
             "responses": response_codes
         }
         has_props = bool(request_body["properties"])
@@ -27,7 +34,20 @@ def get_openapi_endpoint(endpoint):
                     "APIKeyAuth": []
                 }
             ]
-        if has_body:
+        if http_method == "get":
+            # GET endpoints read their parameters from the query string
+            path_doc[http_method]["parameters"] = [
+                *get_openapi_query_params(request_body),
+                *path_doc[http_method]["parameters"]
+            ]
+            if endpoint.cache_policy is not None:
+                path_doc[http_method]["responses"] = {
+                    **response_codes,
+                    "304": {
+                        "$ref": "#/components/responses/NotModified"
+                    }
+                } if endpoint.cache_policy.conditional else response_codes
+        elif has_body:
             path_doc[http_method]["requestBody"] = {
                 "required": has_props,
                 "content": {
@@ -36,11 +56,36 @@ def get_openapi_endpoint(endpoint):
                     }
                 }
             }
+            limits = get_body_limits(endpoint).describe()
+            if limits:
+                path_doc[http_method]["requestBody"][
+                    "x-body-limits"] = limits
     return {
         endpoint.route: path_doc
     }
 
 
+def get_body_limits(endpoint):
+    """Returns the body limits that apply to :endpoint."""
+    return endpoint.body_limits.resolve(symmetric.limits.default_limits)
+
+
+def get_openapi_query_params(request_body):
+    """
+    Given the JSON schema of an endpoint body, assembles the OpenAPI
+    query string parameters.
+    """
+    return [
+        {
+            "name": name,
+            "in": "query",
+            "required": "default" not in schema,
+            "schema": schema
+        }
+        for name, schema in request_body["properties"].items()
+    ]
+
+
 def get_openapi_endpoint_body(endpoint):
     """Assembles the JSON schema for the endpoint body."""
     params = inspect.getfullargspec(endpoint.function)
@@ -94,6 +139,42 @@ def get_openapi_endpoint_responses(endpoint):
         responses["401"] = {
             "$ref": "#/components/responses/UnauthorizedError"
         }
+    limits = get_body_limits(endpoint)
+    if endpoint.validator is not None or limits.limits_structure:
+        responses["422"] = {
+            "$ref": "#/components/responses/ValidationError"
+        }
+    if limits.max_size is not None:
+        responses["413"] = {
+            "$ref": "#/components/responses/PayloadTooLargeError"
+        }
+    if endpoint.admission is not None:
+        if endpoint.admission.limits_rate:
+            responses["429"] = {
+                "$ref": "#/components/responses/TooManyRequestsError"
+            }
+        if endpoint.admission.limits_concurrency:
+            responses["503"] = {
+                "$ref": "#/components/responses/ServiceUnavailableError"
+            }
+    # Every request can send a deadline, which must be valid
+    responses["400"] = {
+        "$ref": "#/components/responses/InvalidDeadlineError"
+    }
+    if endpoint.supervisor.timeout is not None:
+        responses["504"] = {
+            "$ref": "#/components/responses/GatewayTimeoutError"
+        }
+    if endpoint.background:
+        # The function result gets delivered by the job status endpoint
+        del responses[f"{endpoint.response_code}"]
+        responses["202"] = {
+            "$ref": "#/components/responses/JobAccepted"
+        }
+        responses["503"] = {
+            "$ref": "#/components/responses/ServiceUnavailableError"
+        }
+        return responses
     if "return" in params.annotations:
         responses[f"{endpoint.response_code}"]["content"] = {
             "application/json": {
@@ -106,24 +187,163 @@ def get_openapi_endpoint_responses(endpoint):
     return responses
 
 
-def get_openapi(sym_obj, title, version="0.0.1", openapi_version="3.0.3"):
+def get_openapi_jobs():
+    """Generate the OpenAPI documentation for the background job endpoints."""
+    job_response = {
+        "description": "The background job.",
+        "content": {
+            "application/json": {
+                "schema": {
+                    "$ref": "#/components/schemas/Job"
+                }
+            }
+        }
+    }
+    job_id = {
+        "name": "job_id",
+        "in": "path",
+        "required": True,
+        "schema": {
+            "type": "string"
+        }
+    }
+    return {
+        symmetric.constants.JOBS_ROUTE: {
+            "get": {
+                "description": "Lists every background job (without their "
+                               "results).",
+                "responses": {
+                    "200": {
+                        "description": "The list of background jobs.",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "array",
+                                    "items": {
+                                        "$ref": "#/components/schemas/Job"
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        f"{symmetric.constants.JOBS_ROUTE}/{{job_id}}": {
+            "get": {
+                "description": "Gets the status (and the result, when "
+                               "finished) of a background job.",
+                "parameters": [job_id],
+                "responses": {
+                    "200": job_response,
+                    "401": {
+                        "$ref": "#/components/responses/UnauthorizedError"
+                    },
+                    "404": {
+                        "$ref": "#/components/responses/JobNotFoundError"
+                    }
+                }
+            },
+            "delete": {
+                "description": "Cancels a background job that has not "
+                               "started yet.",
+                "parameters": [job_id],
+                "responses": {
+                    "200": job_response,
+                    "401": {
+                        "$ref": "#/components/responses/UnauthorizedError"
+                    },
+                    "404": {
+                        "$ref": "#/components/responses/JobNotFoundError"
+                    },
+                    "409": {
+                        "description": "The job already started and can't "
+                                       "be cancelled."
+                    }
+                }
+            }
+        }
+    }
+
+
+def get_openapi(sym_obj, title, version="0.0.1", openapi_version="3.0.3",
+                cache=None):
     """
     Gets the OpenAPI spec of every endpoint and assembles it into a
-    JSON formatted object.
+    JSON formatted object. If a fragment :cache is given, only the
+    endpoints that changed since the last build get documented again.
     """
+    document = (
+        get_openapi_endpoint if cache is None
+        else functools.partial(cache.get, "openapi", get_openapi_endpoint)
+    )
+    paths = functools.reduce(
+        lambda x, y: {**x, **y},
+        [document(endpoint) for endpoint in sym_obj.endpoints
+            if symmetric.openapi.helpers.is_not_docs(endpoint.route)],
+        {}
+    )
+    if any(endpoint.background for endpoint in sym_obj.endpoints):
+        paths.update(get_openapi_jobs())
     return {
         "openapi": openapi_version,
         "info": {
             "title": title,
             "version": version
         },
-        "paths": functools.reduce(
-            lambda x, y: {**x, **y},
-            [get_openapi_endpoint(endpoint) for endpoint in sym_obj.endpoints
-                if symmetric.openapi.helpers.is_not_docs(endpoint.route)],
-            {}
-        ),
+        "paths": paths,
         "components": {
+            "schemas": {
+                "ValidationErrors": {
+                    "type": "object",
+                    "properties": {
+                        "errors": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "field": {
+                                        "type": "string"
+                                    },
+                                    "message": {
+                                        "type": "string"
+                                    }
+                                }
+                            }
+                        }
+                    }
+                },
+                "Job": {
+                    "type": "object",
+                    "properties": {
+                        "id": {
+                            "type": "string"
+                        },
+                        "route": {
+                            "type": "string"
+                        },
+                        "status": {
+                            "type": "string",
+                            "enum": [
+                                symmetric.constants.JOB_QUEUED,
+                                symmetric.constants.JOB_RUNNING,
+                                symmetric.constants.JOB_FINISHED,
+                                symmetric.constants.JOB_FAILED,
+                                symmetric.constants.JOB_CANCELLED
+                            ]
+                        },
+                        "location": {
+                            "type": "string"
+                        },
+                        "result": {
+                            "oneOf": symmetric.openapi.constants.ANY_TYPE
+                        },
+                        "error": {
+                            "type": "string"
+                        }
+                    }
+                }
+            },
             "securitySchemes": {
                 "APIKeyAuth": {
                     "type": "apiKey",
@@ -131,7 +351,26 @@ def get_openapi(sym_obj, title, version="0.0.1", openapi_version="3.0.3"):
                     "name": sym_obj.client_token_name
                 }
             },
+            "parameters": {
+                "DeadlineHeader": {
+                    "name": symmetric.constants.DEADLINE_HEADER_NAME,
+                    "in": "header",
+                    "required": False,
+                    "description": "Seconds after which the request gets a "
+                                   "504 response code. It can only shorten "
+                                   "the timeout of the endpoint.",
+                    "schema": {
+                        "type": "number",
+                        "exclusiveMinimum": True,
+                        "minimum": 0
+                    }
+                }
+            },
             "responses": {
+                "InvalidDeadlineError": {
+                    "description": "The deadline header is not a positive "
+                                   "number of seconds."
+                },
                 "SuccesfulOperation": {
                     "description": "Successful operation"
                 },
@@ -139,6 +378,58 @@ def get_openapi(sym_obj, title, version="0.0.1", openapi_version="3.0.3"):
                     "description": "Invalid or non-existent authentication "
                                    "credentials."
                 },
+                "ValidationError": {
+                    "description": "The request parameters are missing or "
+                                   "do not match their types.",
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "$ref": "#/components/schemas/"
+                                        "ValidationErrors"
+                            }
+                        }
+                    }
+                },
+                "TooManyRequestsError": {
+                    "description": "The rate limit of the endpoint was "
+                                   "exceeded. Retry after the amount of "
+                                   "seconds in the Retry-After header."
+                },
+                "ServiceUnavailableError": {
+                    "description": "The endpoint is saturated and can't "
+                                   "accept more requests. Retry after the "
+                                   "amount of seconds in the Retry-After "
+                                   "header."
+                },
+                "JobAccepted": {
+                    "description": "The function was enqueued as a "
+                                   "background job. Its status can be "
+                                   "queried at the route in the Location "
+                                   "header.",
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "$ref": "#/components/schemas/Job"
+                            }
+                        }
+                    }
+                },
+                "JobNotFoundError": {
+                    "description": "The job does not exist or its result "
+                                   "was already evicted."
+                },
+                "NotModified": {
+                    "description": "The resource has not changed since the "
+                                   "version cached by the client."
+                },
+                "PayloadTooLargeError": {
+                    "description": "The request body is bigger than its "
+                                   "size limit."
+                },
+                "GatewayTimeoutError": {
+                    "description": "The request did not finish before its "
+                                   "deadline."
+                },
                 "InternalError": {
                     "description": "Unexpected internal error (API method "
                                    "failed, probably due to a missuse of the "
@@ -0,0 +1,116 @@
+"""
+A module to hold the options of the router, grouped by the feature of the
+endpoint that they configure.
+"""
+
+import collections
+
+
+AdmissionOptions = collections.namedtuple(
+    "AdmissionOptions",
+    ["max_concurrency", "max_queued", "rate_limit", "rate_limit_burst"]
+)
+DeadlineOptions = collections.namedtuple(
+    "DeadlineOptions", ["timeout", "max_abandoned"]
+)
+ValidationOptions = collections.namedtuple(
+    "ValidationOptions", ["validate", "coerce"]
+)
+BatchingOptions = collections.namedtuple(
+    "BatchingOptions", ["batch", "max_batch_size", "max_wait_ms"]
+)
+CachingOptions = collections.namedtuple(
+    "CachingOptions", ["cache_control", "etag", "last_modified"]
+)
+BodyLimitsOptions = collections.namedtuple(
+    "BodyLimitsOptions",
+    ["max_body_size", "max_body_depth", "max_body_elements"]
+)
+PersistenceOptions = collections.namedtuple(
+    "PersistenceOptions", ["persistent_cache", "persistent_cache_size"]
+)
+RefreshOptions = collections.namedtuple(
+    "RefreshOptions", ["refresh_every", "stale_ttl"]
+)
+
+# The features configured by a single option keep its value
+EndpointOptions = collections.namedtuple(
+    "EndpointOptions",
+    ["admission", "deadline", "background", "validation", "batching",
+     "warmup", "caching", "body_limits", "persistence", "refresh",
+     "resources"]
+)
+
+# The options of the router with their default values
+DEFAULTS = {
+    "max_concurrency": None,
+    "max_queued": None,
+    "rate_limit": None,
+    "rate_limit_burst": None,
+    "timeout": None,
+    "max_abandoned": None,
+    "background": False,
+    "validate": True,
+    "coerce": False,
+    "batch": False,
+    "max_batch_size": None,
+    "max_wait_ms": None,
+    "warmup": None,
+    "cache_control": None,
+    "etag": False,
+    "last_modified": None,
+    "max_body_size": None,
+    "max_body_depth": None,
+    "max_body_elements": None,
+    "persistent_cache": None,
+    "persistent_cache_size": None,
+    "refresh_every": None,
+    "stale_ttl": None,
+    "resources": None
+}
+
+
+def get_options(options):
+    """
+    Recieves a dictionary with the keyword options of the router and
+    returns them grouped by feature into an EndpointOptions object (with
+    the default value of every option not given). Raises a TypeError if
+    any of the options does not exist.
+    """
+    for name in options:
+        if name not in DEFAULTS:
+            raise TypeError(
+                f"router() got an unexpected keyword argument '{name}'")
+    values = dict(DEFAULTS, **options)
+
+    def group(option_class):
+        """Returns the :option_class object with its options."""
+        return option_class(*[values[x] for x in option_class._fields])
+
+    return EndpointOptions(
+        admission=group(AdmissionOptions),
+        deadline=group(DeadlineOptions),
+        background=values["background"],
+        validation=group(ValidationOptions),
+        batching=group(BatchingOptions),
+        warmup=values["warmup"],
+        caching=group(CachingOptions),
+        body_limits=group(BodyLimitsOptions),
+        persistence=group(PersistenceOptions),
+        refresh=group(RefreshOptions),
+        resources=values["resources"]
+    )
+
+
+def get_values(options):
+    """
+    Given the EndpointOptions object :options, returns a dictionary with
+    the value of every option of the router.
+    """
+    values = {}
+    for name, value in zip(EndpointOptions._fields, options):
+        if name in DEFAULTS:
+            values[name] = value
+        else:
+            values.update(value._asdict())
+    return values
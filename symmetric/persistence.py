@@ -0,0 +1,166 @@
+"""
+A module to hold the persistent result cache utilities of symmetric.
+"""
+
+import os
+import json
+import time
+import inspect
+import hashlib
+import sqlite3
+import threading
+
+import symmetric.constants
+
+
+class PersistentCache:
+
+    """
+    Class to encapsulate a result cache stored in a SQLite database, shared
+    by every process that uses the same file and kept across restarts. The
+    results get stored already serialized, keyed by the identity and the
+    source code of the function and the canonical form of the parameters.
+    When the stored results pass the maximum size, the least recently used
+    ones get evicted (the access times have a resolution of a minute, so
+    most hits don't need to write).
+    """
+
+    def __init__(self, function, filename=None, max_size=None):
+        self.__filename = (
+            symmetric.constants.PERSISTENT_CACHE_FILE_NAME
+            if filename is None else filename
+        )
+        self.__max_size = (
+            symmetric.constants.DEFAULT_PERSISTENT_CACHE_SIZE
+            if max_size is None else max_size
+        )
+        self.__prefix = get_function_hash(function)
+        self.__connections = threading.local()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def filename(self):
+        """Returns the name of the database file."""
+        return self.__filename
+
+    def stats(self):
+        """Returns a dictionary with the counters of the current process."""
+        with self.__lock:
+            return {"hits": self.__hits, "misses": self.__misses}
+
+    def get_key(self, parameters):
+        """Returns the key of the result of calling with :parameters."""
+        canonical = json.dumps(
+            parameters, sort_keys=True, separators=(",", ":"), default=repr)
+        return hashlib.sha256(
+            f"{self.__prefix}:{canonical}".encode()).hexdigest()
+
+    def get(self, key):
+        """Returns the serialized result stored with :key, or None."""
+        connection = self.__connect()
+        row = connection.execute(
+            "SELECT value, accessed FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        with self.__lock:
+            if row is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+        now = time.time()
+        resolution = symmetric.constants.PERSISTENT_CACHE_ACCESS_RESOLUTION
+        if now - row[1] > resolution:
+            with connection:
+                connection.execute(
+                    "UPDATE results SET accessed = ? WHERE key = ?",
+                    (now, key)
+                )
+        return row[0]
+
+    def set(self, key, value):
+        """
+        Stores the serialized result :value with :key, evicting the least
+        recently used results if the cache gets too big.
+        """
+        size = len(value)
+        if size > self.__max_size:
+            return
+        connection = self.__connect()
+        with connection:
+            # The write lock gets taken right away to evict consistently
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            total = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total <= self.__max_size:
+                return
+            evicted = []
+            for old_key, old_size in connection.execute(
+                    "SELECT key, size FROM results WHERE key != ? "
+                    "ORDER BY accessed", (key,)):
+                evicted.append((old_key,))
+                total -= old_size
+                if total <= self.__max_size:
+                    break
+            connection.executemany(
+                "DELETE FROM results WHERE key = ?", evicted)
+
+    def __connect(self):
+        """
+        Returns the database connection of the current thread, opening a
+        new one if the thread has none or if the process was forked.
+        """
+        connection = getattr(self.__connections, "connection", None)
+        if connection is not None and self.__connections.pid == os.getpid():
+            return connection
+        connection = sqlite3.connect(
+            self.__filename,
+            timeout=symmetric.constants.PERSISTENT_CACHE_BUSY_TIMEOUT,
+            isolation_level=None
+        )
+        # Readers don't block the writer with the write-ahead log
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed "
+            "ON results (accessed)"
+        )
+        self.__connections.connection = connection
+        self.__connections.pid = os.getpid()
+        return connection
+
+
+def get_function_hash(function):
+    """
+    Returns a hash of the identity (module and qualified name) and of the
+    source code of :function, so the results of a function get invalidated
+    when its code changes.
+    """
+    try:
+        source = inspect.getsource(function)
+    except (OSError, TypeError):
+        code = function.__code__
+        source = f"{code.co_code.hex()}:{code.co_consts!r}"
+    identity = f"{function.__module__}.{function.__qualname__}:{source}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def get_persistent_cache(function, persistent_cache, max_size):
+    """
+    Returns a PersistentCache for :function stored in the :persistent_cache
+    file (or in the default file if it is True), or None if it is not set.
+    """
+    if not persistent_cache:
+        return None
+    filename = persistent_cache if isinstance(persistent_cache, str) else None
+    return PersistentCache(function, filename, max_size)
@@ -0,0 +1,186 @@
+"""
+A module to hold the sampling profiler of symmetric.
+"""
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+import collections
+
+import symmetric.constants
+
+
+logger = logging.getLogger(__name__)
+
+# CPU time of the current thread (Python 3.7+) or an upper bound of it
+thread_time = getattr(time, "thread_time", time.perf_counter)
+
+
+class SamplingProfiler:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate a statistical profiler. Once enabled, a daemon
+    thread takes a sample of the stack of every thread that is serving a
+    request at a regular interval, and attributes it to the route of the
+    endpoint being served. The samples get aggregated as collapsed stacks
+    (one line per stack, with its frames separated by semicolons and
+    followed by the amount of samples), the input format of flame graph
+    tools. As nothing runs inside the profiled threads (other than marking
+    the start and the end of each request), the overhead stays low.
+    """
+
+    def __init__(self):
+        self.__enabled = False
+        self.__interval = symmetric.constants.DEFAULT_PROFILER_INTERVAL_MS
+        self.__active = {}
+        self.__samples = collections.defaultdict(collections.Counter)
+        self.__labels = {}
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__pid = None
+        self.__started_at = None
+        self.__cpu_time = 0.0
+        self.__sample_count = 0
+
+    @property
+    def enabled(self):
+        """Returns whether or not the profiler is enabled."""
+        return self.__enabled
+
+    def enable(self, interval_ms=None):
+        """Enables the profiler, sampling every :interval_ms milliseconds."""
+        if interval_ms is not None:
+            self.__interval = interval_ms
+        self.__enabled = True
+
+    def enter(self, route):
+        """Marks the current thread as serving a request to :route."""
+        if not self.__enabled:
+            return
+        if self.__pid != os.getpid():
+            # The sampler thread does not survive a fork
+            self.__start()
+        self.__active[threading.get_ident()] = route
+
+    def exit(self):
+        """Marks the current thread as not serving any request."""
+        self.__active.pop(threading.get_ident(), None)
+
+    def get_route(self):
+        """Returns the route being served by the current thread (or None)."""
+        return self.__active.get(threading.get_ident())
+
+    def stats(self):
+        """
+        Returns a dictionary with the amount of samples taken and the
+        fraction of the time spent by the sampler thread (its overhead).
+        """
+        with self.__lock:
+            elapsed = (
+                0 if self.__started_at is None
+                else time.monotonic() - self.__started_at
+            )
+            return {
+                "samples": self.__sample_count,
+                "overhead": self.__cpu_time / elapsed if elapsed else 0.0
+            }
+
+    def collapsed(self, route=None):
+        """
+        Returns the collapsed stacks of every endpoint (or only the ones of
+        :route), each one prefixed with the route of its endpoint.
+        """
+        with self.__lock:
+            lines = [
+                f"{sampled_route};{stack} {count}"
+                for sampled_route, stacks in sorted(self.__samples.items())
+                if route is None or sampled_route == route
+                for stack, count in stacks.most_common()
+            ]
+        return "\n".join(lines)
+
+    def reset(self):
+        """Drops every sample taken."""
+        with self.__lock:
+            self.__samples.clear()
+            self.__sample_count = 0
+
+    def dump(self, filename=None):
+        """
+        Writes the collapsed stacks into :filename (by default, a file
+        named after the id of the process). Returns the name of the file.
+        """
+        if filename is None:
+            filename = symmetric.constants.PROFILE_FILE_NAME.format(
+                pid=os.getpid())
+        with open(filename, "w", encoding="utf-8") as profile_file:
+            profile_file.write(self.collapsed())
+        return filename
+
+    def dump_on_signal(self, signal_number):
+        """
+        Dumps the collapsed stacks when the process receives the signal
+        :signal_number. Must be called from the main thread.
+        """
+        def handler(*_):
+            filename = self.dump()
+            logger.info("[[symmetric]] profile written to %s", filename)
+        try:
+            signal.signal(signal_number, handler)
+        except ValueError:
+            logger.warning(
+                "[[symmetric]] the profile dump signal can only be set from "
+                "the main thread"
+            )
+
+    def __start(self):
+        """Starts the sampler thread of the current process."""
+        with self.__lock:
+            if self.__pid == os.getpid():
+                return
+            self.__pid = os.getpid()
+            self.__active = {}
+            self.__started_at = time.monotonic()
+            self.__cpu_time = 0.0
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    def __run(self):
+        """Takes samples forever."""
+        own_ident = threading.get_ident()
+        while True:
+            time.sleep(self.__interval / 1000)
+            start = thread_time()
+            frames = sys._current_frames()  # pylint: disable=W0212
+            stacks = [
+                (route, self.__get_stack(frames[ident]))
+                for ident, route in list(self.__active.items())
+                if ident in frames and ident != own_ident
+            ]
+            with self.__lock:
+                for route, stack in stacks:
+                    self.__samples[route][stack] += 1
+                    self.__sample_count += 1
+                self.__cpu_time += thread_time() - start
+
+    def __get_stack(self, frame):
+        """Returns the collapsed stack of :frame (from the root frame)."""
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self.__labels.get(code)
+            if label is None:
+                filename = os.path.basename(code.co_filename)
+                label = (f"{code.co_name} ({filename}:{code.co_firstlineno})"
+                         ).replace(";", ",")
+                self.__labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+# Profiler of the requests of the API
+profiler = SamplingProfiler()
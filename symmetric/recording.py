@@ -0,0 +1,116 @@
+"""
+A module to hold the request recording utilities of symmetric.
+"""
+
+import json
+import time
+import random
+import logging
+import logging.handlers
+
+import symmetric.constants
+import symmetric.helpers
+
+
+class Recorder:
+
+    """
+    Class to encapsulate the recording of a sample of the requests into a
+    rotating file, with one JSON object per line. Each entry includes the
+    route, the HTTP method, the filtered parameters, the headers (without
+    the credentials), whether or not the request included an authentication
+    token, the response status and the duration of the request.
+    """
+
+    def __init__(self, filename, sample_rate=1.0, max_bytes=None,
+                 backup_count=None):
+        self.__filename = filename
+        self.__sample_rate = sample_rate
+        handler = logging.handlers.RotatingFileHandler(
+            filename,
+            maxBytes=(
+                symmetric.constants.DEFAULT_RECORDING_MAX_BYTES
+                if max_bytes is None else max_bytes
+            ),
+            backupCount=(
+                symmetric.constants.DEFAULT_RECORDING_BACKUP_COUNT
+                if backup_count is None else backup_count
+            )
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        # The recording logger only writes to the recording file
+        self.__logger = logging.getLogger(f"{__name__}.{id(self)}")
+        self.__logger.propagate = False
+        self.__logger.setLevel(logging.INFO)
+        self.__logger.addHandler(handler)
+
+    @property
+    def filename(self):
+        """Returns the name of the recording file."""
+        return self.__filename
+
+    def record(self, endpoint, request, body, response, duration,
+               client_token_name):
+        """
+        Records the :request to :endpoint with the :body parsed by the
+        endpoint (with a probability equal to the sample rate), including
+        the status of its :response and its :duration (in milliseconds).
+        """
+        if random.random() >= self.__sample_rate:
+            return
+        if not isinstance(body, dict):
+            body = {}
+        excluded = [
+            normalize_header(x)
+            for x in symmetric.constants.RECORDING_EXCLUDED_HEADERS
+        ]
+        excluded.append(normalize_header(client_token_name))
+        entry = {
+            "time": time.time(),
+            "route": endpoint.route,
+            "method": request.method,
+            "body": symmetric.helpers.filter_params(
+                endpoint.function, dict(body),
+                endpoint.has_token, client_token_name),
+            "headers": {
+                key: value for key, value in request.headers.items()
+                if normalize_header(key) not in excluded
+            },
+            # Only whether or not the request included a token is recorded
+            "token": client_token_name in request.headers,
+            "status": response.status_code,
+            "duration": round(duration, 3)
+        }
+        self.__logger.info(
+            json.dumps(entry, separators=(",", ":"), default=str))
+
+    def close(self):
+        """Closes the recording file."""
+        for handler in list(self.__logger.handlers):
+            handler.close()
+            self.__logger.removeHandler(handler)
+
+
+def normalize_header(name):
+    """
+    Normalizes the header :name to compare it (WSGI servers turn the
+    underscores of the header names into hyphens).
+    """
+    return name.lower().replace("_", "-")
+
+
+def read_recording(filename):
+    """
+    Reads the entries of the recording file :filename, sorted by the time
+    of the requests. The lines that can't be parsed get skipped.
+    """
+    entries = []
+    with open(filename, encoding="utf-8") as recording_file:
+        for line in recording_file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "route" in entry:
+                entries.append(entry)
+    return sorted(entries, key=lambda x: x.get("time", 0))
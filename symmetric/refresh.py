@@ -0,0 +1,201 @@
+"""
+A module to hold the background refresh utilities of symmetric, used to
+serve the results of the parameterless endpoints from memory.
+"""
+
+import os
+import time
+import inspect
+import logging
+import threading
+
+import symmetric.errors
+import symmetric.logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class Refresher:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate the result of a parameterless function, kept in
+    memory and recomputed in the background. The result gets recomputed
+    every :refresh_every seconds and, when a request finds it older than
+    :stale_ttl seconds, the stale result gets served while a refresh runs
+    in the background. If a refresh fails, the last result is kept.
+    """
+
+    def __init__(self, function, refresh_every=None, stale_ttl=None):
+        self.__function = function
+        self.__refresh_every = refresh_every
+        self.__stale_ttl = (
+            refresh_every if stale_ttl is None else stale_ttl
+        )
+        self.__lock = threading.Lock()
+        self.__compute_lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__result = None
+        self.__updated = None
+        self.__refreshing = False
+        self.__scheduler = None
+        self.__pid = None
+        self.__refreshes = 0
+        self.__failures = 0
+        self.__duration = None
+
+    def stats(self):
+        """Returns a dictionary with the counters of the refresher."""
+        age = self.age()
+        with self.__lock:
+            return {
+                "age": None if age is None else round(age, 3),
+                "refreshes": self.__refreshes,
+                "failures": self.__failures,
+                "last_duration_ms": (
+                    None if self.__duration is None
+                    else round(self.__duration * 1000, 3)
+                )
+            }
+
+    def age(self):
+        """
+        Returns the seconds since the result was computed (or None if it
+        has not been computed yet).
+        """
+        updated = self.__updated
+        return None if updated is None else time.monotonic() - updated
+
+    def headers(self):
+        """
+        Returns the headers of a response with the result, including its
+        Age (in whole seconds).
+        """
+        age = self.age()
+        return {} if age is None else {"Age": str(int(age))}
+
+    def start(self):
+        """
+        Computes the first result (if it does not exist yet) and starts
+        the scheduled refreshes. Meant to be called on startup.
+        """
+        self.__compute_first()
+        self.__schedule()
+
+    def stop(self):
+        """Stops the scheduled refreshes."""
+        self.__stopped.set()
+
+    def get(self):
+        """
+        Returns the result of the function. The first call waits for the
+        result to be computed (raising the exception of the function if it
+        fails), and the calls that find a stale result trigger a refresh
+        in the background.
+        """
+        self.__schedule()
+        if self.__updated is None:
+            self.__compute_first()
+        elif self.__stale_ttl is not None and self.age() > self.__stale_ttl:
+            self.__refresh_in_background()
+        return self.__result
+
+    def __compute_first(self):
+        """Computes the result if it has not been computed yet."""
+        with self.__compute_lock:
+            if self.__updated is None:
+                self.__compute()
+
+    def __compute(self):
+        """Calls the function and stores its result and its duration."""
+        start = time.monotonic()
+        try:
+            result = self.__function()
+        except Exception:
+            with self.__lock:
+                self.__failures += 1
+            raise
+        end = time.monotonic()
+        with self.__lock:
+            self.__result = result
+            self.__updated = end
+            self.__duration = end - start
+            self.__refreshes += 1
+
+    def __refresh(self, request_id=None):
+        """
+        Recomputes the result, keeping the last one if the function fails.
+        The log lines of the refresh get the :request_id of the request
+        that triggered it (if any).
+        """
+        if request_id is not None:
+            symmetric.logging.set_request_id(request_id)
+        try:
+            with self.__compute_lock:
+                self.__compute()
+        except Exception as err:
+            logger.error(
+                "[[symmetric]] refresh of '%s' failed, serving the last "
+                "result: %s", self.__function.__name__, err
+            )
+        finally:
+            with self.__lock:
+                self.__refreshing = False
+            symmetric.logging.finish_request()
+
+    def __refresh_in_background(self):
+        """Starts a refresh in a new thread, unless one is already running."""
+        with self.__lock:
+            if self.__refreshing:
+                return
+            self.__refreshing = True
+        threading.Thread(
+            target=self.__refresh,
+            args=(symmetric.logging.get_request_id(),),
+            daemon=True
+        ).start()
+
+    def __schedule(self):
+        """
+        Starts the scheduler thread if it has not started yet (in the
+        current process, as it does not survive a fork).
+        """
+        if self.__refresh_every is None or self.__pid == os.getpid():
+            return
+        with self.__lock:
+            if self.__pid == os.getpid():
+                return
+            self.__pid = os.getpid()
+            self.__scheduler = threading.Thread(
+                target=self.__run_scheduler, daemon=True)
+            self.__scheduler.start()
+
+    def __run_scheduler(self):
+        """Refreshes the result every :refresh_every seconds."""
+        while not self.__stopped.wait(self.__refresh_every):
+            with self.__lock:
+                if self.__refreshing:
+                    continue
+                self.__refreshing = True
+            self.__refresh()
+
+
+def get_refresher(function, refresh_every=None, stale_ttl=None,
+                  background=False, batch=False):
+    """
+    Returns a Refresher for :function, or None if neither :refresh_every
+    nor :stale_ttl is set. Raises RefreshConfigurationError if the function
+    recieves parameters or runs as a background job or in batches.
+    """
+    if refresh_every is None and stale_ttl is None:
+        return None
+    params = inspect.getfullargspec(function)
+    if params.args or params.varargs or params.varkw or params.kwonlyargs:
+        error = (f"Function '{function.__name__}' can't be refreshed in "
+                 "the background, as it recieves parameters.")
+        raise symmetric.errors.RefreshConfigurationError(error)
+    if background or batch:
+        error = (f"Function '{function.__name__}' can't be refreshed in "
+                 "the background and run as a job or in batches.")
+        raise symmetric.errors.RefreshConfigurationError(error)
+    return Refresher(function, refresh_every, stale_ttl)
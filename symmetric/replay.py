@@ -0,0 +1,176 @@
+"""
+A module to replay recorded requests against a symmetric API.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import concurrent.futures
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.constants
+
+
+class InProcessClient:  # pylint: disable=R0903
+
+    """
+    Class to send requests to a WSGI application (like the symmetric
+    object) without a server.
+    """
+
+    def __init__(self, application):
+        self.__client = werkzeug.test.Client(
+            application, werkzeug.wrappers.Response)
+
+    def send(self, method, path, headers, data):
+        """Sends a request and returns its status and its headers."""
+        response = self.__client.open(
+            path, method=method, headers=headers, data=data)
+        return response.status_code, response.headers
+
+
+class HTTPClient:  # pylint: disable=R0903
+
+    """
+    Class to send requests to a symmetric API listening on a port.
+    """
+
+    def __init__(self, server, port):
+        self.__base_url = f"http://{server}:{port}"
+
+    def send(self, method, path, headers, data):
+        """Sends a request and returns its status and its headers."""
+        request = urllib.request.Request(
+            f"{self.__base_url}{path}", data=data, headers=headers,
+            method=method)
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status, response.headers
+        except urllib.error.HTTPError as err:
+            return err.code, err.headers
+
+
+def get_server_duration(headers):
+    """
+    Returns the total duration (in milliseconds) of the Server-Timing
+    header in :headers, or None if it is missing.
+    """
+    for metric in headers.get("Server-Timing", "").split(","):
+        name, _, duration = metric.strip().partition(";")
+        if name == "total" and duration.startswith("dur="):
+            return float(duration[len("dur="):])
+    return None
+
+
+def build_request(entry, client_token_name, token):
+    """
+    Given a recorded :entry, returns the method, the path, the headers and
+    the data of the request to replay it, authenticated with :token if the
+    recorded request included a token.
+    """
+    headers = dict(entry.get("headers", {}))
+    if entry.get("token"):
+        headers[client_token_name] = token
+    body = entry.get("body", {})
+    path = entry["route"]
+    if entry["method"] == "GET":
+        if body:
+            path += f"?{urllib.parse.urlencode(body, doseq=True)}"
+        return entry["method"], path, headers, None
+    headers["Content-Type"] = "application/json"
+    return entry["method"], path, headers, json.dumps(body).encode()
+
+
+def replay(entries, client, client_token_name, token, fast=False,
+           concurrency=None):
+    """
+    Sends every recorded entry using :client, at the original pacing (or as
+    fast as possible if :fast is True), with up to :concurrency requests at
+    the same time. Returns a list with the result of each request.
+    """
+    def send(entry):
+        start = time.perf_counter()
+        status, headers = client.send(
+            *build_request(entry, client_token_name, token))
+        elapsed = (time.perf_counter() - start) * 1000
+        duration = get_server_duration(headers)
+        return {
+            "route": entry["route"],
+            "method": entry["method"],
+            "recorded_status": entry.get("status"),
+            "status": status,
+            "recorded": entry.get("duration"),
+            "duration": elapsed if duration is None else duration
+        }
+
+    if not entries:
+        return []
+    workers = (
+        symmetric.constants.DEFAULT_REPLAY_CONCURRENCY
+        if concurrency is None else concurrency
+    )
+    first = entries[0].get("time", 0)
+    start = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        futures = []
+        for entry in entries:
+            if not fast:
+                delay = start + entry.get("time", first) - first
+                time.sleep(max(0, delay - time.monotonic()))
+            futures.append(executor.submit(send, entry))
+        return [future.result() for future in futures]
+
+
+def percentile(values, fraction):
+    """Returns the :fraction percentile of :values (nearest rank)."""
+    values = sorted(values)
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def get_report(results):
+    """
+    Returns a table comparing the recorded and the replayed latencies
+    (p50 and p95, in milliseconds) of each endpoint, with the amount of
+    responses whose status does not match the recorded one.
+    """
+    routes = {}
+    for result in results:
+        key = (result["method"], result["route"])
+        routes.setdefault(key, []).append(result)
+    lines = [
+        f"{'endpoint':<32}{'requests':>10}{'p50 rec':>10}{'p50 now':>10}"
+        f"{'p95 rec':>10}{'p95 now':>10}{'change':>10}{'mismatch':>10}"
+    ]
+    for (method, route), route_results in sorted(routes.items()):
+        recorded = [
+            x["recorded"] for x in route_results if x["recorded"] is not None
+        ]
+        replayed = [x["duration"] for x in route_results]
+        recorded_p50 = percentile(recorded, 0.5)
+        replayed_p50 = percentile(replayed, 0.5)
+        change = "-" if not recorded_p50 else (
+            f"{(replayed_p50 - recorded_p50) / recorded_p50:+.0%}")
+        mismatches = sum(
+            1 for x in route_results if x["status"] != x["recorded_status"])
+        lines.append(
+            f"{f'{method} {route}':<32}{len(route_results):>10}"
+            f"{format_duration(recorded_p50):>10}"
+            f"{format_duration(replayed_p50):>10}"
+            f"{format_duration(percentile(recorded, 0.95)):>10}"
+            f"{format_duration(percentile(replayed, 0.95)):>10}"
+            f"{change:>10}{mismatches:>10}"
+        )
+    return "\n".join(lines)
+
+
+def format_duration(duration):
+    """Formats a duration in milliseconds (or a dash if it is missing)."""
+    return "-" if duration is None else f"{duration:.1f}"
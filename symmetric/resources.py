@@ -0,0 +1,292 @@
+"""
+A module to hold the resource pooling utilities of symmetric, used to share
+resources (like database connections) between the calls of the endpoints.
+"""
+
+import os
+import time
+import inspect
+import logging
+import functools
+import threading
+import collections
+
+import symmetric.constants
+import symmetric.errors
+
+
+logger = logging.getLogger(__name__)
+
+
+class Pool:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate a pool of the resources created by :factory. Each
+    call checks out a resource (creating it if no idle resource is left,
+    up to :max_size resources) and returns it when it finishes. The idle
+    resources get checked with :health_check before being checked out,
+    and the broken ones get closed with :close and replaced.
+    """
+
+    def __init__(self, factory, min_size=None, max_size=None,
+                 health_check=None, close=None, timeout=None):
+        self.__factory = factory
+        self.__min_size = (
+            symmetric.constants.DEFAULT_RESOURCE_MIN_SIZE
+            if min_size is None else min_size
+        )
+        self.__max_size = (
+            symmetric.constants.DEFAULT_RESOURCE_MAX_SIZE
+            if max_size is None else max_size
+        )
+        self.__health_check = health_check
+        self.__close = close
+        self.__timeout = (
+            symmetric.constants.DEFAULT_RESOURCE_TIMEOUT
+            if timeout is None else timeout
+        )
+        self.__condition = threading.Condition()
+        self.__idle = collections.deque()
+        self.__size = 0
+        self.__in_use = 0
+        self.__created = 0
+        self.__discarded = 0
+        self.__timeouts = 0
+        self.__closed = False
+        self.__pid = os.getpid()
+
+    @property
+    def name(self):
+        """Returns the name of the factory of the pool."""
+        return getattr(self.__factory, "__name__", repr(self.__factory))
+
+    def stats(self):
+        """Returns a dictionary with the counters of the pool."""
+        with self.__condition:
+            return {
+                "size": self.__size,
+                "idle": len(self.__idle),
+                "in_use": self.__in_use,
+                "created": self.__created,
+                "discarded": self.__discarded,
+                "timeouts": self.__timeouts
+            }
+
+    def fill(self):
+        """
+        Creates resources until the pool has its minimum size. Meant to be
+        called on startup.
+        """
+        while True:
+            with self.__condition:
+                self.__check_process()
+                if self.__closed or self.__size >= self.__min_size:
+                    return
+                self.__size += 1
+            resource = self.__create()
+            with self.__condition:
+                self.__idle.append(resource)
+                self.__condition.notify()
+
+    def acquire(self):
+        """
+        Checks out a resource, waiting for one to be returned if the pool
+        is full. Raises ServerOverloadedError if no resource gets returned
+        before the timeout of the pool.
+        """
+        deadline = time.monotonic() + self.__timeout
+        with self.__condition:
+            self.__check_process()
+            while not self.__idle and self.__size >= self.__max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.__timeouts += 1
+                    error = f"No '{self.name}' resource is available."
+                    raise symmetric.errors.ServerOverloadedError(
+                        error, symmetric.constants.DEFAULT_RETRY_AFTER)
+                self.__condition.wait(remaining)
+            self.__in_use += 1
+            resource = self.__idle.pop() if self.__idle else None
+            if resource is None:
+                self.__size += 1
+        try:
+            if resource is not None and not self.__is_healthy(resource):
+                self.__discard(resource, replace=True)
+                resource = None
+            if resource is None:
+                resource = self.__create()
+        except Exception:
+            with self.__condition:
+                self.__in_use -= 1
+            raise
+        return resource
+
+    def release(self, resource):
+        """Returns the checked out :resource to the pool."""
+        with self.__condition:
+            self.__in_use -= 1
+            if not self.__closed and self.__pid == os.getpid():
+                # The most recently used resources get checked out first
+                self.__idle.append(resource)
+                self.__condition.notify()
+                return
+        self.__discard(resource)
+
+    def close(self):
+        """
+        Closes the idle resources. The resources that are checked out get
+        closed when they are returned.
+        """
+        with self.__condition:
+            self.__closed = True
+            idle = list(self.__idle)
+            self.__idle.clear()
+        for resource in idle:
+            self.__discard(resource)
+
+    def __create(self):
+        """
+        Creates a new resource, whose slot was already counted in the size
+        of the pool (and gets released if the factory fails).
+        """
+        try:
+            resource = self.__factory()
+        except Exception:
+            with self.__condition:
+                self.__size -= 1
+                self.__condition.notify()
+            raise
+        with self.__condition:
+            self.__created += 1
+        return resource
+
+    def __discard(self, resource, replace=False):
+        """
+        Closes :resource and removes it from the pool (keeping its slot if
+        it gets replaced).
+        """
+        if self.__close is not None:
+            try:
+                self.__close(resource)
+            except Exception as err:
+                logger.error("[[symmetric]] failed to close a '%s' "
+                             "resource: %s", self.name, err)
+        with self.__condition:
+            self.__discarded += 1
+            if not replace:
+                self.__size -= 1
+                self.__condition.notify()
+
+    def __is_healthy(self, resource):
+        """Returns whether or not :resource passes the health check."""
+        if self.__health_check is None:
+            return True
+        try:
+            return bool(self.__health_check(resource))
+        except Exception:
+            return False
+
+    def __check_process(self):
+        """
+        Forgets the resources inherited from the parent process, as they
+        can't be shared with it (for example, sockets). Must be called
+        holding the lock.
+        """
+        if self.__pid == os.getpid():
+            return
+        self.__pid = os.getpid()
+        self.__idle.clear()
+        self.__size = 0
+        self.__in_use = 0
+
+
+class Registry:
+
+    """
+    Class to encapsulate the pools of every resource factory, so the
+    endpoints that use the same factory share the same pool.
+    """
+
+    def __init__(self):
+        self.__pools = {}
+        self.__lock = threading.Lock()
+
+    def register(self, factory, min_size=None, max_size=None,
+                 health_check=None, close=None, timeout=None):
+        """
+        Creates the pool of :factory with the given options. Raises
+        ResourceConfigurationError if the factory already has a pool.
+        """
+        with self.__lock:
+            if factory in self.__pools:
+                error = (f"Resource '{self.__pools[factory].name}' was "
+                         "registered after being used or registered.")
+                raise symmetric.errors.ResourceConfigurationError(error)
+            self.__pools[factory] = Pool(
+                factory, min_size, max_size, health_check, close, timeout)
+            return self.__pools[factory]
+
+    def get(self, factory):
+        """
+        Returns the pool of :factory, creating it with the default options
+        if it does not exist yet.
+        """
+        with self.__lock:
+            if factory not in self.__pools:
+                self.__pools[factory] = Pool(factory)
+            return self.__pools[factory]
+
+
+pools = Registry()
+
+
+def get_signature(function, names):
+    """Returns the signature of :function without the parameters :names."""
+    signature = inspect.signature(function)
+    return signature.replace(parameters=[
+        parameter for parameter in signature.parameters.values()
+        if parameter.name not in names
+    ])
+
+
+def get_pools(function, resources):
+    """
+    Given the :resources dictionary of the router (with the name of the
+    parameter of each resource and its factory or its pool), returns the
+    pool of each parameter of :function. Raises ResourceConfigurationError
+    if :function does not recieve one of the parameters.
+    """
+    params = inspect.getfullargspec(function)
+    endpoint_pools = {}
+    for name, resource in resources.items():
+        if name not in params.args and name not in params.kwonlyargs:
+            error = (f"Function '{function.__name__}' does not recieve "
+                     f"the '{name}' resource.")
+            raise symmetric.errors.ResourceConfigurationError(error)
+        endpoint_pools[name] = (
+            resource if isinstance(resource, Pool) else pools.get(resource)
+        )
+    return endpoint_pools
+
+
+def inject(function, endpoint_pools):
+    """
+    Returns a wrapper of :function that checks out a resource from each one
+    of :endpoint_pools (keyed by the name of its parameter) for every call,
+    returning them when the call finishes. The signature of the wrapper
+    does not include the parameters of the resources, so they never get
+    filtered from the body, validated nor documented.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        checked_out = {}
+        try:
+            for name, pool in endpoint_pools.items():
+                checked_out[name] = pool.acquire()
+            return function(*args, **{**kwargs, **checked_out})
+        finally:
+            for name, resource in checked_out.items():
+                endpoint_pools[name].release(resource)
+
+    wrapper.__signature__ = get_signature(function, endpoint_pools)
+    return wrapper
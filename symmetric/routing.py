@@ -0,0 +1,105 @@
+"""
+A module to hold the route matching utilities of symmetric, used to match
+the static routes in constant time, regardless of the amount of endpoints.
+"""
+
+import flask
+import werkzeug.routing
+
+
+def is_indexable(rule):
+    """
+    Checks if :rule only matches its exact path (without variables,
+    redirections or host and subdomain restrictions), so it can be matched
+    with a dictionary lookup.
+    """
+    return not any([
+        rule.arguments,
+        rule.build_only,
+        rule.redirect_to is not None,
+        rule.host,
+        rule.subdomain,
+        getattr(rule, "websocket", False)
+    ])
+
+
+class IndexedMap(werkzeug.routing.Map):
+
+    """
+    Class to encapsulate a URL map that indexes its static rules by their
+    path. The requests to a static rule get matched with a dictionary
+    lookup instead of trying every rule of the map, and every other request
+    gets matched by the map as usual.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.__index = {}
+        super().__init__(*args, **kwargs)
+
+    @property
+    def index(self):
+        """Returns a dictionary with the static rules of each path."""
+        return self.__index
+
+    def add(self, rulefactory):
+        """Adds the rules of :rulefactory to the map and to the index."""
+        super().add(rulefactory)
+        for rule in rulefactory.get_rules(self):
+            if is_indexable(rule):
+                self.__index.setdefault(rule.rule, []).append(rule)
+
+    def bind_to_environ(self, *args, **kwargs):
+        """Returns an adapter that matches the static rules in the index."""
+        adapter = super().bind_to_environ(*args, **kwargs)
+        if self.host_matching or self.default_subdomain:
+            return adapter
+        return IndexedMapAdapter(adapter, self.__index)
+
+
+class IndexedMapAdapter:
+
+    """
+    Class to encapsulate a map adapter bound to a request, whose path gets
+    looked up in the :index of the static rules before falling back to the
+    matching of the adapter.
+    """
+
+    def __init__(self, adapter, index):
+        self.__adapter = adapter
+        self.__index = index
+
+    def __getattr__(self, name):
+        return getattr(self.__adapter, name)
+
+    def match(self, path_info=None, method=None, return_rule=False,
+              query_args=None, **kwargs):
+        """
+        Matches the path of the request (or :path_info) with :method,
+        returning the endpoint (or the rule if :return_rule is True) and
+        the values of the rule. Accepts the arguments of the match method
+        of the adapter.
+        """
+        path = self.__adapter.path_info if path_info is None else path_info
+        method = (
+            self.__adapter.default_method if method is None else method
+        ).upper()
+        if not kwargs.get("websocket") and isinstance(path, str):
+            # The map strips the leading slashes the same way
+            for rule in self.__index.get("/" + path.lstrip("/"), ()):
+                if rule.methods is None or method in rule.methods:
+                    values = dict(rule.defaults) if rule.defaults else {}
+                    return (rule if return_rule else rule.endpoint), values
+        # The rest of the requests (including the ones whose method is
+        # not allowed) get matched as usual
+        return self.__adapter.match(
+            path_info, method, return_rule, query_args, **kwargs)
+
+
+class App(flask.Flask):
+
+    """
+    Class to encapsulate a flask application whose static routes get
+    matched in constant time.
+    """
+
+    url_map_class = IndexedMap
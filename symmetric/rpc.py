@@ -0,0 +1,163 @@
+"""
+A module to hold the RPC channel utilities of symmetric, used to serve
+many pipelined calls to the endpoints through a single connection.
+"""
+
+import json
+import queue
+import threading
+import concurrent.futures
+
+import flask
+
+import symmetric.constants
+
+
+class Session:  # pylint: disable=R0902
+
+    """
+    Class to encapsulate the calls received through a single connection.
+    Every message is a call ({id, route, body}) that gets handled by
+    :handle in a pool of threads, and its reply ({id, status, result}) gets
+    encoded with :encode and sent with :send as soon as the call finishes,
+    so the replies can arrive in any order. A message with a token
+    ({id, token}) authenticates every call of the connection.
+    """
+
+    def __init__(self, handle, authenticate, send, encode, headers=None,
+                 concurrency=None):
+        self.__handle = handle
+        self.__authenticate = authenticate
+        self.__send = send
+        self.__encode = encode
+        self.__headers = {} if headers is None else headers
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            symmetric.constants.DEFAULT_RPC_CONCURRENCY
+            if concurrency is None else concurrency
+        )
+        self.__pending = threading.BoundedSemaphore(
+            symmetric.constants.RPC_MAX_PENDING)
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    @property
+    def closed(self):
+        """Returns whether or not the session was closed."""
+        return self.__closed
+
+    def receive(self, message):
+        """
+        Handles the raw :message received through the connection. Blocks
+        while too many calls of the session are still running.
+        """
+        try:
+            call = json.loads(message)
+        except ValueError:
+            call = None
+        if not isinstance(call, dict):
+            self.__reply(None, 400, {"error": "The message is not a call."})
+            return
+        call_id = call.get("id")
+        if "token" in call and "route" not in call:
+            headers = self.__authenticate(call["token"])
+            if headers is None:
+                self.__reply(call_id, 401, {})
+                return
+            self.__headers = headers
+            self.__reply(call_id, 200, {})
+            return
+        if not isinstance(call.get("route"), str):
+            self.__reply(call_id, 400, {"error": "The call has no route."})
+            return
+        self.__pending.acquire()  # pylint: disable=R1732
+        try:
+            self.__executor.submit(
+                self.__call, call_id, call["route"], call.get("body"),
+                self.__headers)
+        except RuntimeError:
+            # The session was closed
+            self.__pending.release()
+
+    def close(self):
+        """
+        Closes the session. The calls that are still running finish in the
+        background, but their replies get discarded.
+        """
+        with self.__lock:
+            self.__closed = True
+        self.__executor.shutdown(wait=False)
+
+    def __call(self, call_id, route, body, headers):
+        """Handles a call and sends its reply."""
+        try:
+            status, result = self.__handle(route, body, headers)
+            self.__reply(call_id, status, result)
+        finally:
+            self.__pending.release()
+
+    def __reply(self, call_id, status, result):
+        """Sends the reply of a call (if the session is still open)."""
+        reply = {"id": call_id, "status": status, "result": result}
+        try:
+            message = self.__encode(reply)
+        except Exception:
+            message = self.__encode({"id": call_id, "status": 500,
+                                     "result": {}})
+        # Only one message can be sent at a time
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__send(message)
+
+
+class LocalConnection:
+
+    """
+    Class to encapsulate an in-process connection to the RPC channel,
+    without a socket. Useful to test and benchmark the endpoints.
+    """
+
+    def __init__(self, create_session):
+        self.__replies = queue.Queue()
+        self.__session = create_session(self.__replies.put)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def send(self, message):
+        """Sends the :message dictionary through the connection."""
+        self.__session.receive(json.dumps(message))
+
+    def receive(self, timeout=None):
+        """
+        Returns the next reply received through the connection (as a
+        dictionary), waiting up to :timeout seconds for it.
+        """
+        return json.loads(self.__replies.get(timeout=timeout))
+
+    def close(self):
+        """Closes the connection."""
+        self.__session.close()
+
+
+class ClosedConnectionResponse(flask.Response):  # pylint: disable=R0901
+
+    """
+    Class to end a request whose connection was taken over by a WebSocket
+    (served in :mode), so the server does not write a response to it.
+    """
+
+    def __init__(self, mode):
+        super().__init__()
+        self.__mode = mode
+
+    def __call__(self, environ, start_response):
+        if self.__mode == "werkzeug":
+            # The werkzeug server ignores the dropped connections
+            raise ConnectionError()
+        if self.__mode == "gunicorn":
+            raise StopIteration()
+        return []
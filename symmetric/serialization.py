@@ -0,0 +1,171 @@
+"""
+A module to hold the response serialization utilities of symmetric.
+"""
+
+import base64
+import threading
+
+import flask.json
+
+import symmetric.constants
+import symmetric.errors
+
+try:
+    import dataclasses
+except ImportError:  # Python 3.6
+    dataclasses = None
+
+
+class SerializerRegistry:
+
+    """
+    Class to encapsulate the functions used to turn the objects returned by
+    the endpoints into JSON serializable objects. The serializer of an
+    object gets looked up by its type (and the types it inherits from), and
+    its result may contain other objects with serializers. The serializers
+    for NumPy and pandas objects only get registered when an object of
+    those libraries gets serialized, so none of them is ever imported by
+    symmetric.
+    """
+
+    def __init__(self):
+        self.__serializers = {}
+        self.__cache = {}
+        self.__loaded = set()
+        self.__array_format = symmetric.constants.ARRAY_FORMAT_LIST
+        self.__frame_format = symmetric.constants.FRAME_FORMAT_RECORDS
+        self.__lock = threading.Lock()
+
+    @property
+    def array_format(self):
+        """Returns the format used to serialize the NumPy arrays."""
+        return self.__array_format
+
+    @property
+    def frame_format(self):
+        """Returns the format used to serialize the pandas data frames."""
+        return self.__frame_format
+
+    def configure(self, array_format=None, frame_format=None):
+        """
+        Changes the format of the NumPy arrays (a list or a base64 encoded
+        buffer) and of the pandas data frames (a list of records or a
+        dictionary of columns).
+        """
+        if array_format is not None:
+            if array_format not in (symmetric.constants.ARRAY_FORMAT_LIST,
+                                    symmetric.constants.ARRAY_FORMAT_BUFFER):
+                error = f"Unknown array format '{array_format}'."
+                raise symmetric.errors.SerializationConfigurationError(error)
+            self.__array_format = array_format
+        if frame_format is not None:
+            if frame_format not in (symmetric.constants.FRAME_FORMAT_RECORDS,
+                                    symmetric.constants.FRAME_FORMAT_COLUMNS):
+                error = f"Unknown frame format '{frame_format}'."
+                raise symmetric.errors.SerializationConfigurationError(error)
+            self.__frame_format = frame_format
+
+    def register(self, type_obj, function):
+        """
+        Registers :function as the serializer of the objects of type
+        :type_obj (and of the types that inherit from it).
+        """
+        with self.__lock:
+            self.__serializers[type_obj] = function
+            self.__cache.clear()
+
+    def find(self, obj):
+        """Returns the serializer of :obj, or None if it has none."""
+        type_obj = type(obj)
+        if type_obj in self.__cache:
+            return self.__cache[type_obj]
+        library = type_obj.__module__.partition(".")[0]
+        if library in OPTIONAL_SERIALIZERS and library not in self.__loaded:
+            self.__loaded.add(library)
+            for optional_type, function in OPTIONAL_SERIALIZERS[library](self):
+                self.register(optional_type, function)
+        serializer = next(
+            (self.__serializers[x] for x in type_obj.__mro__
+             if x in self.__serializers),
+            None
+        )
+        if serializer is None and dataclasses is not None and (
+                dataclasses.is_dataclass(type_obj)):
+            serializer = serialize_dataclass
+        self.__cache[type_obj] = serializer
+        return serializer
+
+
+def serialize_dataclass(obj):
+    """
+    Serializes the dataclass instance :obj into a dictionary of its fields.
+    Unlike dataclasses.asdict, the values are not copied: the nested objects
+    get serialized by the JSON encoder.
+    """
+    return {x.name: getattr(obj, x.name) for x in dataclasses.fields(obj)}
+
+
+def get_numpy_serializers(registry):
+    """Returns the serializers of the NumPy types."""
+    import numpy  # pylint: disable=C0415
+
+    def serialize_array(array):
+        buffer_format = symmetric.constants.ARRAY_FORMAT_BUFFER
+        if registry.array_format != buffer_format or array.dtype.hasobject:
+            # tolist converts the whole array in C
+            return array.tolist()
+        array = numpy.ascontiguousarray(array)
+        return {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "data": base64.b64encode(array.data).decode("ascii")
+        }
+
+    return [
+        (numpy.ndarray, serialize_array),
+        (numpy.generic, lambda value: value.item())
+    ]
+
+
+def get_pandas_serializers(registry):
+    """Returns the serializers of the pandas types."""
+    import pandas  # pylint: disable=C0415
+
+    def serialize_frame(frame):
+        if registry.frame_format == symmetric.constants.FRAME_FORMAT_COLUMNS:
+            # Each column gets serialized as a NumPy array
+            return {
+                str(name): column.to_numpy()
+                for name, column in frame.items()
+            }
+        return frame.to_dict(orient="records")
+
+    return [
+        (pandas.DataFrame, serialize_frame),
+        (pandas.Series, lambda series: series.to_numpy()),
+        (pandas.Index, lambda index: index.to_numpy())
+    ]
+
+
+OPTIONAL_SERIALIZERS = {
+    "numpy": get_numpy_serializers,
+    "pandas": get_pandas_serializers
+}
+
+
+# Serializers used by the responses of the API
+serializers = SerializerRegistry()
+
+
+class JSONEncoder(flask.json.JSONEncoder):
+
+    """
+    JSON encoder of the API, which uses the serializers of the registry
+    before falling back to the default flask encoder.
+    """
+
+    def default(self, o):  # pylint: disable=E0202
+        serializer = serializers.find(o)
+        if serializer is not None:
+            return serializer(o)
+        return super().default(o)
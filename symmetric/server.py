@@ -0,0 +1,325 @@
+"""
+A module to hold the preforking server of symmetric, which drains its
+workers before stopping and reloads them without closing its socket.
+"""
+
+import os
+import time
+import errno
+import select
+import signal
+import socket
+import logging
+import threading
+import traceback
+
+import werkzeug.serving
+
+import symmetric.constants
+
+
+logger = logging.getLogger(__name__)
+
+
+class InFlight:
+
+    """
+    Class to encapsulate the amount of connections being served by a
+    worker, so it can wait for them to finish before exiting.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__active = 0
+
+    def enter(self):
+        """Counts a new connection."""
+        with self.__condition:
+            self.__active += 1
+
+    def exit(self):
+        """Uncounts a finished connection."""
+        with self.__condition:
+            self.__active -= 1
+            self.__condition.notify_all()
+
+    def wait(self, timeout):
+        """
+        Waits up to :timeout seconds for every connection to finish.
+        Returns whether or not they finished.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: self.__active == 0, timeout)
+
+
+class Master:  # pylint: disable=R0902,R0903
+
+    """
+    Class to encapsulate the master process of the server. It owns the
+    listening socket and forks the workers, which import the module and
+    serve its requests. On SIGTERM (or SIGINT), the socket gets closed and
+    the workers finish their requests before exiting. On SIGHUP, new
+    workers (with the current code of the module) get forked, and the old
+    ones get drained only after every new worker is ready.
+    """
+
+    def __init__(self, load, host, port, workers=None, drain_timeout=None):
+        self.__load = load
+        self.__host = host
+        self.__port = port
+        self.__amount = (
+            symmetric.constants.DEFAULT_WORKERS
+            if workers is None else workers
+        )
+        self.__drain_timeout = (
+            symmetric.constants.DEFAULT_DRAIN_TIMEOUT
+            if drain_timeout is None else drain_timeout
+        )
+        self.__socket = None
+        self.__workers = []
+        self.__retiring = []
+        self.__signals = []
+
+    def run(self):
+        """
+        Serves the API until the master process receives SIGTERM. Returns
+        the exit code of the server.
+        """
+        self.__socket = socket.socket(
+            werkzeug.serving.select_address_family(self.__host, self.__port),
+            socket.SOCK_STREAM)
+        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__socket.bind((self.__host, self.__port))
+        self.__socket.listen(socket.SOMAXCONN)
+        self.__socket.set_inheritable(True)
+        for signal_number in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signal_number, self.__on_signal)
+
+        self.__workers = self.__spawn()
+        if self.__workers is None:
+            logger.error("[[symmetric]] the workers failed to start.")
+            self.__socket.close()
+            return 1
+        logger.info("[[symmetric]] serving on http://%s:%s/ (master "
+                    "process %s).", self.__host,
+                    self.__socket.getsockname()[1], os.getpid())
+        while True:
+            while self.__signals:
+                if self.__signals.pop(0) == signal.SIGHUP:
+                    self.__reload()
+                else:
+                    self.__stop()
+                    return 0
+            self.__reap()
+            time.sleep(symmetric.constants.SERVER_POLL_INTERVAL)
+
+    def __on_signal(self, signal_number, frame):
+        """Queues :signal_number to be handled by the main loop."""
+        self.__signals.append(signal_number)
+
+    def __spawn(self, amount=None):
+        """
+        Forks :amount workers (every worker by default) and waits for them
+        to be ready. Returns their process ids, or None if any of them
+        failed to start (the ones that started get stopped).
+        """
+        pipes = {}
+        for _ in range(self.__amount if amount is None else amount):
+            ready, notify = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(ready)
+                self.__run_worker(notify)
+            os.close(notify)
+            pipes[ready] = pid
+
+        started = []
+        deadline = time.monotonic() + symmetric.constants.WORKER_BOOT_TIMEOUT
+        while pipes:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                readable, _, _ = select.select(list(pipes), [], [], remaining)
+            except InterruptedError:
+                continue
+            for ready in readable:
+                pid = pipes.pop(ready)
+                notified = os.read(ready, 1)
+                os.close(ready)
+                started.append(pid)
+                if not notified:
+                    # The worker exited before being ready
+                    self.__abort(started, pipes)
+                    return None
+        if pipes:
+            # The boot timed out
+            self.__abort(started, pipes)
+            return None
+        return started
+
+    def __abort(self, started, pipes):
+        """
+        Stops the workers of a failed spawn: the :started ones and the ones
+        of the readiness :pipes that are still open.
+        """
+        workers = started + list(pipes.values())
+        for ready in pipes:
+            os.close(ready)
+        self.__terminate(workers)
+        # They get collected by the main loop
+        self.__retiring.extend(workers)
+
+    def __reload(self):
+        """
+        Forks new workers and, once they are ready, drains the old ones.
+        If the new workers fail to start, the old ones keep serving.
+        """
+        logger.info("[[symmetric]] reloading the workers.")
+        workers = self.__spawn()
+        if workers is None:
+            logger.error("[[symmetric]] the new workers failed to start, "
+                         "the old ones keep serving.")
+            return
+        self.__terminate(self.__workers)
+        self.__retiring.extend(self.__workers)
+        self.__workers = workers
+
+    def __stop(self):
+        """
+        Closes the socket and drains every worker, killing the ones that
+        are still running after the drain timeout.
+        """
+        logger.info("[[symmetric]] draining the workers.")
+        self.__socket.close()
+        workers = self.__workers + self.__retiring
+        self.__terminate(workers)
+        deadline = time.monotonic() + self.__drain_timeout + 1
+        while workers and time.monotonic() < deadline:
+            workers = [x for x in workers if not self.__wait(x)]
+            time.sleep(symmetric.constants.SERVER_POLL_INTERVAL)
+        for pid in workers:
+            logger.error("[[symmetric]] killing worker %s.", pid)
+            self.__send_signal(pid, signal.SIGKILL)
+            self.__wait(pid, blocking=True)
+
+    def __reap(self):
+        """
+        Collects the workers that exited, replacing the ones that exited
+        unexpectedly.
+        """
+        self.__retiring = [x for x in self.__retiring if not self.__wait(x)]
+        for pid in list(self.__workers):
+            if not self.__wait(pid):
+                continue
+            logger.error("[[symmetric]] worker %s exited unexpectedly.", pid)
+            self.__workers.remove(pid)
+            workers = self.__spawn(1)
+            if workers is not None:
+                self.__workers.extend(workers)
+
+    def __terminate(self, workers):
+        """Sends SIGTERM to every worker of :workers."""
+        for pid in workers:
+            self.__send_signal(pid, signal.SIGTERM)
+
+    @staticmethod
+    def __send_signal(pid, signal_number):
+        """Sends :signal_number to the worker :pid (if it still exists)."""
+        try:
+            os.kill(pid, signal_number)
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def __wait(pid, blocking=False):
+        """Returns whether or not the worker :pid already exited."""
+        try:
+            waited, _ = os.waitpid(pid, 0 if blocking else os.WNOHANG)
+        except OSError as err:
+            if err.errno == errno.ECHILD:
+                return True
+            raise
+        return waited == pid
+
+    def __run_worker(self, notify):
+        """
+        Runs a worker (in the forked process): imports the module, starts
+        the API and serves requests until it receives SIGTERM. Then, it waits
+        up to the drain timeout for the requests being served and exits.
+        Never returns.
+        """
+        code = 0
+        try:
+            for signal_number in (signal.SIGINT, signal.SIGHUP):
+                # Only the master handles the signals of the terminal
+                signal.signal(signal_number, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.__signals.clear()
+            symmetric_object = self.__load()
+            if not symmetric_object.startup():
+                raise RuntimeError("The startup of the API failed.")
+            in_flight = InFlight()
+            server = werkzeug.serving.make_server(
+                self.__host, self.__port, symmetric_object, threaded=True,
+                request_handler=get_request_handler(in_flight),
+                fd=self.__socket.fileno())
+            signal.signal(signal.SIGTERM, lambda *args: threading.Thread(
+                target=server.shutdown, daemon=True).start())
+            os.write(notify, b"1")
+            os.close(notify)
+            server.serve_forever()
+            # Stop accepting connections and finish the ones being served
+            server.socket.close()
+            self.__socket.close()
+            if not in_flight.wait(self.__drain_timeout):
+                logger.error("[[symmetric]] worker %s exited with requests "
+                             "in flight.", os.getpid())
+            symmetric_object.shutdown()
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+
+
+class SocketRequestHandler(werkzeug.serving.WSGIRequestHandler):
+    """
+    Request handler that exposes the socket of the connection in the WSGI
+    environment (as the werkzeug.socket key), so the WebSocket routes can
+    take over the connection.
+    """
+
+    def make_environ(self):
+        environ = super().make_environ()
+        environ["werkzeug.socket"] = self.connection
+        return environ
+
+
+def get_request_handler(in_flight):
+    """
+    Returns a request handler class that counts the connections it serves
+    in :in_flight.
+    """
+    class RequestHandler(SocketRequestHandler):
+        """Request handler that counts the connections being served."""
+
+        def handle(self):
+            in_flight.enter()
+            try:
+                super().handle()
+            finally:
+                in_flight.exit()
+
+    return RequestHandler
+
+
+def serve(load, host, port, workers=None, drain_timeout=None):
+    """
+    Serves the symmetric object returned by :load (called in every worker)
+    on :host and :port with :workers preforked workers. Returns the exit
+    code of the server.
+    """
+    return Master(load, host, port, workers, drain_timeout).run()
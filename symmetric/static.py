@@ -0,0 +1,319 @@
+"""
+A module to find the endpoints of a symmetric module without importing it,
+by statically analyzing its source code.
+"""
+
+import os
+import ast
+import sys
+import bisect
+import inspect
+import logging
+
+import symmetric.core
+import symmetric.constants
+import symmetric.endpoints
+import symmetric.errors
+import symmetric.helpers
+import symmetric.options
+import symmetric.resources
+
+
+logger = logging.getLogger(__name__)
+
+
+# Annotations that can be resolved without importing the module
+ANNOTATIONS = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "list": list,
+    "dict": dict,
+    "None": type(None)
+}
+
+
+class StaticSymmetric:
+
+    """
+    Class to encapsulate the endpoints of a module found by statically
+    analyzing its source code. It can be documented just like the
+    symmetric object.
+    """
+
+    def __init__(self, endpoints, client_token_name):
+        self.__endpoints = endpoints
+        self.__client_token_name = client_token_name
+
+    @property
+    def endpoints(self):
+        """Returns a list with the endpoints."""
+        return self.__endpoints
+
+    @property
+    def client_token_name(self):
+        """Return the client token name."""
+        return self.__client_token_name
+
+    def generate_markdown_documentation(self, module_name, cache=None):
+        """
+        Gets the documentation of every endpoint and assembles it into a
+        markdown formatted string, reusing the fragments of :cache (if
+        given) for the endpoints that did not change.
+        """
+        return symmetric.helpers.get_markdown_documentation(
+            self, module_name, cache)
+
+
+def get_static_symmetric_object(module_name):
+    """
+    Finds the source file of the module :module_name and parses it to find
+    every function decorated with the router of the symmetric object,
+    without executing the module. Returns a StaticSymmetric object.
+    """
+    filename = find_module_source(module_name)
+    with open(filename, encoding="utf-8") as source_file:
+        tree = ast.parse(source_file.read(), filename)
+    return parse_module(tree, module_name)
+
+
+def find_module_source(module_name):
+    """
+    Returns the path of the source file of the module :module_name,
+    searching in the current directory and in the python path.
+    """
+    if module_name.endswith(".py") and os.path.isfile(module_name):
+        # The user wrote module.py instead of just module
+        raise ImportError(f"Module {module_name} not found. "
+                          f"Did you mean {module_name[:-3]}?")
+    parts = module_name.split(".")
+    for directory in [".", *sys.path]:
+        base = os.path.join(directory, *parts)
+        for candidate in (f"{base}.py", os.path.join(base, "__init__.py")):
+            if os.path.isfile(candidate):
+                return candidate
+    raise ImportError(f"Module {module_name} not found.")
+
+
+def parse_module(tree, module_name):
+    """
+    Given the syntax tree of the module :module_name, returns a
+    StaticSymmetric object with its endpoints.
+    """
+    names = get_symmetric_names(tree)
+    if not names:
+        error = f"Failed to find the symmetric object in {module_name}."
+        raise symmetric.errors.AppImportError(error)
+    endpoints = []
+    routes = set()
+    client_token_name = symmetric.constants.API_CLIENT_TOKEN_NAME
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for decorator in node.decorator_list:
+                if not is_symmetric_call(decorator, names, "router"):
+                    continue
+                endpoint = get_endpoint(node, decorator, module_name)
+                if endpoint.route in routes:
+                    message = (f"Endpoint '{endpoint.route}' was "
+                               "defined twice.")
+                    raise symmetric.errors.DuplicatedRouteError(message)
+                routes.add(endpoint.route)
+                bisect.insort(endpoints, endpoint)
+        elif is_symmetric_call(node, names, "set_client_token_name"):
+            if node.args:
+                client_token_name = get_literal(
+                    node.args[0], client_token_name)
+    return StaticSymmetric(endpoints, client_token_name)
+
+
+def get_symmetric_names(tree):
+    """
+    Returns the set of names bound to the symmetric object in the module
+    (for example, 'symmetric' for 'from symmetric import symmetric').
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == "symmetric":
+            for alias in node.names:
+                if alias.name == "symmetric":
+                    names.add(alias.asname if alias.asname else alias.name)
+    return names
+
+
+def is_symmetric_call(node, names, method):
+    """
+    Checks if :node is a call to the :method method of the symmetric
+    object (bound to any of :names).
+    """
+    if not isinstance(node, ast.Call):
+        return False
+    if not isinstance(node.func, ast.Attribute) or node.func.attr != method:
+        return False
+    owner = node.func.value
+    return isinstance(owner, ast.Name) and owner.id in names
+
+
+def get_literal(node, default=None):
+    """
+    Returns the value of the literal expression :node, or :default if the
+    expression can't be evaluated without executing the module.
+    """
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        line = getattr(node, "lineno", "?")
+        logger.warning(
+            "[[symmetric]] the expression in line %s can't be evaluated "
+            "statically, using its default value.", line
+        )
+        return default
+
+
+def get_string(node):
+    """Returns the value of :node if it is a string literal (or None)."""
+    if sys.version_info < (3, 8):
+        # Older versions parse the string literals into ast.Str nodes
+        return node.s if isinstance(node, ast.Str) else None
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def get_annotation(node):
+    """Resolves the annotation :node into a type (or object if unknown)."""
+    if isinstance(node, ast.Name):
+        return ANNOTATIONS.get(node.id, object)
+    string = get_string(node)
+    if string is not None:
+        # String annotation
+        return ANNOTATIONS.get(string, object)
+    if is_none(node):
+        return type(None)
+    return object
+
+
+def is_none(node):
+    """Checks if :node is the None literal."""
+    try:
+        return ast.literal_eval(node) is None
+    except ValueError:
+        return False
+
+
+def get_router_arguments(decorator):
+    """
+    Given the router :decorator, returns a dictionary that maps the names
+    of its arguments to their expressions and a dictionary with the
+    default value of every argument of the router.
+    """
+    router_parameters = inspect.signature(
+        symmetric.core.symmetric_object.router).parameters
+    positional = [
+        name for name, parameter in router_parameters.items()
+        if parameter.kind == parameter.POSITIONAL_OR_KEYWORD
+    ]
+    arguments = dict(zip(positional, decorator.args))
+    for keyword in decorator.keywords:
+        if keyword.arg is not None:
+            arguments[keyword.arg] = keyword.value
+    defaults = dict(symmetric.options.DEFAULTS)
+    defaults.update(
+        (name, router_parameters[name].default) for name in positional)
+    return arguments, defaults
+
+
+def get_endpoint(node, decorator, module_name):
+    """
+    Given the function definition :node and its router :decorator, returns
+    the Endpoint object that the router would create.
+    """
+    options, defaults = get_router_arguments(decorator)
+    if "route" not in options:
+        error = f"The router of '{node.name}' does not include a route."
+        raise symmetric.errors.IncorrectRouteFormatError(error)
+    route = get_literal(options.pop("route"))
+    if not isinstance(route, str):
+        error = f"The route of '{node.name}' can't be evaluated statically."
+        raise symmetric.errors.IncorrectRouteFormatError(error)
+    symmetric.helpers.parse_route(route)
+
+    # The time of the last modification can't be evaluated, but any
+    # function enables the conditional requests
+    last_modified = options.pop("last_modified", None)
+    # The resources can't be evaluated, but their parameters get hidden
+    resources = options.pop("resources", None)
+    function = get_stub_function(node, module_name)
+    if isinstance(resources, ast.Dict):
+        function.__signature__ = symmetric.resources.get_signature(
+            function, [get_literal(key) for key in resources.keys])
+
+    # Only keep the options that define the endpoint
+    values = {
+        name: get_literal(value, defaults[name])
+        for name, value in options.items()
+        if name in defaults
+    }
+    methods = symmetric.helpers.get_methods(
+        values.pop("methods", defaults["methods"]))
+    response_code = values.pop("response_code", defaults["response_code"])
+    auth_token = values.pop("auth_token", defaults["auth_token"])
+    if last_modified is not None and not is_none(last_modified):
+        values["last_modified"] = get_stub_last_modified
+    return symmetric.endpoints.create_endpoint(
+        route,
+        methods,
+        response_code,
+        function,
+        None,
+        auth_token,
+        symmetric.options.get_options(values)
+    )
+
+
+def get_stub_last_modified():
+    """Stands for the last_modified function of the endpoints found."""
+
+
+def get_stub_function(node, module_name):
+    """
+    Given the function definition :node, creates a function with the same
+    signature, defaults, annotations and docstring but with an empty body.
+    """
+    arguments = node.args
+    positional = getattr(arguments, "posonlyargs", []) + arguments.args
+    signature = [x.arg for x in positional]
+    if arguments.vararg is not None:
+        signature.append(f"*{arguments.vararg.arg}")
+    elif arguments.kwonlyargs:
+        signature.append("*")
+    signature.extend(x.arg for x in arguments.kwonlyargs)
+    if arguments.kwarg is not None:
+        signature.append(f"**{arguments.kwarg.arg}")
+
+    namespace = {}
+    # Only the empty signature gets executed, never the module code
+    # pylint: disable=W0122
+    exec(f"def {node.name}({', '.join(signature)}):\n    pass\n", namespace)
+    function = namespace[node.name]
+
+    defaults = tuple(get_literal(x) for x in arguments.defaults)
+    function.__defaults__ = defaults if defaults else None
+    kwdefaults = {
+        argument.arg: get_literal(default)
+        for argument, default in zip(
+            arguments.kwonlyargs, arguments.kw_defaults)
+        if default is not None
+    }
+    function.__kwdefaults__ = kwdefaults if kwdefaults else None
+    annotations = {
+        argument.arg: get_annotation(argument.annotation)
+        for argument in positional + arguments.kwonlyargs
+        if argument.annotation is not None
+    }
+    if node.returns is not None:
+        annotations["return"] = get_annotation(node.returns)
+    function.__annotations__ = annotations
+    function.__doc__ = ast.get_docstring(node)
+    function.__module__ = module_name
+    return function
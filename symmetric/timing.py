@@ -0,0 +1,44 @@
+"""
+A module to hold the request timing utilities of symmetric.
+"""
+
+import time
+import contextlib
+
+
+class PhaseTimer:
+
+    """
+    Class to encapsulate the timing of the phases of a request, using a
+    monotonic clock.
+    """
+
+    def __init__(self):
+        self.__start = time.perf_counter()
+        self.__phases = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Times the code executed inside the context as the phase :name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__phases.append(
+                (name, (time.perf_counter() - start) * 1000))
+
+    def total(self):
+        """Returns the milliseconds elapsed since the timer was created."""
+        return (time.perf_counter() - self.__start) * 1000
+
+    def header(self):
+        """Returns the value of the Server-Timing header of the request."""
+        metrics = [f"{name};dur={duration:.3f}"
+                   for name, duration in self.__phases]
+        metrics.append(f"total;dur={self.total():.3f}")
+        return ", ".join(metrics)
+
+    def describe(self):
+        """Returns a human readable breakdown of the phases."""
+        return ", ".join(f"{name} {duration:.3f} ms"
+                         for name, duration in self.__phases)
@@ -0,0 +1,145 @@
+"""
+A module to hold the parameter validation utilities of symmetric.
+"""
+
+import inspect
+
+import symmetric.errors
+
+
+def _is_exactly(type_obj):
+    """Returns a checker for values of exactly the type :type_obj."""
+    # Subclasses are not allowed (booleans are not integers in JSON)
+    return lambda value: type(value) is type_obj  # pylint: disable=C0123
+
+
+def _is_number(value):
+    """Checks if :value is a JSON number (booleans are not numbers)."""
+    return type(value) in (int, float)
+
+
+CHECKERS = {
+    str: _is_exactly(str),
+    int: _is_exactly(int),
+    float: _is_number,
+    bool: _is_exactly(bool),
+    list: _is_exactly(list),
+    dict: _is_exactly(dict),
+    type(None): lambda value: value is None
+}
+
+
+def _to_bool(value):
+    """Coerces a string into a boolean."""
+    if value.lower() in ("true", "1", "yes", "on"):
+        return True
+    if value.lower() in ("false", "0", "no", "off"):
+        return False
+    raise ValueError(f"invalid boolean: '{value}'")
+
+
+def _to_int(value):
+    """Coerces a string or an integral float into an integer."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"invalid integer: {value}")
+        return int(value)
+    return int(value)
+
+
+COERCERS = {
+    str: {
+        int: str,
+        float: str
+    },
+    int: {
+        str: _to_int,
+        float: _to_int
+    },
+    float: {
+        str: float
+    },
+    bool: {
+        str: _to_bool
+    },
+    list: {
+        str: lambda value: [value]
+    }
+}
+
+
+def _compile_field(name, type_obj):
+    """
+    Returns a function that recieves the value of the field :name and a
+    boolean and returns the value (coerced to :type_obj if the boolean is
+    True), or None if the annotation can't be validated.
+    """
+    try:
+        checker = CHECKERS.get(type_obj)
+    except TypeError:
+        # Unhashable annotations can't be one of the JSON types
+        return None
+    if checker is None:
+        # Only the JSON types can be validated
+        return None
+    coercers = COERCERS.get(type_obj, {})
+    expected = type_obj.__name__
+
+    def validate_field(value, coerce):
+        if checker(value):
+            return value
+        coercer = coercers.get(type(value)) if coerce else None
+        if coercer is not None:
+            try:
+                return coercer(value)
+            except ValueError:
+                pass
+        message = f"Expected a value of type '{expected}'."
+        raise symmetric.errors.ValidationError(
+            message, [{"field": name, "message": message}])
+
+    return validate_field
+
+
+def compile_validator(function, coerce=False):
+    """
+    Given a function, inspects its arguments, defaults and annotations
+    once and returns a validator. The validator recieves the filtered
+    parameters of a request and returns them (coerced to the annotated
+    types if :coerce is True), raising ValidationError with every
+    missing or invalid field. The coercion can be forced for a single
+    call using the coerce argument of the validator (used for parameters
+    that come from a query string).
+    """
+    params = inspect.getfullargspec(function)
+    defaults_amount = 0 if not params.defaults else len(params.defaults)
+    required = params.args[:len(params.args) - defaults_amount]
+    fields = {}
+    for name in params.args:
+        if name in params.annotations:
+            field = _compile_field(name, params.annotations[name])
+            if field is not None:
+                fields[name] = field
+
+    default_coerce = coerce
+
+    def validator(parameters, coerce=None):
+        if coerce is None:
+            coerce = default_coerce
+        errors = [
+            {"field": name, "message": "This field is required."}
+            for name in required if name not in parameters
+        ]
+        for name, field in fields.items():
+            if name not in parameters:
+                continue
+            try:
+                parameters[name] = field(parameters[name], coerce)
+            except symmetric.errors.ValidationError as err:
+                errors.extend(err.errors)
+        if errors:
+            message = "The request parameters are not valid."
+            raise symmetric.errors.ValidationError(message, errors)
+        return parameters
+
+    return validator
@@ -1,3 +1,11 @@
 """
 Init file for the symmetric tests module.
 """
+
+import os
+import tempfile
+
+
+# The logs of the tests don't get written into the repository
+os.environ.setdefault(
+    "LOG_FILE", os.path.join(tempfile.gettempdir(), "symmetric-tests.log"))
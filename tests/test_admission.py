@@ -0,0 +1,149 @@
+"""
+A module to test the admission control of symmetric.
+"""
+
+import threading
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.errors
+import symmetric.admission
+
+
+symmetric_object = symmetric.core.symmetric_object
+started = threading.Event()
+release = threading.Event()
+
+
+@symmetric_object.router("/admission/slow", max_concurrency=1, max_queued=0)
+def slow():
+    """Waits until the test releases it."""
+    started.set()
+    release.wait(5)
+    return {}
+
+
+@symmetric_object.router("/admission/limited", rate_limit=0.1,
+                         rate_limit_burst=1)
+def limited():
+    """Accepts a request every ten seconds."""
+    return {}
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    """Tests the TokenBucket rate limiter."""
+    def setUp(self):
+        self.bucket = symmetric.admission.TokenBucket(rate=1, burst=2)
+
+    def test_burst_is_allowed(self):
+        """Tests that the bucket starts full."""
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.assertEqual(self.bucket.acquire(), 0)
+
+    def test_empty_bucket(self):
+        """Tests that an empty bucket returns the time to wait."""
+        self.bucket.acquire()
+        self.bucket.acquire()
+        wait = self.bucket.acquire()
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 1)
+
+
+class AdmissionControllerTestCase(unittest.TestCase):
+    """Tests the AdmissionController class."""
+    def test_no_limits(self):
+        """Tests that no controller gets created without limits."""
+        self.assertIsNone(
+            symmetric.admission.get_admission_controller(
+                None, None, None, None))
+
+    def test_full_queue(self):
+        """
+        Tests that a ServerOverloadedError error is raised when there are
+        no free execution slots and the queue is full.
+        """
+        controller = symmetric.admission.AdmissionController(
+            max_concurrency=1, max_queued=0)
+        with controller:
+            with self.assertRaises(symmetric.errors.ServerOverloadedError):
+                controller.enter()
+        self.assertEqual(controller.stats()["overloaded"], 1)
+        self.assertEqual(controller.stats()["active"], 0)
+
+    def test_rate_limit(self):
+        """
+        Tests that a RateLimitExceededError error is raised when the rate
+        limit gets exceeded.
+        """
+        controller = symmetric.admission.AdmissionController(rate_limit=1)
+        with controller:
+            pass
+        with self.assertRaises(symmetric.errors.RateLimitExceededError):
+            controller.enter()
+        self.assertEqual(controller.stats()["rate_limited"], 1)
+
+    def test_default_queue(self):
+        """Tests that the waiting queue is bounded by default."""
+        controller = symmetric.admission.AdmissionController(
+            max_concurrency=1)
+        self.assertTrue(controller.limits_concurrency)
+
+    def test_invalid_limits(self):
+        """Tests that the invalid limits get rejected."""
+        invalid = [
+            (0, None, None, None),
+            (1.5, None, None, None),
+            (1, -1, None, None),
+            (None, None, 0, None),
+            (None, None, -1, None),
+            (None, None, float("inf"), None),
+            (None, None, float("nan"), None),
+            (None, None, 1, 0),
+            (None, 8, None, None),
+            (None, None, None, 2)
+        ]
+        for limits in invalid:
+            with self.subTest(limits=limits):
+                with self.assertRaises(
+                        symmetric.errors.AdmissionConfigurationError):
+                    symmetric.admission.get_admission_controller(*limits)
+
+
+class AdmissionResponsesTestCase(unittest.TestCase):
+    """Tests the responses of the endpoints that reject requests."""
+    def setUp(self):
+        self.client = werkzeug.test.Client(
+            symmetric_object, werkzeug.wrappers.BaseResponse)
+
+    def post(self, route):
+        """Sends an empty JSON body to :route."""
+        return self.client.post(
+            route, data="{}", content_type="application/json")
+
+    def test_overloaded(self):
+        """Tests the 503 response when every slot is taken."""
+        started.clear()
+        release.clear()
+        responses = []
+        thread = threading.Thread(
+            target=lambda: responses.append(self.post("/admission/slow")))
+        thread.start()
+        self.assertTrue(started.wait(5))
+        try:
+            response = self.post("/admission/slow")
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertEqual(responses[0].status_code, 200)
+
+    def test_rate_limited(self):
+        """Tests the 429 response when the rate limit is exceeded."""
+        self.assertEqual(self.post("/admission/limited").status_code, 200)
+        response = self.post("/admission/limited")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "10")
@@ -0,0 +1,141 @@
+"""
+A module to test the request batching of symmetric.
+"""
+
+import os
+import time
+import select
+import signal
+import threading
+import unittest
+
+import symmetric.errors
+import symmetric.batching
+
+
+def double(x):
+    """Doubles every element of :x."""
+    return [element * 2 for element in x]
+
+
+def submit_concurrently(batcher, bodies, deadline=None):
+    """
+    Submits each one of :bodies to :batcher from its own thread and returns
+    the results (or the exceptions) in the same order.
+    """
+    results = [None] * len(bodies)
+
+    def submit(index):
+        try:
+            results[index] = batcher.submit(bodies[index], deadline)
+        except Exception as err:
+            results[index] = err
+
+    threads = [
+        threading.Thread(target=submit, args=(index,))
+        for index in range(len(bodies))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class BatcherTestCase(unittest.TestCase):
+    """Tests the Batcher class."""
+    def test_max_size_flush(self):
+        """Tests that a full batch gets executed without waiting."""
+        batcher = symmetric.batching.Batcher(
+            double, max_batch_size=3, max_wait_ms=10000)
+        start = time.monotonic()
+        results = submit_concurrently(batcher, [{"x": 1}, {"x": 2}, {"x": 3}])
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(sorted(results), [2, 4, 6])
+        self.assertEqual(batcher.stats(), {
+            "batches": 1,
+            "requests": 3,
+            "pending": 0
+        })
+
+    def test_max_wait_flush(self):
+        """Tests that an incomplete batch gets executed after waiting."""
+        batcher = symmetric.batching.Batcher(
+            double, max_batch_size=100, max_wait_ms=50)
+        start = time.monotonic()
+        self.assertEqual(batcher.submit({"x": 1}), 2)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(batcher.stats()["requests"], 1)
+
+    def test_results_reach_their_callers(self):
+        """Tests that each request gets the result of its parameters."""
+        batcher = symmetric.batching.Batcher(
+            double, max_batch_size=4, max_wait_ms=20)
+        bodies = [{"x": number} for number in range(10)]
+        results = submit_concurrently(batcher, bodies)
+        self.assertEqual(results, [number * 2 for number in range(10)])
+        self.assertLess(batcher.stats()["batches"], 10)
+
+    def test_defaults(self):
+        """Tests that the missing parameters get their default values."""
+        batcher = symmetric.batching.Batcher(
+            lambda x, y=10: [a + b for a, b in zip(x, y)], max_wait_ms=20)
+        results = submit_concurrently(batcher, [{"x": 1}, {"x": 1, "y": 2}])
+        self.assertEqual(results, [11, 3])
+
+    def test_exception(self):
+        """Tests that an exception reaches every request of the batch."""
+        def fail(x):
+            raise ZeroDivisionError()
+        batcher = symmetric.batching.Batcher(
+            fail, max_batch_size=2, max_wait_ms=100)
+        results = submit_concurrently(batcher, [{"x": 1}, {"x": 2}])
+        for result in results:
+            self.assertIsInstance(result, ZeroDivisionError)
+        # The worker keeps serving batches after a failure
+        with self.assertRaises(ZeroDivisionError):
+            batcher.submit({"x": 1})
+
+    def test_size_mismatch(self):
+        """Tests that a batch with the wrong amount of results fails."""
+        batcher = symmetric.batching.Batcher(
+            lambda x: [], max_batch_size=2, max_wait_ms=10000)
+        results = submit_concurrently(batcher, [{"x": 1}, {"x": 2}])
+        for result in results:
+            self.assertIsInstance(
+                result, symmetric.errors.BatchSizeMismatchError)
+
+    def test_deadline(self):
+        """Tests that a request can't wait for its batch past its deadline."""
+        batcher = symmetric.batching.Batcher(
+            double, max_batch_size=2, max_wait_ms=10000)
+        with self.assertRaises(symmetric.errors.DeadlineExceededError):
+            batcher.submit({"x": 1}, time.monotonic() + 0.05)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Forking requires os.fork.")
+    def test_fork(self):
+        """
+        Tests that a forked process starts its own worker, even if the
+        worker of the parent process had already started.
+        """
+        batcher = symmetric.batching.Batcher(double, max_wait_ms=10)
+        self.assertEqual(batcher.submit({"x": 1}), 2)
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            os.write(write, str(batcher.submit({"x": 2})).encode())
+            os._exit(0)
+        os.close(write)
+        try:
+            ready, _, _ = select.select([read], [], [], 5)
+            self.assertTrue(ready)
+            self.assertEqual(os.read(read, 64), b"4")
+        finally:
+            os.close(read)
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
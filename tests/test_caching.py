@@ -0,0 +1,102 @@
+"""
+A module to test the HTTP caching of the GET endpoints of symmetric.
+"""
+
+import json
+import datetime
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.errors
+import symmetric.caching
+
+
+symmetric_object = symmetric.core.symmetric_object
+client = werkzeug.test.Client(
+    symmetric_object, werkzeug.wrappers.BaseResponse)
+state = {
+    "value": 1,
+    "changed_at": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+}
+
+
+@symmetric_object.router("/caching/square", methods=["get"],
+                         cache_control="public, max-age=300", etag=True)
+def cached_square(x: int):
+    """Squares :x."""
+    return x * x
+
+
+@symmetric_object.router("/caching/value", methods=["get"],
+                         last_modified=lambda: state["changed_at"])
+def cached_value():
+    """Returns a value that changes over time."""
+    return state["value"]
+
+
+class HTTPCachingTestCase(unittest.TestCase):
+    """Tests the cache headers and the conditional requests."""
+    def test_cache_control(self):
+        """Tests that the successful GET responses get the header."""
+        response = client.get("/caching/square?x=3")
+        self.assertEqual(json.loads(response.data), 9)
+        self.assertEqual(
+            response.headers["Cache-Control"], "public, max-age=300")
+        response = client.get("/caching/square?x=a")
+        self.assertEqual(response.status_code, 422)
+        self.assertNotIn("Cache-Control", response.headers)
+
+    def test_etag(self):
+        """Tests the 304 response to a request with a matching ETag."""
+        response = client.get("/caching/square?x=3")
+        etag = response.headers["ETag"]
+        response = client.get(
+            "/caching/square?x=3", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        response = client.get(
+            "/caching/square?x=3", headers={"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_of_query_string(self):
+        """Tests that each query string gets the ETag of its response."""
+        first = client.get("/caching/square?x=2").headers["ETag"]
+        second = client.get("/caching/square?x=3").headers["ETag"]
+        self.assertNotEqual(first, second)
+        response = client.get(
+            "/caching/square?x=3", headers={"If-None-Match": first})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), 9)
+
+    def test_last_modified(self):
+        """
+        Tests that the Last-Modified header follows the time returned by
+        the endpoint, so changed responses don't get a 304 response.
+        """
+        response = client.get("/caching/value")
+        last_modified = response.headers["Last-Modified"]
+        self.assertEqual(last_modified, "Wed, 01 Jan 2020 00:00:00 GMT")
+        response = client.get(
+            "/caching/value", headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 304)
+        state["value"] = 2
+        state["changed_at"] = datetime.datetime(
+            2021, 1, 1, tzinfo=datetime.timezone.utc)
+        response = client.get(
+            "/caching/value", headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), 2)
+
+    def test_configuration(self):
+        """Tests that the last modification time must be a function."""
+        self.assertIsNone(
+            symmetric.caching.get_cache_policy(None, False, None))
+        with self.assertRaises(symmetric.errors.CacheConfigurationError):
+            symmetric.caching.get_cache_policy(None, False, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+A module to test the in-process calls to the endpoints of symmetric.
+"""
+
+import os
+import json
+import tempfile
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.errors
+
+
+symmetric_object = symmetric.core.symmetric_object
+client = werkzeug.test.Client(
+    symmetric_object, werkzeug.wrappers.BaseResponse)
+cached_calls = []
+
+
+class Point:  # pylint: disable=R0903
+    """Object that can't be serialized to JSON."""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@symmetric_object.router("/call/point", auth_token=True)
+def point(x: int, y: int = 0):
+    """Returns a point."""
+    return Point(x, y)
+
+
+@symmetric_object.router("/call/job", background=True)
+def job(seconds: float = 0):
+    """Runs in the background."""
+    return seconds
+
+
+@symmetric_object.router(
+    "/call/cached",
+    persistent_cache=os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+def cached_pair(x: int):
+    """Returns a tuple, which gets serialized as a list."""
+    cached_calls.append(x)
+    return (x, x)
+
+
+class CallTestCase(unittest.TestCase):
+    """Tests the endpoints called without HTTP."""
+    def test_result(self):
+        """Tests that the result gets returned without serializing it."""
+        body = {"x": 1, "symmetric_api_key": "symmetric_token"}
+        result = symmetric_object.call(
+            "/call/point", body,
+            headers={"Symmetric_API_Key": "symmetric_token"})
+        self.assertIsInstance(result, Point)
+        self.assertEqual((result.x, result.y), (1, 0))
+        # The body of the caller does not change
+        self.assertIn("symmetric_api_key", body)
+
+    def test_errors(self):
+        """Tests that the errors get raised."""
+        with self.assertRaises(symmetric.errors.AuthenticationRequiredError):
+            symmetric_object.call("/call/point", {"x": 1})
+        with self.assertRaises(symmetric.errors.ValidationError):
+            symmetric_object.call(
+                "/call/point", {"x": "a"},
+                headers={"symmetric_api_key": "symmetric_token"})
+        with self.assertRaises(symmetric.errors.EndpointNotFoundError):
+            symmetric_object.call("/call/missing")
+
+    def test_background(self):
+        """Tests that the background endpoints return their job."""
+        result = symmetric_object.call("/call/job")
+        self.assertEqual(result["route"], "/call/job")
+        self.assertIn("location", result)
+
+    def test_persistent_cache(self):
+        """
+        Tests that the calls to the endpoints with a persistent cache use
+        the cache and return the deserialized result stored in it.
+        """
+        endpoint = next(x for x in symmetric_object.endpoints
+                        if x.route == "/call/cached")
+        self.assertEqual(symmetric_object.call("/call/cached", {"x": 1}),
+                         [1, 1])
+        self.assertEqual(symmetric_object.call("/call/cached", {"x": 1}),
+                         [1, 1])
+        self.assertEqual(cached_calls, [1])
+        self.assertEqual(endpoint.persistent_cache.stats(),
+                         {"hits": 1, "misses": 1})
+        # The requests share the results of the calls
+        response = client.post(
+            "/call/cached", data='{"x": 1}', content_type="application/json")
+        self.assertEqual(json.loads(response.data), [1, 1])
+        self.assertEqual(cached_calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
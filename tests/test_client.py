@@ -0,0 +1,232 @@
+"""
+A module to test the generated python clients of symmetric.
+"""
+
+import ast
+import time
+import types
+import socket
+import asyncio
+import threading
+import unittest
+
+import werkzeug.serving
+
+import symmetric.client
+import symmetric.static
+
+
+SOURCE = '''
+from symmetric import symmetric
+
+@symmetric.router("/sum", auth_token=True)
+def add(a: int, b: float = 1.5, **kwargs) -> float:
+    """Adds "two" numbers."""
+    return a + b + len(kwargs)
+
+@symmetric.router("/echo", methods=["get"])
+def map(text: str, timeout: int = 3):
+    return {"text": text, "timeout": timeout}
+'''
+
+
+def create_server(app):
+    """Serves :app in a new thread. Returns the server."""
+    class RequestHandler(werkzeug.serving.WSGIRequestHandler):
+        """Handler that keeps the connections alive."""
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = werkzeug.serving.make_server(
+        "127.0.0.1", 0, app, threaded=True,
+        request_handler=RequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def application(environ, start_response):
+    """Echoes the request, like the API of SOURCE would respond."""
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(length) if length else b""
+    if environ["PATH_INFO"] == "/sum" and (
+            environ.get("HTTP_SYMMETRIC_API_KEY") is None):
+        status, body = "401 UNAUTHORIZED", b"{}"
+    else:
+        body = b'{"path": "%s", "query": "%s", "port": %s, "body": %s}' % (
+            environ["PATH_INFO"].encode(), environ["QUERY_STRING"].encode(),
+            str(environ["REMOTE_PORT"]).encode(), body or b"null")
+        status = "200 OK"
+    start_response(status, [("Content-Type", "application/json"),
+                            ("Content-Length", str(len(body)))])
+    return [body]
+
+
+class ScriptedServer:
+    """
+    Server that handles each request as its :script says: "respond" sends a
+    keep-alive response, "close" also closes the connection afterwards and
+    "drop" closes the connection without responding. Counts the requests.
+    """
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = 0
+        self.socket = socket.socket()
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.listen()
+        self.url = f"http://127.0.0.1:{self.socket.getsockname()[1]}"
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        """Accepts the connections and handles their requests."""
+        while True:
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self.handle, args=(connection,), daemon=True).start()
+
+    def handle(self, connection):
+        """Handles the requests of :connection."""
+        with connection:
+            reader = connection.makefile("rb")
+            while True:
+                lines = []
+                while not lines or lines[-1] != b"\r\n":
+                    line = reader.readline()
+                    if not line:
+                        return
+                    lines.append(line)
+                length = 0
+                for line in lines:
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                reader.read(length)
+                self.requests += 1
+                action = self.script.pop(0) if self.script else "respond"
+                if action == "drop":
+                    return
+                connection.sendall(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json"
+                    b"\r\nContent-Length: 2\r\n\r\n{}")
+                if action == "close":
+                    return
+
+    def close(self):
+        """Stops accepting connections."""
+        self.socket.close()
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    """Tests the reuse of the connections of the client."""
+    def setUp(self):
+        symmetric_object = symmetric.static.parse_module(
+            ast.parse(SOURCE), "my_api")
+        self.module = types.ModuleType("my_api_client")
+        source = symmetric.client.get_client_source(
+            symmetric_object, "my_api")
+        # pylint: disable=W0122
+        exec(compile(source, "my_api_client.py", "exec"),
+             self.module.__dict__)
+
+    def request_twice(self, script, method):
+        """
+        Sends two requests with :method to a server that follows :script,
+        using the same pool. Returns the server and the second response
+        (or its exception).
+        """
+        server = ScriptedServer(script)
+        self.addCleanup(server.close)
+        pool = self.module.ConnectionPool(server.url, timeout=5)
+        self.addCleanup(pool.close)
+        self.assertEqual(pool.request(method, "/"), (200, b"{}"))
+        # Let the closed connection reach the client
+        time.sleep(0.05)
+        try:
+            return server, pool.request(method, "/", body=b"{}")
+        except Exception as err:
+            return server, err
+
+    def test_closed_idle_connection(self):
+        """Tests that a closed idle connection gets replaced."""
+        server, response = self.request_twice(["close"], "POST")
+        self.assertEqual(response, (200, b"{}"))
+        self.assertEqual(server.requests, 2)
+
+    def test_no_retries_of_post_requests(self):
+        """Tests that the requests that could have been sent don't repeat."""
+        server, response = self.request_twice(["respond", "drop"], "POST")
+        self.assertIsInstance(response, ConnectionError)
+        self.assertEqual(server.requests, 2)
+
+    def test_retries_of_idempotent_requests(self):
+        """Tests that the idempotent requests get retried."""
+        server, response = self.request_twice(["respond", "drop"], "GET")
+        self.assertEqual(response, (200, b"{}"))
+        self.assertEqual(server.requests, 3)
+
+
+class ClientTestCase(unittest.TestCase):
+    """Tests the client generated for a module."""
+    def setUp(self):
+        symmetric_object = symmetric.static.parse_module(
+            ast.parse(SOURCE), "my_api")
+        source = symmetric.client.get_client_source(
+            symmetric_object, "my_api")
+        self.module = types.ModuleType("my_api_client")
+        # pylint: disable=W0122
+        exec(compile(source, "my_api_client.py", "exec"),
+             self.module.__dict__)
+        self.server = create_server(application)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def test_method_names(self):
+        """Tests that the names of the methods don't clash."""
+        self.assertTrue(hasattr(self.module.MyApiClient, "add"))
+        self.assertTrue(hasattr(self.module.MyApiClient, "echo"))
+        self.assertNotEqual(
+            self.module.MyApiClient.map, self.module.MyApiClient.echo)
+
+    def test_call(self):
+        """Tests the requests sent by the synchronous client."""
+        with self.module.MyApiClient(self.url, token="secret") as client:
+            first = client.add(1, c=2)
+            self.assertEqual(first["path"], "/sum")
+            self.assertEqual(first["body"], {"a": 1, "b": 1.5, "c": 2})
+            second = client.echo("hi", timeout_=5)
+            self.assertEqual(second["query"], "text=hi&timeout=3")
+            # The connection was kept alive
+            self.assertEqual(first["port"], second["port"])
+            results = client.map(client.add, [{"a": x} for x in range(20)])
+            self.assertEqual(
+                [x["body"]["a"] for x in results], list(range(20)))
+
+    def test_error(self):
+        """Tests that the error responses raise APIError."""
+        with self.module.MyApiClient(self.url) as client:
+            with self.assertRaises(self.module.APIError) as context:
+                client.add(1)
+            self.assertEqual(context.exception.status, 401)
+
+    def test_async_call(self):
+        """Tests the concurrent calls of the asynchronous client."""
+        async def run():
+            async with self.module.AsyncMyApiClient(
+                    self.url, token="secret") as client:
+                return await client.map(
+                    client.add, [{"a": x} for x in range(20)])
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual([x["body"]["a"] for x in results], list(range(20)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+A module to test the deadline supervision of symmetric.
+"""
+
+import time
+import threading
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.errors
+import symmetric.deadlines
+import symmetric.constants
+import symmetric.openapi.utils
+
+
+symmetric_object = symmetric.core.symmetric_object
+client = werkzeug.test.Client(
+    symmetric_object, werkzeug.wrappers.BaseResponse)
+
+
+@symmetric_object.router("/deadlines/supervised", methods=["get"], timeout=5)
+def supervised():
+    """Returns a constant."""
+    return {"value": 1}
+
+
+@symmetric_object.router("/deadlines/unsupervised")
+def unsupervised():
+    """Returns a constant."""
+    return {"value": 1}
+
+
+class SupervisorTestCase(unittest.TestCase):
+    """Tests the Supervisor class."""
+    def setUp(self):
+        self.supervisor = symmetric.deadlines.Supervisor(
+            timeout=0.05, max_abandoned=1)
+        self.function = lambda t: time.sleep(t) or t
+
+    def test_client_can_only_shorten_timeout(self):
+        """Tests that the client deadline header can't extend the timeout."""
+        header = symmetric.constants.DEADLINE_HEADER_NAME
+        now = time.monotonic()
+        longer = self.supervisor.get_deadline({header: "10"})
+        shorter = self.supervisor.get_deadline({header: "0.01"})
+        self.assertLess(longer - now, 1)
+        self.assertLess(shorter, longer)
+
+    def test_invalid_client_timeout(self):
+        """Tests that only positive and finite client timeouts are valid."""
+        header = symmetric.constants.DEADLINE_HEADER_NAME
+        for value in ("nan", "inf", "-inf", "-1", "0", "soon"):
+            with self.subTest(value=value):
+                with self.assertRaises(symmetric.errors.InvalidDeadlineError):
+                    self.supervisor.get_deadline({header: value})
+
+    def test_invalid_client_timeout_response(self):
+        """Tests that an invalid client timeout gets a 400 response."""
+        header = symmetric.constants.DEADLINE_HEADER_NAME
+        response = client.get(
+            "/deadlines/supervised", headers={header: "nan"})
+        self.assertEqual(response.status_code, 400)
+        response = client.get(
+            "/deadlines/supervised", headers={header: "2"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_threads_are_reused(self):
+        """Tests that the supervised calls reuse the shared threads."""
+        threads = set()
+        for _ in range(10):
+            deadline = self.supervisor.get_deadline({})
+            threads.add(
+                self.supervisor.run(threading.get_ident, {}, deadline))
+            # The thread becomes idle right after delivering the result
+            time.sleep(0.01)
+        self.assertLess(len(threads), 10)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_no_deadline(self):
+        """Tests that functions without deadline run normally."""
+        self.assertEqual(self.supervisor.run(self.function, {"t": 0}), 0)
+
+    def test_deadline_exceeded(self):
+        """
+        Tests that a DeadlineExceededError error is raised when the function
+        takes too long and that the abandoned executions are bounded.
+        """
+        deadline = self.supervisor.get_deadline({})
+        with self.assertRaises(symmetric.errors.DeadlineExceededError):
+            self.supervisor.run(self.function, {"t": 0.2}, deadline)
+        deadline = self.supervisor.get_deadline({})
+        with self.assertRaises(symmetric.errors.ServerOverloadedError):
+            self.supervisor.run(self.function, {"t": 0}, deadline)
+        self.assertEqual(self.supervisor.stats(), {
+            "timeouts": 1,
+            "abandoned": 1
+        })
+
+    def test_errors_are_propagated(self):
+        """Tests that the exceptions of the function get raised."""
+        deadline = self.supervisor.get_deadline({})
+        with self.assertRaises(ZeroDivisionError):
+            self.supervisor.run(lambda: 1 / 0, {}, deadline)
+
+
+class DeadlineDocumentationTestCase(unittest.TestCase):
+    """Tests the OpenAPI documentation of the deadlines."""
+    def get_operation(self, route, method):
+        """Returns the OpenAPI operation of :method on :route."""
+        endpoint = next(x for x in symmetric_object.endpoints
+                        if x.route == route)
+        return symmetric.openapi.utils.get_openapi_endpoint(
+            endpoint)[route][method]
+
+    def test_timeout(self):
+        """Tests that only the endpoints with a timeout document a 504."""
+        supervised_responses = self.get_operation(
+            "/deadlines/supervised", "get")["responses"]
+        unsupervised_responses = self.get_operation(
+            "/deadlines/unsupervised", "post")["responses"]
+        self.assertIn("504", supervised_responses)
+        self.assertNotIn("504", unsupervised_responses)
+
+    def test_deadline_header(self):
+        """Tests that every endpoint documents the deadline header."""
+        header = {"$ref": "#/components/parameters/DeadlineHeader"}
+        for route, method in (("/deadlines/supervised", "get"),
+                              ("/deadlines/unsupervised", "post")):
+            with self.subTest(route=route):
+                operation = self.get_operation(route, method)
+                self.assertIn(header, operation["parameters"])
+                self.assertIn("400", operation["responses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+A module to test the lean WSGI dispatcher of symmetric.
+"""
+
+import io
+import json
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.dispatch
+import symmetric.errors
+import symmetric.limits
+
+
+symmetric_object = symmetric.core.symmetric_object
+
+
+@symmetric_object.router("/dispatch/add", max_body_size=64)
+def add(a: int, b: int = 1):
+    """Adds two numbers."""
+    return {"sum": a + b, "text": "ñ"}
+
+
+@symmetric_object.router("/dispatch/secret", methods=["get", "post"],
+                         auth_token=True)
+def secret():
+    """Returns a secret."""
+    return [1, 2, 3]
+
+
+@symmetric_object.router("/dispatch/fail")
+def fail():
+    """Always fails."""
+    raise RuntimeError("Failure")
+
+
+REQUESTS = [
+    ("POST", "/dispatch/add", {"json": {"a": 2, "b": 3}}),
+    ("POST", "/dispatch/add", {"json": {"a": 2, "c": 3}}),
+    ("POST", "/dispatch/add", {"json": {"a": "x"}}),
+    ("POST", "/dispatch/add", {"json": {"a": 1, "b": "x" * 64}}),
+    ("POST", "/dispatch/add", {"data": "{broken",
+                               "content_type": "application/json"}),
+    ("GET", "/dispatch/add", {}),
+    ("POST", "/dispatch/secret", {}),
+    ("GET", "/dispatch/secret", {"headers": {
+        "symmetric_api_key": "symmetric_token"}}),
+    ("POST", "/dispatch/fail", {}),
+    ("POST", "/dispatch/missing", {}),
+    ("GET", "/openapi.json", {})
+]
+
+
+def request(method, path, options):
+    """Sends a request to the symmetric object and returns the response."""
+    client = werkzeug.test.Client(
+        symmetric_object, werkzeug.wrappers.BaseResponse)
+    options = dict(options)
+    if "json" in options:
+        options["data"] = json.dumps(options.pop("json"))
+        options["content_type"] = "application/json"
+    return client.open(path, method=method, **options)
+
+
+class DispatcherTestCase(unittest.TestCase):
+    """Tests that the dispatcher responds just like flask does."""
+    def tearDown(self):
+        symmetric_object.set_fast_dispatch(False)
+
+    def test_same_responses(self):
+        """Tests that both paths return the same responses."""
+        for method, path, options in REQUESTS:
+            with self.subTest(method=method, path=path, options=options):
+                symmetric_object.set_fast_dispatch(False)
+                expected = request(method, path, options)
+                symmetric_object.set_fast_dispatch(True)
+                response = request(method, path, options)
+                self.assertEqual(response.status, expected.status)
+                self.assertEqual(response.data, expected.data)
+                self.assertEqual(
+                    response.headers.get("Content-Type"),
+                    expected.headers.get("Content-Type"))
+                self.assertEqual(
+                    "Server-Timing" in response.headers,
+                    "Server-Timing" in expected.headers)
+
+    def test_request_id(self):
+        """Tests that the request id sent by the client gets propagated."""
+        symmetric_object.set_fast_dispatch(True)
+        response = request("POST", "/dispatch/add", {
+            "json": {"a": 1}, "headers": {"X-Request-ID": "abc-123"}})
+        self.assertEqual(response.headers["X-Request-ID"], "abc-123")
+        self.assertIn("call;dur=", response.headers["Server-Timing"])
+
+    def test_can_dispatch(self):
+        """Tests which requests get served by the dispatcher."""
+        endpoint = next(x for x in symmetric_object.endpoints
+                        if x.route == "/dispatch/add")
+        environ = {"REQUEST_METHOD": "POST", "QUERY_STRING": "a=1"}
+        self.assertTrue(symmetric.dispatch.can_dispatch(endpoint, environ))
+        environ["REQUEST_METHOD"] = "DELETE"
+        self.assertFalse(symmetric.dispatch.can_dispatch(endpoint, environ))
+        self.assertFalse(symmetric.dispatch.can_dispatch(None, environ))
+
+    def test_read_json_without_length(self):
+        """Tests that bodies without a Content-Length respect the limits."""
+        limits = symmetric.limits.BodyLimits(max_size=10)
+        environ = {
+            "CONTENT_TYPE": "application/json",
+            "wsgi.input": io.BytesIO(b'{"a": 1}'),
+            "wsgi.input_terminated": True
+        }
+        self.assertEqual(
+            symmetric.dispatch.read_json(environ, limits), {"a": 1})
+        environ["wsgi.input"] = io.BytesIO(b'{"a": "%s"}' % (b"b" * 10))
+        with self.assertRaises(symmetric.errors.PayloadTooLargeError):
+            symmetric.dispatch.read_json(environ, limits)
+
+
+if __name__ == "__main__":
+    unittest.main()
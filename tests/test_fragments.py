@@ -0,0 +1,131 @@
+"""
+A module to test the incremental documentation of symmetric.
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+import unittest
+
+import symmetric.constants
+import symmetric.endpoints
+import symmetric.fragments
+import symmetric.options
+
+
+MODULE = '''
+from symmetric import symmetric
+
+@symmetric.router("/add")
+def add(a: int, b: int = 1):
+    """Adds two numbers."""
+    return a + b
+'''
+
+
+def create_endpoint(function, **options):
+    """Creates an endpoint for :function without a flask function."""
+    return symmetric.endpoints.create_endpoint(
+        "/route", ["POST"], 200, function, None, False,
+        symmetric.options.get_options(options))
+
+
+class FragmentCacheTestCase(unittest.TestCase):
+    """Tests the on-disk cache of documentation fragments."""
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.filename = os.path.join(directory, "cache.json")
+        self.renders = []
+
+    def render(self, endpoint):
+        """Renders a fake fragment, counting the renders."""
+        self.renders.append(endpoint.route)
+        return {"route": endpoint.route}
+
+    def test_reuses_unchanged_endpoints(self):
+        """Tests that unchanged endpoints don't get rendered again."""
+        def function(a: int, b=1):
+            """Docs."""
+            return a + b
+
+        cache = symmetric.fragments.FragmentCache(self.filename)
+        cache.get("openapi", self.render, create_endpoint(function))
+        cache.save()
+        cache = symmetric.fragments.FragmentCache(self.filename)
+        fragment = cache.get("openapi", self.render, create_endpoint(function))
+        self.assertEqual(fragment, {"route": "/route"})
+        self.assertEqual(len(self.renders), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_key_changes(self):
+        """Tests that the key changes with the signature and options."""
+        def function(a: int, b=1):
+            return a + b
+
+        def changed(a: int, b=2):
+            return a + b
+
+        key = symmetric.fragments.get_endpoint_key(create_endpoint(function))
+        self.assertEqual(
+            key,
+            symmetric.fragments.get_endpoint_key(create_endpoint(function))
+        )
+        self.assertNotEqual(
+            key,
+            symmetric.fragments.get_endpoint_key(create_endpoint(changed))
+        )
+        self.assertNotEqual(
+            key,
+            symmetric.fragments.get_endpoint_key(
+                create_endpoint(function, background=True))
+        )
+
+    def test_in_memory(self):
+        """Tests that a cache without a file reuses fragments in memory."""
+        def function(a: int, b=1):
+            return a + b
+
+        cache = symmetric.fragments.FragmentCache()
+        cache.get("openapi", self.render, create_endpoint(function))
+        cache.save()
+        cache.load()
+        cache.get("openapi", self.render, create_endpoint(function))
+        self.assertEqual(len(self.renders), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+
+class DocsCommandTestCase(unittest.TestCase):
+    """Tests the cache used by the docs command."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        source = os.path.join(self.directory, "docs_module.py")
+        with open(source, "w") as source_file:
+            source_file.write(MODULE)
+
+    def document(self, *args):
+        """Runs the docs command with :args in the module directory."""
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.getcwd(), environment.get("PYTHONPATH", "")])
+        subprocess.run(
+            [sys.executable, "-m", "symmetric.cli.core", "docs",
+             "docs_module", "--static", *args],
+            cwd=self.directory, env=environment, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, check=True)
+
+    def test_cache_is_opt_in(self):
+        """Tests that the cache only gets written to the given directory."""
+        name = symmetric.constants.DOCS_CACHE_FILE_NAME
+        self.document()
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory, "openapi.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, name)))
+        self.document("--cache-dir", "cache")
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory, "cache", name)))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
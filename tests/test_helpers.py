@@ -387,3 +387,29 @@ class FunctionParametersFilterTestCase(unittest.TestCase):
             token_key="a"
         )
         self.assertNotIn("a", params)
+
+
+class QueryParamsTestCase(unittest.TestCase):
+    """Tests the query string parameters helper method."""
+    def setUp(self):
+        class MultiDictTest:
+            def __init__(self, items):
+                self.items = items
+
+            def lists(self):
+                return self.items.items()
+
+        self.args = MultiDictTest({
+            "x": ["1"],
+            "tags": ["a", "b"]
+        })
+
+    def test_query_params(self):
+        """Tests that only the repeated arguments become lists."""
+        self.assertEqual(
+            symmetric.helpers.get_query_params(self.args),
+            {
+                "x": "1",
+                "tags": ["a", "b"]
+            }
+        )
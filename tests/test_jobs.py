@@ -0,0 +1,135 @@
+"""
+A module to test the background jobs of symmetric.
+"""
+
+import json
+import time
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.constants
+
+
+symmetric_object = symmetric.core.symmetric_object
+client = werkzeug.test.Client(
+    symmetric_object, werkzeug.wrappers.BaseResponse)
+token = {
+    symmetric.constants.API_CLIENT_TOKEN_NAME:
+        symmetric.constants.API_DEFAULT_TOKEN
+}
+
+
+@symmetric_object.router("/jobs/add", background=True)
+def add_job(a, b):
+    """Adds two numbers."""
+    return a + b
+
+
+@symmetric_object.router("/jobs/failing", background=True)
+def failing_job():
+    """Fails with an internal error."""
+    raise RuntimeError("Secret connection string.")
+
+
+@symmetric_object.router("/jobs/private", background=True, auth_token=True)
+def private_job():
+    """Returns a constant."""
+    return 1
+
+
+@symmetric_object.router("/jobs/limited", background=True, rate_limit=0.1,
+                         rate_limit_burst=1)
+def limited_job():
+    """Accepts a call every ten seconds."""
+    return 1
+
+
+def submit(route, body=None, headers=None):
+    """Submits a job to :route and returns its response."""
+    return client.post(route, data=json.dumps(body or {}),
+                       content_type="application/json", headers=headers)
+
+
+def wait_for(location, headers=None, timeout=5):
+    """Polls the job at :location until it finishes and returns it."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = json.loads(client.get(location, headers=headers).data)
+        if job["status"] not in (symmetric.constants.JOB_QUEUED,
+                                 symmetric.constants.JOB_RUNNING):
+            return job
+        if time.monotonic() > deadline:
+            raise AssertionError(f"The job did not finish: {job}")
+        time.sleep(0.01)
+
+
+class JobsTestCase(unittest.TestCase):
+    """Tests the background jobs and their routes."""
+    def test_submit_and_poll(self):
+        """Tests that the result of a job can be polled."""
+        response = submit("/jobs/add", {"a": 1, "b": 2})
+        self.assertEqual(response.status_code, 202)
+        description = json.loads(response.data)
+        self.assertTrue(
+            response.headers["Location"].endswith(description["location"]))
+        job = wait_for(description["location"])
+        self.assertEqual(job["status"], symmetric.constants.JOB_FINISHED)
+        self.assertEqual(job["result"], 3)
+
+    def test_failure(self):
+        """Tests that the details of a failed job are not sent."""
+        location = json.loads(submit("/jobs/failing").data)["location"]
+        job = wait_for(location)
+        self.assertEqual(job["status"], symmetric.constants.JOB_FAILED)
+        self.assertEqual(job["error"], symmetric.constants.JOB_ERROR)
+
+    def test_admission(self):
+        """Tests that the jobs go through the admission controller."""
+        first = json.loads(submit("/jobs/limited").data)["location"]
+        second = json.loads(submit("/jobs/limited").data)["location"]
+        statuses = sorted([wait_for(first)["status"],
+                           wait_for(second)["status"]])
+        self.assertEqual(statuses, [symmetric.constants.JOB_FAILED,
+                                    symmetric.constants.JOB_FINISHED])
+        stats = json.loads(
+            client.get("/symmetric/stats", headers=token).data)
+        self.assertEqual(
+            stats["/jobs/limited"]["admission"]["rate_limited"], 1)
+
+    def test_authentication(self):
+        """Tests that the jobs of protected endpoints require the token."""
+        self.assertEqual(submit("/jobs/private").status_code, 401)
+        location = json.loads(
+            submit("/jobs/private", headers=token).data)["location"]
+        self.assertEqual(client.get(location).status_code, 401)
+        self.assertEqual(wait_for(location, token)["result"], 1)
+        listed = [
+            job["location"]
+            for job in json.loads(client.get("/symmetric/jobs").data)
+        ]
+        self.assertNotIn(location, listed)
+        listed = [
+            job["location"] for job in json.loads(
+                client.get("/symmetric/jobs", headers=token).data)
+        ]
+        self.assertIn(location, listed)
+
+    def test_expiry(self):
+        """Tests that the finished jobs get evicted after the result TTL."""
+        location = json.loads(
+            submit("/jobs/add", {"a": 1, "b": 1}).data)["location"]
+        wait_for(location)
+        symmetric_object.set_job_options(result_ttl=0)
+        try:
+            time.sleep(0.01)
+            self.assertEqual(client.get(location).status_code, 404)
+        finally:
+            symmetric_object.set_job_options(
+                result_ttl=symmetric.constants.DEFAULT_JOB_RESULT_TTL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+A module to test the startup, readiness and shutdown of symmetric.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import subprocess
+import unittest
+
+import symmetric.constants
+import symmetric.lifecycle
+
+
+ROUTES = '''
+import sys
+import json
+import threading
+
+import werkzeug.test
+import werkzeug.wrappers
+
+from symmetric import symmetric
+
+release = threading.Event()
+
+
+@symmetric.on_startup
+def load():
+    release.wait(5)
+    if sys.argv[1] == "fail":
+        raise RuntimeError("The model can't be loaded.")
+
+
+client = werkzeug.test.Client(symmetric, werkzeug.wrappers.BaseResponse)
+
+
+def get(route):
+    response = client.get(route)
+    return [response.status_code, json.loads(response.data)["status"]]
+
+
+statuses = [get("/symmetric/ready"), get("/symmetric/health")]
+release.set()
+symmetric.startup()
+statuses.extend([get("/symmetric/ready"), get("/symmetric/health")])
+print(json.dumps(statuses))
+'''
+
+
+class LifecycleTestCase(unittest.TestCase):
+    """Tests the Lifecycle class."""
+    def setUp(self):
+        self.lifecycle = symmetric.lifecycle.Lifecycle()
+        self.release = threading.Event()
+        self.calls = []
+        self.lifecycle.add_startup_hook(self.hook)
+        self.lifecycle.add_warmup(lambda: self.calls.append("warmup"))
+
+    def hook(self):
+        """Waits until the test releases it."""
+        self.release.wait(5)
+        self.calls.append("hook")
+
+    def test_readiness(self):
+        """Tests that the lifecycle is only ready after the startup."""
+        self.assertTrue(self.lifecycle.pending)
+        self.lifecycle.start_in_background()
+        self.assertEqual(
+            self.lifecycle.state, symmetric.constants.LIFECYCLE_STARTING)
+        self.assertFalse(self.lifecycle.ready)
+        self.release.set()
+        # The startup waits for the one running in the background
+        self.assertTrue(self.lifecycle.start())
+        self.assertEqual(self.calls, ["hook", "warmup"])
+        self.assertTrue(self.lifecycle.start())
+        self.assertEqual(self.calls, ["hook", "warmup"])
+
+    def test_failure(self):
+        """Tests that a failed startup skips the warm-ups."""
+        self.lifecycle.add_startup_hook(lambda: 1 / 0)
+        self.release.set()
+        self.assertFalse(self.lifecycle.start())
+        self.assertEqual(
+            self.lifecycle.state, symmetric.constants.LIFECYCLE_FAILED)
+        self.assertEqual(self.calls, ["hook"])
+        self.assertFalse(self.lifecycle.start())
+
+    def test_shutdown(self):
+        """Tests that the shutdown hooks run once, even if they fail."""
+        self.lifecycle.add_shutdown_hook(lambda: 1 / 0)
+        self.lifecycle.add_shutdown_hook(lambda: self.calls.append("stop"))
+        self.lifecycle.shutdown()
+        self.lifecycle.shutdown()
+        self.assertEqual(self.calls, ["stop"])
+        self.assertFalse(self.lifecycle.start())
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Forking requires os.fork.")
+    def test_after_fork(self):
+        """
+        Tests that a forked worker starts its startup without waiting for
+        a request, even if the parent process was still starting.
+        """
+        self.lifecycle.start_in_background()
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            self.lifecycle.after_fork()
+            state = self.lifecycle.state
+            self.release.set()
+            self.lifecycle.start()
+            os.write(write, json.dumps([state, self.calls]).encode())
+            os._exit(0)
+        os.close(write)
+        state, calls = json.loads(os.read(read, 4096).decode())
+        os.waitpid(pid, 0)
+        self.release.set()
+        self.assertEqual(state, symmetric.constants.LIFECYCLE_STARTING)
+        self.assertEqual(calls, ["hook", "warmup"])
+
+
+class ReadinessTestCase(unittest.TestCase):
+    """Tests the health and readiness endpoints."""
+    def get_statuses(self, outcome):
+        """
+        Returns the status code and the status of the readiness and the
+        health endpoints while the startup runs and after it finishes
+        with :outcome.
+        """
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.getcwd(), environment.get("PYTHONPATH", "")])
+        output = subprocess.run(
+            [sys.executable, "-c", ROUTES, outcome], cwd=tempfile.mkdtemp(),
+            env=environment, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            check=True).stdout
+        return json.loads(output)
+
+    def test_ready(self):
+        """Tests the status codes of a successful startup."""
+        self.assertEqual(self.get_statuses("succeed"), [
+            [503, "starting"], [200, "alive"], [200, "ready"], [200, "alive"]
+        ])
+
+    def test_failed(self):
+        """Tests the status codes of a failed startup."""
+        self.assertEqual(self.get_statuses("fail"), [
+            [503, "starting"], [200, "alive"], [503, "failed"], [503, "failed"]
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+A module to test the request body limits of symmetric.
+"""
+
+import json
+import unittest
+
+import flask
+import werkzeug.test
+
+import symmetric.errors
+import symmetric.limits
+
+
+def create_request(body):
+    """Creates a JSON request with the raw :body."""
+    builder = werkzeug.test.EnvironBuilder(
+        method="POST", data=body, content_type="application/json")
+    return flask.Request(builder.get_environ())
+
+
+class BodyLimitsTestCase(unittest.TestCase):
+    """Tests the limits checked before parsing the request bodies."""
+    def test_valid_body(self):
+        """Tests that bodies within the limits get parsed."""
+        limits = symmetric.limits.BodyLimits(100, 3, 5)
+        body = {"a": [1, 2], "b": {"c": "[[[,,,]]]"}}
+        self.assertEqual(
+            limits.read_json(create_request(json.dumps(body))), body)
+
+    def test_size(self):
+        """Tests that oversized bodies get rejected."""
+        limits = symmetric.limits.BodyLimits(max_size=10)
+        with self.assertRaises(symmetric.errors.PayloadTooLargeError):
+            limits.read_json(create_request(json.dumps({"a": "b" * 10})))
+
+    def test_depth(self):
+        """Tests that deeply nested bodies get rejected without parsing."""
+        limits = symmetric.limits.BodyLimits(max_depth=32)
+        with self.assertRaises(symmetric.errors.ValidationError):
+            limits.read_json(create_request("[" * 100000))
+
+    def test_elements(self):
+        """Tests that the elements of every container get counted."""
+        limits = symmetric.limits.BodyLimits(max_elements=4)
+        limits.read_json(create_request('{"a": [1, 2], "b": []}'))
+        with self.assertRaises(symmetric.errors.ValidationError):
+            limits.read_json(create_request('{"a": [1, 2, 3], "b": []}'))
+
+    def test_resolve(self):
+        """Tests that the limits that are not set use the defaults."""
+        limits = symmetric.limits.BodyLimits(max_size=10).resolve(
+            symmetric.limits.BodyLimits(20, 2))
+        self.assertEqual(limits.describe(), {"maxSize": 10, "maxDepth": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
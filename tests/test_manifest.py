@@ -0,0 +1,131 @@
+"""
+A module to test the manifest of symmetric.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+
+import symmetric.manifest
+
+
+MODULE = '''
+from symmetric import symmetric
+
+@symmetric.router("/add")
+def add(a: int, b: int = 1):
+    """Adds two numbers."""
+    return a + b
+'''
+
+HELPERS = '''
+from symmetric import symmetric
+
+@symmetric.router("/multiply")
+def multiply(a: int, b: int = 2):
+    """{docstring}"""
+    return a * b
+'''
+
+CHECK = '''
+import symmetric.cli.utils
+symmetric_object = symmetric.cli.utils.get_built_symmetric_object(
+    "manifest_module", False)
+print(symmetric_object.openapi["info"]["title"])
+'''
+
+
+class ManifestTestCase(unittest.TestCase):
+    """Tests the manifest built from a module."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "manifest_module.py")
+        self.filename = os.path.join(self.directory, "manifest.json")
+        with open(self.source, "w") as source_file:
+            source_file.write(MODULE)
+
+    def run_in_directory(self, *args):
+        """Runs python with :args in the directory of the module."""
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.getcwd(), environment.get("PYTHONPATH", "")])
+        return subprocess.run(
+            [sys.executable, *args], cwd=self.directory, env=environment,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+
+    def write_helpers(self, docstring):
+        """Writes a module imported by the module with :docstring."""
+        path = os.path.join(self.directory, "manifest_helpers.py")
+        with open(path, "w") as helpers_file:
+            helpers_file.write(HELPERS.format(docstring=docstring))
+
+    def build_and_replace_schema(self):
+        """
+        Builds the manifest of the module and replaces its schema, to check
+        whether the workers use it. Returns the title used by the workers.
+        """
+        self.run_in_directory(
+            "-m", "symmetric.cli.core", "build", "manifest_module")
+        filename = os.path.join(
+            self.directory, symmetric.constants.MANIFEST_FILE_NAME)
+        with open(filename) as manifest_file:
+            manifest = json.load(manifest_file)
+        manifest["openapi"] = json.dumps({"info": {"title": "Built"}})
+        with open(filename, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        return self.run_in_directory("-c", CHECK).stdout.decode().strip()
+
+    def test_stale(self):
+        """Tests that the manifest is discarded when the source changes."""
+        source_hash = symmetric.manifest.get_source_hash(self.source)
+        symmetric.manifest.write_manifest(
+            {"source_hash": source_hash}, self.filename)
+        self.assertIsNotNone(
+            symmetric.manifest.read_manifest(self.filename, source_hash))
+        with open(self.source, "a") as source_file:
+            source_file.write("\n# Changed\n")
+        self.assertIsNone(symmetric.manifest.read_manifest(
+            self.filename, symmetric.manifest.get_source_hash(self.source)))
+
+    def test_unreadable(self):
+        """Tests that a missing or corrupt manifest gets ignored."""
+        self.assertIsNone(
+            symmetric.manifest.read_manifest(self.filename, "hash"))
+        with open(self.filename, "w") as manifest_file:
+            manifest_file.write("{")
+        self.assertIsNone(
+            symmetric.manifest.read_manifest(self.filename, "hash"))
+
+    def test_build(self):
+        """Tests that the built manifest gets used by the workers."""
+        # The workers use the schema of the manifest instead of building it
+        self.assertEqual(self.build_and_replace_schema(), "Built")
+        filename = os.path.join(
+            self.directory, symmetric.constants.MANIFEST_FILE_NAME)
+        with open(filename) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(manifest["endpoints"]["/add"]["methods"], ["POST"])
+        with open(self.source, "a") as source_file:
+            source_file.write("\n# Changed\n")
+        output = self.run_in_directory("-c", CHECK).stdout
+        self.assertEqual(output.decode().strip(), "Manifest Module API")
+
+    def test_imported_endpoints(self):
+        """
+        Tests that the manifest is discarded when an endpoint defined in
+        another module changes, even if the source of the module does not.
+        """
+        self.write_helpers("Multiplies two numbers.")
+        with open(self.source, "a") as source_file:
+            source_file.write("\nimport manifest_helpers\n")
+        self.assertEqual(self.build_and_replace_schema(), "Built")
+        self.write_helpers("Multiplies two integers.")
+        output = self.run_in_directory("-c", CHECK).stdout
+        self.assertEqual(output.decode().strip(), "Manifest Module API")
+
+
+if __name__ == "__main__":
+    unittest.main()
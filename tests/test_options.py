@@ -0,0 +1,57 @@
+"""
+A module to test the grouping of the router options of symmetric.
+"""
+
+import unittest
+
+import symmetric.core
+import symmetric.options
+
+
+symmetric_object = symmetric.core.symmetric_object
+
+
+class OptionsTestCase(unittest.TestCase):
+    """Tests the grouping of the router options by feature."""
+    def test_defaults(self):
+        options = symmetric.options.get_options({})
+        self.assertEqual(
+            symmetric.options.get_values(options),
+            symmetric.options.DEFAULTS
+        )
+        self.assertIsNone(options.admission.max_concurrency)
+        self.assertTrue(options.validation.validate)
+        self.assertFalse(options.background)
+
+    def test_grouping(self):
+        options = symmetric.options.get_options({
+            "max_concurrency": 2,
+            "rate_limit": 10,
+            "timeout": 1.5,
+            "batch": True,
+            "max_batch_size": 8,
+            "warmup": {"a": 1}
+        })
+        self.assertEqual(
+            options.admission,
+            symmetric.options.AdmissionOptions(2, None, 10, None)
+        )
+        self.assertEqual(options.deadline.timeout, 1.5)
+        self.assertEqual(
+            options.batching,
+            symmetric.options.BatchingOptions(True, 8, None)
+        )
+        self.assertEqual(options.warmup, {"a": 1})
+        values = symmetric.options.get_values(options)
+        self.assertEqual(values["max_batch_size"], 8)
+        self.assertEqual(set(values), set(symmetric.options.DEFAULTS))
+
+    def test_unknown_option(self):
+        with self.assertRaises(TypeError):
+            symmetric.options.get_options({"max_concurrent": 2})
+        with self.assertRaises(TypeError):
+            symmetric_object.router("/options/unknown", timeuot=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
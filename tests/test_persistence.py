@@ -0,0 +1,57 @@
+"""
+A module to test the persistent result cache of symmetric.
+"""
+
+import os
+import tempfile
+import unittest
+
+import symmetric.persistence
+
+
+def function(a, b=1):
+    """Function whose results get cached."""
+    return a + b
+
+
+def other_function(a, b=1):
+    """Another function whose results get cached."""
+    return a - b
+
+
+class PersistentCacheTestCase(unittest.TestCase):
+    """Tests the results cache stored in SQLite."""
+    def setUp(self):
+        self.filename = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+
+    def test_persistence(self):
+        """Tests that the results survive a new cache object."""
+        cache = symmetric.persistence.PersistentCache(function, self.filename)
+        key = cache.get_key({"a": 1, "b": 2})
+        self.assertIsNone(cache.get(key))
+        cache.set(key, "3")
+        cache = symmetric.persistence.PersistentCache(function, self.filename)
+        self.assertEqual(cache.get(cache.get_key({"b": 2, "a": 1})), "3")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 0})
+
+    def test_function_identity(self):
+        """Tests that each function has its own keys."""
+        cache = symmetric.persistence.PersistentCache(function, self.filename)
+        other = symmetric.persistence.PersistentCache(
+            other_function, self.filename)
+        self.assertNotEqual(
+            cache.get_key({"a": 1}), other.get_key({"a": 1}))
+
+    def test_eviction(self):
+        """Tests that the least recently used results get evicted."""
+        cache = symmetric.persistence.PersistentCache(
+            function, self.filename, max_size=25)
+        keys = [cache.get_key({"a": x}) for x in range(3)]
+        for key in keys:
+            cache.set(key, "x" * 10)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual(cache.get(keys[2]), "x" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+A module to test the preloading of symmetric before forking.
+"""
+
+import gc
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+
+
+MASTER = '''
+import gc
+import os
+import json
+import threading
+
+import werkzeug.test
+import werkzeug.wrappers
+
+from symmetric import symmetric
+
+data = [{"id": number, "tags": [number]} for number in range(10000)]
+started = threading.Event()
+symmetric.on_startup(started.set)
+
+
+@symmetric.router("/preloaded")
+def preloaded():
+    """Returns the amount of preloaded objects."""
+    return len(data)
+
+
+symmetric.preload()
+master = {"frozen": gc.get_freeze_count(), "schema": id(symmetric.openapi)}
+print(json.dumps(master))
+workers = []
+for _ in range(2):
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        gc.collect()
+        client = werkzeug.test.Client(
+            symmetric, werkzeug.wrappers.BaseResponse)
+        # The startup runs when the worker gets forked, without requests
+        ready = started.wait(5)
+        response = client.post(
+            "/preloaded", data="{}", content_type="application/json")
+        os.write(write, json.dumps({
+            "frozen": gc.get_freeze_count(),
+            "collected": any(item is data for item in gc.get_objects()),
+            "schema": id(symmetric.openapi),
+            "ready": ready,
+            "result": json.loads(response.data)
+        }).encode())
+        os._exit(0)
+    os.close(write)
+    workers.append((pid, read))
+for pid, read in workers:
+    print(os.read(read, 4096).decode())
+    os.waitpid(pid, 0)
+'''
+
+
+@unittest.skipUnless(hasattr(os, "fork") and hasattr(gc, "freeze"),
+                     "Preloading requires os.fork and gc.freeze.")
+class PreloadTestCase(unittest.TestCase):
+    """Tests the preload method of the symmetric object."""
+    def test_shared_with_workers(self):
+        """
+        Tests that the forked workers use the objects built by the master
+        process and that their collections leave those objects frozen.
+        """
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.getcwd(), environment.get("PYTHONPATH", "")])
+        output = subprocess.run(
+            [sys.executable, "-c", MASTER], cwd=tempfile.mkdtemp(),
+            env=environment, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            check=True).stdout
+        master, *workers = [
+            json.loads(line) for line in output.decode().splitlines()
+        ]
+        self.assertGreaterEqual(master["frozen"], 10000)
+        self.assertEqual(len(workers), 2)
+        for worker in workers:
+            self.assertEqual(worker["result"], 10000)
+            self.assertTrue(worker["ready"])
+            # The schema was not built again by the worker
+            self.assertEqual(worker["schema"], master["schema"])
+            # The collections of the worker skip the preloaded objects
+            self.assertGreaterEqual(worker["frozen"], 10000)
+            self.assertFalse(worker["collected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+A module to test the sampling profiler of symmetric.
+"""
+
+import time
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.constants
+import symmetric.profiling
+
+
+client = werkzeug.test.Client(
+    symmetric.core.symmetric_object, werkzeug.wrappers.BaseResponse)
+
+
+def busy_function(seconds):
+    """Keeps the CPU busy for :seconds."""
+    limit = time.monotonic() + seconds
+    while time.monotonic() < limit:
+        pass
+
+
+class SamplingProfilerTestCase(unittest.TestCase):
+    """Tests the sampling profiler."""
+    def test_disabled(self):
+        """Tests that a disabled profiler does not track requests."""
+        profiler = symmetric.profiling.SamplingProfiler()
+        profiler.enter("/route")
+        self.assertIsNone(profiler.get_route())
+
+    def test_collapsed_stacks(self):
+        """Tests that the samples get attributed to the served route."""
+        profiler = symmetric.profiling.SamplingProfiler()
+        profiler.enable(interval_ms=1)
+        profiler.enter("/route")
+        try:
+            busy_function(0.2)
+        finally:
+            profiler.exit()
+        lines = profiler.collapsed().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertTrue(stack.startswith("/route;"))
+        self.assertIn("busy_function (test_profiling.py:", stack)
+        self.assertGreater(int(count), 0)
+        self.assertEqual(profiler.collapsed("/other"), "")
+
+
+class IntrospectionRoutesTestCase(unittest.TestCase):
+    """Tests that the stats and the profile require the token."""
+    def test_authentication(self):
+        """Tests the responses with and without the token."""
+        token = {
+            symmetric.constants.API_CLIENT_TOKEN_NAME:
+                symmetric.constants.API_DEFAULT_TOKEN
+        }
+        for route in (symmetric.constants.STATS_ROUTE,
+                      symmetric.constants.PROFILE_ROUTE):
+            with self.subTest(route=route):
+                self.assertEqual(client.get(route).status_code, 401)
+                self.assertEqual(client.get(route, headers={
+                    symmetric.constants.API_CLIENT_TOKEN_NAME: "wrong"
+                }).status_code, 401)
+                self.assertNotEqual(
+                    client.get(route, headers=token).status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+A module to test the background refresh of symmetric.
+"""
+
+import json
+import time
+import threading
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.errors
+import symmetric.refresh
+import symmetric.constants
+
+
+symmetric_object = symmetric.core.symmetric_object
+client = werkzeug.test.Client(
+    symmetric_object, werkzeug.wrappers.BaseResponse)
+constant_calls = []
+
+
+@symmetric_object.router("/refresh/constant", methods=["get"], stale_ttl=60)
+def constant():
+    """Returns a constant."""
+    constant_calls.append(1)
+    return {"value": 1}
+
+
+class Counter:  # pylint: disable=R0903
+    """Callable that counts its calls and fails when told to."""
+    def __init__(self, delay=0):
+        self.calls = 0
+        self.fail = False
+        self.delay = delay
+        self.__name__ = "counter"
+
+    def __call__(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Refresh failed.")
+        self.calls += 1
+        return self.calls
+
+
+def wait_for(condition, timeout=5):
+    """Waits up to :timeout seconds for :condition to be true."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class RefresherTestCase(unittest.TestCase):
+    """Tests the results kept in memory and refreshed in the background."""
+    def test_stale_while_revalidate(self):
+        """Tests that a stale result gets served while it refreshes."""
+        counter = Counter(delay=0.1)
+        refresher = symmetric.refresh.Refresher(counter, stale_ttl=0.05)
+        self.assertEqual(refresher.headers(), {})
+        self.assertEqual(refresher.get(), 1)
+        self.assertEqual(refresher.headers(), {"Age": "0"})
+        time.sleep(0.1)
+        start = time.monotonic()
+        self.assertEqual(refresher.get(), 1)
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertTrue(wait_for(lambda: refresher.get() == 2))
+        self.assertEqual(refresher.stats()["refreshes"], 2)
+
+    def test_failed_refresh(self):
+        """Tests that the last result is kept when a refresh fails."""
+        counter = Counter()
+        refresher = symmetric.refresh.Refresher(counter, refresh_every=0.02)
+        refresher.start()
+        counter.fail = True
+        self.assertTrue(wait_for(lambda: refresher.stats()["failures"] > 0))
+        refresher.stop()
+        self.assertEqual(refresher.get(), 1)
+        self.assertGreaterEqual(refresher.age(), 0.02)
+
+    def test_scheduled_refresh(self):
+        """Tests that the result gets refreshed without requests."""
+        counter = Counter()
+        refresher = symmetric.refresh.Refresher(counter, refresh_every=0.02)
+        refresher.start()
+        self.assertTrue(wait_for(lambda: counter.calls >= 3))
+        refresher.stop()
+        self.assertIsNotNone(refresher.stats()["last_duration_ms"])
+
+    def test_single_flight(self):
+        """Tests that concurrent first calls compute the result once."""
+        counter = Counter(delay=0.05)
+        refresher = symmetric.refresh.Refresher(counter, stale_ttl=60)
+        threads = [threading.Thread(target=refresher.get) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.calls, 1)
+
+    def test_configuration(self):
+        """Tests that only parameterless functions get refreshed."""
+        self.assertIsNone(symmetric.refresh.get_refresher(Counter()))
+        with self.assertRaises(symmetric.errors.RefreshConfigurationError):
+            symmetric.refresh.get_refresher(lambda a: a, refresh_every=1)
+        with self.assertRaises(symmetric.errors.RefreshConfigurationError):
+            symmetric.refresh.get_refresher(
+                Counter(), refresh_every=1, background=True)
+
+    def test_endpoint(self):
+        """
+        Tests that the warm-up computes the result of a refreshed endpoint
+        before its first request, and the Age header and the stats of the
+        endpoint.
+        """
+        endpoint = next(x for x in symmetric_object.endpoints
+                        if x.route == "/refresh/constant")
+        self.assertTrue(symmetric_object.startup())
+        self.assertEqual(constant_calls, [1])
+        before = endpoint.refresher.age()
+        response = client.get("/refresh/constant")
+        after = endpoint.refresher.age()
+        self.assertEqual(json.loads(response.data), {"value": 1})
+        self.assertEqual(constant_calls, [1])
+        # The result was computed by the warm-up, at any time before
+        self.assertLessEqual(int(before), int(response.headers["Age"]))
+        self.assertLessEqual(int(response.headers["Age"]), int(after))
+        token = {
+            symmetric.constants.API_CLIENT_TOKEN_NAME:
+                symmetric.constants.API_DEFAULT_TOKEN
+        }
+        stats = json.loads(
+            client.get("/symmetric/stats", headers=token).data)
+        self.assertEqual(stats["/refresh/constant"]["refresh"]["refreshes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+A module to test the request replay utilities of symmetric.
+"""
+
+import io
+import os
+import json
+import tempfile
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.recording
+import symmetric.replay
+
+
+symmetric_object = symmetric.core.symmetric_object
+
+
+@symmetric_object.router("/replay/limited", max_body_size=64)
+def limited_echo(value: int):
+    """Returns :value."""
+    return value
+
+
+class ReplayTestCase(unittest.TestCase):
+    """Tests the replay of recorded requests."""
+    def test_read_recording(self):
+        """Tests that the entries get sorted and broken lines skipped."""
+        filename = os.path.join(tempfile.mkdtemp(), "recording.log")
+        with open(filename, "w") as recording_file:
+            recording_file.write(json.dumps({"route": "/b", "time": 2}))
+            recording_file.write("\n{broken\n")
+            recording_file.write(json.dumps({"route": "/a", "time": 1}))
+        self.assertEqual(
+            [x["route"] for x in symmetric.recording.read_recording(filename)],
+            ["/a", "/b"]
+        )
+
+    def test_build_request(self):
+        """Tests that GET requests send their parameters as a query."""
+        entry = {
+            "route": "/get",
+            "method": "GET",
+            "body": {"a": 1, "b": ["x", "y"]},
+            "headers": {"User-Agent": "test"},
+            "token": True
+        }
+        method, path, headers, data = symmetric.replay.build_request(
+            entry, "token_name", "secret")
+        self.assertEqual((method, path), ("GET", "/get?a=1&b=x&b=y"))
+        self.assertEqual(
+            headers, {"User-Agent": "test", "token_name": "secret"})
+        self.assertIsNone(data)
+
+    def test_server_duration(self):
+        """Tests that the total duration gets read from Server-Timing."""
+        headers = {"Server-Timing": "parse;dur=0.100, total;dur=12.500"}
+        self.assertEqual(
+            symmetric.replay.get_server_duration(headers), 12.5)
+        self.assertIsNone(symmetric.replay.get_server_duration({}))
+
+
+class RecordingTestCase(unittest.TestCase):
+    """Tests the recording of the requests."""
+    def setUp(self):
+        self.filename = os.path.join(tempfile.mkdtemp(), "recording.log")
+        symmetric_object.record_requests(self.filename)
+        self.client = werkzeug.test.Client(
+            symmetric_object, werkzeug.wrappers.BaseResponse)
+
+    def tearDown(self):
+        symmetric_object.stop_recording()
+
+    def test_streamed_body(self):
+        """Tests that a body without a Content-Length gets recorded."""
+        response = self.client.post(
+            "/replay/limited", input_stream=io.BytesIO(b'{"value": 3}'),
+            content_type="application/json",
+            environ_overrides={
+                "CONTENT_LENGTH": "", "wsgi.input_terminated": True
+            })
+        self.assertEqual(response.status_code, 200)
+        symmetric_object.stop_recording()
+        entries = symmetric.recording.read_recording(self.filename)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["body"], {"value": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
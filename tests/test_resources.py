@@ -0,0 +1,113 @@
+"""
+A module to test the resource pools of symmetric.
+"""
+
+import threading
+import unittest
+
+import symmetric.core
+import symmetric.errors
+import symmetric.openapi.utils
+import symmetric.resources
+
+
+symmetric_object = symmetric.core.symmetric_object
+
+
+class Connection:  # pylint: disable=R0903
+    """Resource that counts the connections created."""
+    created = 0
+
+    def __init__(self):
+        Connection.created += 1
+        self.number = Connection.created
+        self.healthy = True
+
+
+def connect():
+    """Creates a connection."""
+    return Connection()
+
+
+symmetric_object.add_resource(connect, max_size=2)
+
+
+@symmetric_object.router("/resources/query", resources={"db": connect})
+def query(db, limit: int = 10):
+    """Returns the connection used."""
+    return {"connection": db.number, "limit": limit}
+
+
+class PoolTestCase(unittest.TestCase):
+    """Tests the checkout and the return of the resources."""
+    def test_reuse(self):
+        """Tests that the returned resources get reused."""
+        pool = symmetric.resources.Pool(Connection, max_size=2)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertIsNot(first, second)
+        pool.release(second)
+        self.assertIs(pool.acquire(), second)
+        self.assertEqual(pool.stats()["created"], 2)
+
+    def test_health_check(self):
+        """Tests that the broken resources get replaced."""
+        closed = []
+        pool = symmetric.resources.Pool(
+            Connection, health_check=lambda x: x.healthy,
+            close=closed.append)
+        resource = pool.acquire()
+        resource.healthy = False
+        pool.release(resource)
+        self.assertIsNot(pool.acquire(), resource)
+        self.assertEqual(closed, [resource])
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_exhausted(self):
+        """Tests that the calls wait for a resource up to the timeout."""
+        pool = symmetric.resources.Pool(Connection, max_size=1, timeout=0.05)
+        resource = pool.acquire()
+        with self.assertRaises(symmetric.errors.ServerOverloadedError):
+            pool.acquire()
+        pool = symmetric.resources.Pool(Connection, max_size=1, timeout=5)
+        resource = pool.acquire()
+        threading.Timer(0.02, pool.release, [resource]).start()
+        self.assertIs(pool.acquire(), resource)
+
+    def test_fill(self):
+        """Tests that the minimum size gets created on startup."""
+        pool = symmetric.resources.Pool(Connection, min_size=3)
+        pool.fill()
+        self.assertEqual(pool.stats()["idle"], 3)
+        pool.close()
+        self.assertEqual(pool.stats()["size"], 0)
+
+
+class InjectionTestCase(unittest.TestCase):
+    """Tests the resources injected into the endpoints."""
+    def test_injection(self):
+        """Tests that the resource gets injected and returned."""
+        result = symmetric_object.call("/resources/query", {"limit": 5})
+        self.assertEqual(result["limit"], 5)
+        again = symmetric_object.call("/resources/query", {"db": "x"})
+        self.assertEqual(again["connection"], result["connection"])
+        stats = symmetric.resources.pools.get(connect).stats()
+        self.assertEqual((stats["created"], stats["in_use"]), (1, 0))
+
+    def test_hidden_parameter(self):
+        """Tests that the resources are not part of the body."""
+        endpoint = next(x for x in symmetric_object.endpoints
+                        if x.route == "/resources/query")
+        body = symmetric.openapi.utils.get_openapi_endpoint_body(endpoint)
+        self.assertEqual(list(body["properties"]), ["limit"])
+
+    def test_configuration(self):
+        """Tests the misconfigured resources."""
+        with self.assertRaises(symmetric.errors.ResourceConfigurationError):
+            symmetric_object.add_resource(connect)
+        with self.assertRaises(symmetric.errors.ResourceConfigurationError):
+            symmetric.resources.get_pools(query, {"cache": connect})
+
+
+if __name__ == "__main__":
+    unittest.main()
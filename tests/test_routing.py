@@ -0,0 +1,69 @@
+"""
+A module to test the route index of symmetric.
+"""
+
+import timeit
+import functools
+import unittest
+
+import werkzeug.exceptions
+import werkzeug.test
+
+import symmetric.routing
+
+
+def create_app(amount):
+    """Returns an app with :amount static routes."""
+    app = symmetric.routing.App(__name__)
+    for number in range(amount):
+        app.add_url_rule(f"/route-{number}", f"endpoint_{number}",
+                         lambda: "", methods=["POST"])
+    app.add_url_rule("/items/<name>", "item", lambda name: name)
+    app.add_url_rule("/default", "default", lambda page: "",
+                     defaults={"page": 1})
+    return app
+
+
+def match(app, path, method="POST"):
+    """Matches :path with :method using the URL map of :app."""
+    environ = werkzeug.test.EnvironBuilder(path, method=method).get_environ()
+    return app.url_map.bind_to_environ(environ).match(return_rule=True)
+
+
+class RouteIndexTestCase(unittest.TestCase):
+    """Tests the static routes matched with the index."""
+    def setUp(self):
+        self.app = create_app(10)
+
+    def test_static_routes(self):
+        """Tests that the static routes get matched by the index."""
+        rule, values = match(self.app, "/route-3")
+        self.assertEqual((rule.endpoint, values), ("endpoint_3", {}))
+        self.assertIn(rule, self.app.url_map.index["/route-3"])
+        rule, values = match(self.app, "/default", "GET")
+        self.assertEqual((rule.endpoint, values), ("default", {"page": 1}))
+
+    def test_fallback(self):
+        """Tests that the rest of the requests get matched by the map."""
+        rule, values = match(self.app, "/items/a", "GET")
+        self.assertEqual((rule.endpoint, values), ("item", {"name": "a"}))
+        self.assertNotIn("/items/<name>", self.app.url_map.index)
+        with self.assertRaises(werkzeug.exceptions.MethodNotAllowed):
+            match(self.app, "/route-3", "GET")
+        with self.assertRaises(werkzeug.exceptions.NotFound):
+            match(self.app, "/missing")
+
+    def test_constant_time(self):
+        """Tests that the matching time does not grow with the routes."""
+        timings = []
+        for amount in (10, 5000):
+            app = create_app(amount)
+            timings.append(min(timeit.repeat(
+                functools.partial(match, app, f"/route-{amount - 1}"),
+                number=100, repeat=5)))
+        # Matching every rule would take hundreds of times longer
+        self.assertLess(timings[1], timings[0] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+A module to test the RPC channel of symmetric.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+import subprocess
+import importlib.util
+import unittest
+
+import werkzeug.serving
+
+import symmetric.core
+import symmetric.errors
+import symmetric.rpc
+import symmetric.server
+
+
+symmetric_object = symmetric.core.symmetric_object
+
+
+@symmetric_object.router("/rpc/wait")
+def wait(seconds: float):
+    """Waits and returns the waited seconds."""
+    time.sleep(seconds)
+    return seconds
+
+
+@symmetric_object.router("/rpc/multiply", auth_token=True)
+def multiply(a: int, b: int):
+    """Multiplies two numbers."""
+    return {"product": a * b}
+
+
+MODULE = '''
+from symmetric import symmetric
+
+symmetric.enable_rpc()
+
+
+@symmetric.router("/double")
+def double(x: int):
+    return 2 * x
+'''
+
+
+def get_free_port():
+    """Returns a port that is not being used."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def call_through_socket(port, calls):
+    """
+    Sends :calls through a WebSocket connection to the RPC channel served on
+    :port and returns their replies, sorted by id.
+    """
+    simple_websocket = importlib.import_module("simple_websocket")
+    connection = simple_websocket.Client.connect(
+        f"ws://127.0.0.1:{port}/symmetric/rpc")
+    try:
+        for call in calls:
+            connection.send(json.dumps(call))
+        replies = [
+            json.loads(connection.receive(timeout=5)) for _ in calls
+        ]
+    finally:
+        connection.close()
+    return sorted(replies, key=lambda reply: reply["id"])
+
+
+class RPCTestCase(unittest.TestCase):
+    """Tests the calls sent through the RPC channel."""
+    def setUp(self):
+        self.connection = symmetric_object.connect_rpc()
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_out_of_order(self):
+        """Tests that the replies get sent as soon as each call finishes."""
+        self.connection.send(
+            {"id": 1, "route": "/rpc/wait", "body": {"seconds": 0.3}})
+        self.connection.send(
+            {"id": 2, "route": "/rpc/wait", "body": {"seconds": 0}})
+        first = self.connection.receive(timeout=5)
+        second = self.connection.receive(timeout=5)
+        self.assertEqual((first["id"], first["status"]), (2, 200))
+        self.assertEqual((second["id"], second["result"]), (1, 0.3))
+
+    def test_authentication(self):
+        """Tests that the connection authenticates once."""
+        call = {"id": 1, "route": "/rpc/multiply", "body": {"a": 2, "b": 3}}
+        self.connection.send(call)
+        self.assertEqual(self.connection.receive(timeout=5)["status"], 401)
+        self.connection.send({"id": 2, "token": "incorrect"})
+        self.assertEqual(self.connection.receive(timeout=5)["status"], 401)
+        self.connection.send({"id": 3, "token": "symmetric_token"})
+        self.assertEqual(self.connection.receive(timeout=5)["status"], 200)
+        self.connection.send(call)
+        self.assertEqual(
+            self.connection.receive(timeout=5),
+            {"id": 1, "status": 200, "result": {"product": 6}}
+        )
+
+    def test_errors(self):
+        """Tests the replies of the invalid calls."""
+        self.connection.send({"id": 1, "route": "/rpc/missing"})
+        self.assertEqual(self.connection.receive(timeout=5)["status"], 404)
+        self.connection.send({"id": 2})
+        self.assertEqual(self.connection.receive(timeout=5)["status"], 400)
+        self.connection.send(
+            {"id": 3, "route": "/rpc/wait", "body": {"seconds": "x"}})
+        reply = self.connection.receive(timeout=5)
+        self.assertEqual(reply["status"], 422)
+        self.assertEqual(reply["result"]["errors"][0]["field"], "seconds")
+
+    def test_closed_session(self):
+        """Tests that the replies of a closed session get discarded."""
+        sent = []
+        session = symmetric.rpc.Session(
+            lambda route, body, headers: (200, body), lambda token: None,
+            sent.append, str)
+        session.receive('{"id": 1, "route": "/a", "body": 1}')
+        session.close()
+        session.receive('{"id": 2}')
+        self.assertTrue(session.closed)
+        self.assertLessEqual(len(sent), 1)
+
+    @unittest.skipIf(importlib.util.find_spec("simple_websocket") is not None,
+                     "simple_websocket is installed")
+    def test_missing_dependency(self):
+        """Tests that the channel can't be enabled without its package."""
+        with self.assertRaises(symmetric.errors.RPCConfigurationError):
+            symmetric_object.enable_rpc()
+
+
+@unittest.skipIf(importlib.util.find_spec("simple_websocket") is None,
+                 "the RPC channel needs simple_websocket")
+class SocketTestCase(unittest.TestCase):
+    """Tests the RPC channel through the servers of symmetric."""
+    def test_development_server(self):
+        """Tests the channel served by the server of the run method."""
+        symmetric_object.enable_rpc()
+        server = werkzeug.serving.make_server(
+            "127.0.0.1", 0, symmetric_object, threaded=True,
+            request_handler=symmetric.server.SocketRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            replies = call_through_socket(server.server_port, [
+                {"id": 1, "route": "/rpc/wait", "body": {"seconds": 0}},
+                {"id": 2, "route": "/rpc/multiply", "body": {"a": 2, "b": 3}}
+            ])
+            # The connection can be reused after the channel closes
+            second = call_through_socket(server.server_port, [
+                {"id": 3, "route": "/rpc/wait", "body": {"seconds": 0}}
+            ])
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(replies[0], {"id": 1, "status": 200, "result": 0})
+        self.assertEqual(replies[1]["status"], 401)
+        self.assertEqual(second, [{"id": 3, "status": 200, "result": 0}])
+
+    @unittest.skipIf(not hasattr(os, "fork"), "the server needs os.fork")
+    def test_preforking_server(self):
+        """Tests the channel served by the workers of symmetric run."""
+        directory = tempfile.mkdtemp()
+        with open(os.path.join(directory, "rpc_module.py"), "w") as module:
+            module.write(MODULE)
+        port = get_free_port()
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.getcwd(), environment.get("PYTHONPATH", "")])
+        process = subprocess.Popen(
+            [sys.executable, "-m", "symmetric.cli.core", "run", "rpc_module",
+             "-d", "-w", "2", "-p", str(port)],
+            cwd=directory, env=environment,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            for _ in range(100):
+                try:
+                    socket.create_connection(("127.0.0.1", port)).close()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            replies = call_through_socket(port, [
+                {"id": 1, "route": "/double", "body": {"x": 4}},
+                {"id": 2, "route": "/double", "body": {"x": 5}}
+            ])
+        finally:
+            process.terminate()
+            process.wait(10)
+        self.assertEqual(replies, [
+            {"id": 1, "status": 200, "result": 8},
+            {"id": 2, "status": 200, "result": 10}
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
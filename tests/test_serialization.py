@@ -0,0 +1,85 @@
+"""
+A module to test the response serialization of symmetric.
+"""
+
+import json
+import base64
+import unittest
+import dataclasses
+
+import symmetric.constants
+import symmetric.errors
+import symmetric.serialization
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@dataclasses.dataclass
+class Point:
+    """Dataclass to be serialized."""
+    x: int
+    y: int
+
+
+def dumps(obj):
+    """Serializes :obj using the JSON encoder of symmetric."""
+    return json.loads(
+        json.dumps(obj, cls=symmetric.serialization.JSONEncoder))
+
+
+class SerializerRegistryTestCase(unittest.TestCase):
+    """Tests the serializers registry."""
+    def test_dataclasses(self):
+        """Tests that dataclasses get serialized as dictionaries."""
+        self.assertEqual(dumps([Point(1, 2)]), [{"x": 1, "y": 2}])
+
+    def test_registered_serializer(self):
+        """Tests that the serializers apply to subclasses."""
+        class Base:
+            """Class with a custom serializer."""
+
+        class Child(Base):
+            """Subclass of a class with a custom serializer."""
+
+        symmetric.serialization.serializers.register(Base, lambda x: "base")
+        self.assertEqual(dumps({"child": Child()}), {"child": "base"})
+
+    def test_unknown_format(self):
+        """Tests that unknown formats get rejected."""
+        registry = symmetric.serialization.SerializerRegistry()
+        with self.assertRaises(
+                symmetric.errors.SerializationConfigurationError):
+            registry.configure(array_format="bytes")
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed.")
+class NumPySerializersTestCase(unittest.TestCase):
+    """Tests the serializers of the NumPy types."""
+    def tearDown(self):
+        symmetric.serialization.serializers.configure(
+            array_format=symmetric.constants.ARRAY_FORMAT_LIST)
+
+    def test_arrays_and_scalars(self):
+        """Tests that arrays become lists and scalars become numbers."""
+        self.assertEqual(
+            dumps({"array": numpy.arange(3), "scalar": numpy.float32(0.5)}),
+            {"array": [0, 1, 2], "scalar": 0.5}
+        )
+
+    def test_buffer_format(self):
+        """Tests that arrays can be decoded from their buffers."""
+        symmetric.serialization.serializers.configure(
+            array_format=symmetric.constants.ARRAY_FORMAT_BUFFER)
+        array = numpy.arange(6, dtype="float32").reshape(2, 3)[:, ::2]
+        encoded = dumps(array)
+        decoded = numpy.frombuffer(
+            base64.b64decode(encoded["data"]), dtype=encoded["dtype"]
+        ).reshape(encoded["shape"])
+        self.assertTrue((decoded == array).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
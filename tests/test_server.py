@@ -0,0 +1,127 @@
+"""
+A module to test the preforking server of symmetric.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import tempfile
+import threading
+import subprocess
+import unittest
+import urllib.request
+
+import symmetric.server
+
+
+MODULE = '''
+import time
+from symmetric import symmetric
+
+VERSION = {version}
+
+@symmetric.router("/version")
+def version(seconds: float = 0):
+    time.sleep(seconds)
+    return VERSION
+'''
+
+
+def get_free_port():
+    """Returns a port that is not being used."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class InFlightTestCase(unittest.TestCase):
+    """Tests the counter of the connections being served."""
+    def test_wait(self):
+        """Tests that waiting ends when every connection finishes."""
+        in_flight = symmetric.server.InFlight()
+        in_flight.enter()
+        self.assertFalse(in_flight.wait(0.01))
+        threading.Timer(0.05, in_flight.exit).start()
+        self.assertTrue(in_flight.wait(5))
+
+
+@unittest.skipIf(not hasattr(os, "fork"), "the server needs os.fork")
+class ServerTestCase(unittest.TestCase):
+    """Tests the drain and the reload of a running server."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write_module(1)
+        self.port = get_free_port()
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [os.getcwd(), environment.get("PYTHONPATH", "")])
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "symmetric.cli.core", "run",
+             "server_module", "-d", "-w", "1", "-p", str(self.port)],
+            cwd=self.directory, env=environment,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(100):
+            try:
+                self.request()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+    def tearDown(self):
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def write_module(self, version):
+        """Writes the module served with its :version."""
+        path = os.path.join(self.directory, "server_module.py")
+        with open(path, "w") as module_file:
+            module_file.write(MODULE.format(version=version))
+
+    def request(self, seconds=0):
+        """Sends a request to the server and returns the response body."""
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{self.port}/version",
+            data=json.dumps({"seconds": seconds}).encode(),
+            headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    def request_in_background(self, seconds, results):
+        """Sends a request in a new thread. Returns the thread."""
+        thread = threading.Thread(
+            target=lambda: results.append(self.request(seconds)))
+        thread.start()
+        time.sleep(0.2)
+        return thread
+
+    def test_reload(self):
+        """Tests that the new code gets served without dropping requests."""
+        results = []
+        thread = self.request_in_background(0.5, results)
+        self.write_module(2)
+        self.process.send_signal(signal.SIGHUP)
+        thread.join()
+        self.assertEqual(results, [1])
+        deadline = time.monotonic() + 10
+        while self.request() != 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.request(), 2)
+
+    def test_drain(self):
+        """Tests that the requests in flight finish before exiting."""
+        results = []
+        thread = self.request_in_background(0.5, results)
+        self.process.send_signal(signal.SIGTERM)
+        thread.join()
+        self.assertEqual(results, [1])
+        self.assertEqual(self.process.wait(10), 0)
+        with self.assertRaises(OSError):
+            self.request()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+A module to test the static analysis of symmetric modules.
+"""
+
+import ast
+import datetime
+import unittest
+
+import symmetric.core
+import symmetric.errors
+import symmetric.static
+import symmetric.openapi.utils
+
+
+SOURCE = '''
+import some_heavy_dependency
+from symmetric import symmetric as api
+
+api.set_client_token_name("custom_token")
+MODEL = some_heavy_dependency.load()
+
+
+@api.router("/predict", ["get"], auth_token=True)
+def predict(text: str, limit: "int" = 3, model: None = MODEL):
+    """Predicts stuff."""
+    return MODEL(text)[:limit]
+
+
+@api.router(route="/health")
+def health():
+    return True
+
+
+def not_an_endpoint(x):
+    return x
+'''
+
+CACHED_SOURCE = '''
+import datetime
+from symmetric import symmetric
+
+UPDATED = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@symmetric.router("/static/cached", methods=["get"],
+                  last_modified=lambda: UPDATED)
+def cached_constant(x: int = 1):
+    """Returns a constant."""
+    return x
+'''
+
+UPDATED = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@symmetric.core.symmetric_object.router(
+    "/static/cached", methods=["get"], last_modified=lambda: UPDATED)
+def cached_constant(x: int = 1):
+    """Returns a constant."""
+    return x
+
+
+class ParseModuleTestCase(unittest.TestCase):
+    """Tests the endpoints found without importing the module."""
+    def setUp(self):
+        self.symmetric_object = symmetric.static.parse_module(
+            ast.parse(SOURCE), "module")
+        self.predict = self.symmetric_object.endpoints[1]
+
+    def test_endpoints(self):
+        """Tests that only the decorated functions get found."""
+        self.assertEqual(
+            [endpoint.route for endpoint in self.symmetric_object.endpoints],
+            ["/health", "/predict"]
+        )
+        self.assertEqual(
+            self.symmetric_object.client_token_name, "custom_token")
+
+    def test_router_arguments(self):
+        """Tests that the arguments of the router get evaluated."""
+        self.assertEqual(self.predict.methods, ["GET"])
+        self.assertTrue(self.predict.has_token)
+        self.assertTrue(self.predict.binds_query)
+
+    def test_stub_function(self):
+        """Tests that the stub function mimics the decorated function."""
+        function = self.predict.function
+        self.assertEqual(function.__name__, "predict")
+        self.assertEqual(function.__doc__, "Predicts stuff.")
+        self.assertEqual(function.__defaults__, (3, None))
+        self.assertEqual(
+            function.__annotations__,
+            {"text": str, "limit": int, "model": type(None)})
+        self.assertIsNone(function("text"))
+
+    def test_missing_symmetric_object(self):
+        """Tests that modules without the symmetric object get rejected."""
+        with self.assertRaises(symmetric.errors.AppImportError):
+            symmetric.static.parse_module(ast.parse("x = 1"), "module")
+
+    def test_last_modified(self):
+        """
+        Tests that the static documentation of an endpoint with a
+        last_modified function matches the one of the imported endpoint.
+        """
+        static = symmetric.static.parse_module(
+            ast.parse(CACHED_SOURCE), "module").endpoints[0]
+        imported = next(
+            endpoint for endpoint in symmetric.core.symmetric_object.endpoints
+            if endpoint.route == "/static/cached")
+        static_schema = symmetric.openapi.utils.get_openapi_endpoint(static)
+        self.assertEqual(
+            static_schema,
+            symmetric.openapi.utils.get_openapi_endpoint(imported))
+        self.assertIn(
+            "304", static_schema["/static/cached"]["get"]["responses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+A module to test the request timing and the request ids of symmetric.
+"""
+
+import time
+import logging
+import threading
+import unittest
+
+import werkzeug.test
+import werkzeug.wrappers
+
+import symmetric.core
+import symmetric.logging
+import symmetric.timing
+import symmetric.batching
+import symmetric.refresh
+import symmetric.constants
+
+
+symmetric_object = symmetric.core.symmetric_object
+client = werkzeug.test.Client(
+    symmetric_object, werkzeug.wrappers.BaseResponse)
+logger = logging.getLogger(__name__)
+
+
+@symmetric_object.router("/timing/echo")
+def echo(value):
+    """Logs and returns :value."""
+    logger.info(f"Echoing {value}.")
+    return value
+
+
+class CaptureHandler(logging.Handler):
+    """Handler that keeps the request id of every record."""
+    def __init__(self):
+        super().__init__()
+        self.request_ids = []
+        self.addFilter(symmetric.logging.RequestIdFilter())
+
+    def emit(self, record):
+        self.request_ids.append(record.request_id)
+
+
+class LoggingTestCase(unittest.TestCase):
+    """Tests that the log lines get the id of their request."""
+    def setUp(self):
+        self.handler = CaptureHandler()
+        logger.addHandler(self.handler)
+
+    def tearDown(self):
+        logger.removeHandler(self.handler)
+
+    def test_request_id(self):
+        """Tests that the id of the client gets propagated or replaced."""
+        header = symmetric.constants.REQUEST_ID_HEADER_NAME
+        response = client.post("/timing/echo", data='{"value": 1}',
+                               content_type="application/json",
+                               headers={header: "client-id"})
+        self.assertEqual(response.headers[header], "client-id")
+        self.assertEqual(self.handler.request_ids, ["client-id"])
+        response = client.post("/timing/echo", data='{"value": 1}',
+                               content_type="application/json",
+                               headers={header: "not valid!"})
+        self.assertNotEqual(response.headers[header], "not valid!")
+        self.assertEqual(self.handler.request_ids[-1],
+                         response.headers[header])
+
+    def test_batched_calls(self):
+        """Tests that the log lines of a batch get the ids of its requests."""
+        def batched(x):
+            logger.info("Running a batch.")
+            return x
+
+        def submit(request_id):
+            symmetric.logging.set_request_id(request_id)
+            batcher.submit({"x": 1})
+
+        batcher = symmetric.batching.Batcher(
+            batched, max_batch_size=2, max_wait_ms=10000)
+        threads = [
+            threading.Thread(target=submit, args=(request_id,))
+            for request_id in ("first", "second")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(self.handler.request_ids), 1)
+        self.assertEqual(
+            sorted(self.handler.request_ids[0].split(",")),
+            ["first", "second"])
+
+    def test_background_refresh(self):
+        """Tests that a refresh gets the id of the request that started it."""
+        def constant():
+            logger.info("Refreshing.")
+            return 1
+
+        refresher = symmetric.refresh.Refresher(constant, stale_ttl=0.01)
+        refresher.get()
+        time.sleep(0.02)
+        symmetric.logging.set_request_id("stale")
+        try:
+            refresher.get()
+        finally:
+            symmetric.logging.finish_request()
+        deadline = time.monotonic() + 5
+        while len(self.handler.request_ids) < 2:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(self.handler.request_ids[1], "stale")
+
+
+class PhaseTimerTestCase(unittest.TestCase):
+    """Tests the PhaseTimer class and the Server-Timing header."""
+    def test_header(self):
+        """Tests that the header includes every phase and the total."""
+        timer = symmetric.timing.PhaseTimer()
+        with timer.phase("call"):
+            time.sleep(0.01)
+        metrics = dict(
+            metric.split(";dur=") for metric in timer.header().split(", "))
+        self.assertEqual(list(metrics), ["call", "total"])
+        self.assertGreaterEqual(float(metrics["call"]), 10)
+        self.assertGreaterEqual(float(metrics["total"]),
+                                float(metrics["call"]))
+
+    def test_response(self):
+        """Tests that the responses include the Server-Timing header."""
+        response = client.post("/timing/echo", data='{"value": 1}',
+                               content_type="application/json")
+        phases = [
+            metric.split(";")[0]
+            for metric in response.headers["Server-Timing"].split(", ")
+        ]
+        for phase in ("auth", "params", "call", "serialize", "total"):
+            self.assertIn(phase, phases)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+A module to test the parameter validation of symmetric.
+"""
+
+import unittest
+
+import symmetric.errors
+import symmetric.validation
+
+
+class ValidatorTestCase(unittest.TestCase):
+    """Tests the compiled parameter validators."""
+    def setUp(self):
+        def function(a: int, b: float = 1.0, c: bool = False, d=None):
+            return a, b, c, d
+
+        self.validator = symmetric.validation.compile_validator(function)
+        self.coercer = symmetric.validation.compile_validator(
+            function, coerce=True)
+
+    def test_valid_parameters(self):
+        """Tests that valid parameters are returned unchanged."""
+        parameters = {"a": 1, "b": 2, "d": [1, 2]}
+        self.assertEqual(self.validator(dict(parameters)), parameters)
+
+    def test_missing_parameters(self):
+        """Tests that missing required parameters get reported."""
+        with self.assertRaises(symmetric.errors.ValidationError) as context:
+            self.validator({"b": 2.0})
+        self.assertEqual(
+            [error["field"] for error in context.exception.errors], ["a"])
+
+    def test_invalid_parameters(self):
+        """Tests that every invalid parameter gets reported."""
+        with self.assertRaises(symmetric.errors.ValidationError) as context:
+            self.validator({"a": True, "b": "2", "c": 1})
+        self.assertEqual(
+            [error["field"] for error in context.exception.errors],
+            ["a", "b", "c"]
+        )
+
+    def test_coercion(self):
+        """Tests that the parameters get coerced into the annotated types."""
+        self.assertEqual(
+            self.coercer({"a": "3", "b": "2.5", "c": "true"}),
+            {"a": 3, "b": 2.5, "c": True}
+        )
+        with self.assertRaises(symmetric.errors.ValidationError):
+            self.coercer({"a": 2.5})
+
+    def test_unhashable_annotations(self):
+        """Tests that the annotations that can't be looked up get skipped."""
+        def function(a: [int], b: {0, 1}, c: int = 0):
+            return a, b, c
+
+        validator = symmetric.validation.compile_validator(function)
+        self.assertEqual(validator({"a": "x", "b": None}),
+                         {"a": "x", "b": None})
+        with self.assertRaises(symmetric.errors.ValidationError):
+            validator({"a": 1, "b": 1, "c": "1"})